@@ -27,6 +27,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "django.middleware.gzip.GZipMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -65,6 +66,76 @@ DATABASES = {
     }
 }
 
+# Read replicas of the default database, e.g. POSTGRES_REPLICA_HOSTS=r1,r2
+for index, host in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["planetarium.replicas.ReplicaRouter"]
+
+# Replica pins, idempotency keys and throttle buckets live in the cache,
+# so with more than one process it must be shared, e.g.
+# REDIS_URL=redis://cache:6379/0
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+PLANETARIUM_CATALOG_CACHE_TIMEOUT = 60 * 60
+
+PLANETARIUM_SEAT_HOLD_MINUTES = 10
+PLANETARIUM_SEAT_HOLD_MAX_MINUTES = 30
+# Live held seats per user and show session
+PLANETARIUM_SEAT_HOLD_MAX_SEATS = 10
+
+PLANETARIUM_EVENTS_BACKEND = "planetarium.events.LocalBackend"
+PLANETARIUM_EVENTS_HEARTBEAT = 15
+PLANETARIUM_EVENTS_MAX_AGE = 5 * 60
+
+PLANETARIUM_SCHEDULE_MAX_DAYS = 31
+
+PLANETARIUM_SEARCH_CONFIG = "english"
+
+PLANETARIUM_READ_REPLICAS = [
+    alias for alias in DATABASES if alias.startswith("replica_")
+]
+PLANETARIUM_REPLICA_PIN_SECONDS = 15
+PLANETARIUM_REPLICA_RETRY_SECONDS = 30
+
+PLANETARIUM_IDEMPOTENCY_TTL = 24 * 60 * 60
+PLANETARIUM_IDEMPOTENCY_LOCK_SECONDS = 10
+# At least the server's request timeout, see planetarium/idempotency.py
+PLANETARIUM_IDEMPOTENCY_LOCK_TTL = 5 * 60
+
+# Token buckets, "<capacity>/<period>" per "<scope>_user" and "<scope>_ip"
+PLANETARIUM_THROTTLE_RATES = {
+    "token_ip": "20/min",
+    "reservations_user": "30/min",
+    "reservations_ip": "300/min",
+}
+
+# Serialize show session, ticket and astronomy show lists from .values()
+PLANETARIUM_VALUES_LISTS = False
+
+# The OpenAPI schema is rebuilt when this changes, a source hash if unset
+PLANETARIUM_CODE_VERSION = os.environ.get("PLANETARIUM_CODE_VERSION", "")
+# Written by "manage.py build_schema"
+PLANETARIUM_SCHEMA_FILE = BASE_DIR / "openapi-schema.json"
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation"
@@ -86,7 +157,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
@@ -109,4 +180,11 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers"
+    ".ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers"
+    ".ClaimsTokenRefreshSerializer",
 }
+
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 30
@@ -1,18 +1,20 @@
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import (
-    SpectacularAPIView,
     SpectacularSwaggerView,
     SpectacularRedocView,
 )
 
+from planetarium.schema import CachedSpectacularAPIView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path(
         "api/planetarium/",
         include("planetarium.urls", namespace="planetarium"),
     ),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/user/", include("user.urls", namespace="user")),
+    path("api/schema/", CachedSpectacularAPIView.as_view(), name="schema"),
     path(
         "api/schema/swagger/",
         SpectacularSwaggerView.as_view(url_name="schema"),
@@ -7,13 +7,23 @@ from planetarium.models import (
     PlanetariumDome,
     ShowSession,
     Ticket,
+    SeatHold,
+    HeldSeat,
 )
 
 admin.site.register(AstronomyShow)
 admin.site.register(ShowTheme)
-admin.site.register(ShowSession)
 admin.site.register(PlanetariumDome)
-admin.site.register(Ticket)
+
+
+@admin.register(ShowSession)
+class ShowSessionAdmin(admin.ModelAdmin):
+    list_select_related = ("astronomy_show",)
+
+
+@admin.register(Ticket)
+class TicketAdmin(admin.ModelAdmin):
+    list_select_related = ("show_session__astronomy_show",)
 
 
 class TicketInline(admin.TabularInline):
@@ -21,6 +31,16 @@ class TicketInline(admin.TabularInline):
     extra = 1
 
 
+class HeldSeatInline(admin.TabularInline):
+    model = HeldSeat
+    extra = 1
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    inlines = (HeldSeatInline,)
+
+
 @admin.register(Reservation)
 class ReservationAdmin(admin.ModelAdmin):
     inlines = (TicketInline,)
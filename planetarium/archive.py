@@ -0,0 +1,108 @@
+"""Moving finished show sessions into archive tables.
+
+``archive_chunk`` moves up to ``chunk_size`` sessions that started
+before a given time, with their tickets, in one short transaction: rows
+are copied into ``ArchivedShowSession`` and ``ArchivedTicket`` with
+their ids and deleted from the hot tables (seat holds and schedule
+entries of the sessions go with them). Reservations whose tickets are
+then all archived move to ``ArchivedReservation`` in the same
+transaction; the others stay until their last session is archived.
+
+The deletes bypass the ORM collector and the per-row signals: seat map
+updates, counters and seat events are pointless for sessions that are
+gone, and running them per ticket cost several queries each while the
+chunk's rows were locked. The schedule cells of the chunk are rebuilt
+once instead.
+
+Reservation history is read through the ``*History`` models, views over
+the hot and the archive tables, so archived bookings keep showing in
+``reservations/`` and ``tickets/`` and in their exports. Every write only
+sees the hot tables.
+"""
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from planetarium.models import (
+    ArchivedReservation,
+    ArchivedShowSession,
+    ArchivedTicket,
+    HeldSeat,
+    Reservation,
+    SeatHold,
+    ShowSession,
+    Ticket,
+)
+from planetarium.schedule import rebuild_cells, session_cells
+
+SESSION_FIELDS = (
+    "id",
+    "astronomy_show_id",
+    "planetarium_dome_id",
+    "show_time",
+    "tickets_sold",
+)
+TICKET_FIELDS = ("id", "row", "seat", "show_session_id", "reservation_id")
+RESERVATION_FIELDS = ("id", "created_at", "user_id")
+
+
+def copy_rows(queryset, model, fields) -> int:
+    rows = model.objects.bulk_create(
+        model(**row) for row in queryset.values(*fields)
+    )
+    return len(rows)
+
+
+def raw_delete(queryset) -> None:
+    """Delete with one statement, without loading rows or signals"""
+    queryset._raw_delete(queryset.db)
+
+
+def archive_chunk(before: datetime, chunk_size: int) -> dict[str, int]:
+    """Archive the next sessions older than ``before``, see above"""
+    with transaction.atomic():
+        # Sessions being edited are skipped, and picked up by a later run.
+        session_ids = list(
+            ShowSession.objects.filter(show_time__lt=before)
+            .order_by("show_time", "id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        sessions = ShowSession.objects.filter(id__in=session_ids)
+        tickets = Ticket.objects.filter(show_session_id__in=session_ids)
+        # Reservations with no tickets left outside of these sessions
+        reservation_ids = list(
+            Reservation.objects.filter(id__in=tickets.values("reservation_id"))
+            .exclude(
+                Exists(
+                    Ticket.objects.filter(
+                        reservation_id=OuterRef("pk")
+                    ).exclude(show_session_id__in=session_ids)
+                )
+            )
+            .values_list("id", flat=True)
+        )
+        reservations = Reservation.objects.filter(id__in=reservation_ids)
+
+        archived = {
+            "sessions": copy_rows(
+                sessions, ArchivedShowSession, SESSION_FIELDS
+            ),
+            "tickets": copy_rows(tickets, ArchivedTicket, TICKET_FIELDS),
+            "reservations": copy_rows(
+                reservations, ArchivedReservation, RESERVATION_FIELDS
+            ),
+        }
+        cells = session_cells(sessions)
+        # Children first, the hot tables have no other references.
+        for queryset in (
+            HeldSeat.objects.filter(show_session_id__in=session_ids),
+            SeatHold.objects.filter(show_session_id__in=session_ids),
+            tickets,
+            sessions,
+            reservations,
+        ):
+            raw_delete(queryset)
+        rebuild_cells(cells)
+    return archived
@@ -0,0 +1,222 @@
+"""Async read endpoints for high-concurrency polling under ASGI.
+
+These mirror the JSON of the DRF viewsets' list/retrieve actions but run
+as native async views, so a worker process can keep many slow pollers
+open while queries go through Django's async ORM interface.
+"""
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from planetarium.events import get_broker
+from planetarium.filters import ShowSessionFilter
+from planetarium.models import AstronomyShow, ShowSession
+from planetarium.pagination import OrderPagination
+from planetarium.search import search_shows
+from planetarium.serializers import (
+    AstronomyShowSerializer,
+    SeatMapSerializer,
+    ShowSessionDetailSerializer,
+    ShowSessionListSerializer,
+)
+
+
+class QueryParams:
+    """Expose ``request.GET`` the way DRF filter backends expect it"""
+
+    def __init__(self, request):
+        self.query_params = request.GET
+
+
+def render(data, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+    return HttpResponse(
+        JSONRenderer().render(data),
+        content_type="application/json",
+        status=status_code,
+    )
+
+
+def not_found(message: str = NotFound.default_detail) -> HttpResponse:
+    return render({"detail": message}, status.HTTP_404_NOT_FOUND)
+
+
+def _positive_int(value: str | None, default: int) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+
+async def paginate(request, queryset, serializer_class) -> dict | None:
+    """Page-number pagination with the same shape as ``OrderPagination``
+
+    Returns ``None`` for a page past the end.
+    """
+    page_size = min(
+        _positive_int(
+            request.GET.get(OrderPagination.page_size_query_param),
+            OrderPagination.page_size,
+        ),
+        OrderPagination.max_page_size,
+    )
+    page = _positive_int(
+        request.GET.get(OrderPagination.page_query_param), 1
+    )
+    count = await queryset.acount()
+    offset = (page - 1) * page_size
+    if page > 1 and offset >= count:
+        return None
+
+    objects = [obj async for obj in queryset[offset: offset + page_size]]
+    url = request.build_absolute_uri()
+    page_param = OrderPagination.page_query_param
+    next_link = previous_link = None
+    if offset + page_size < count:
+        next_link = replace_query_param(url, page_param, page + 1)
+    if page == 2:
+        previous_link = remove_query_param(url, page_param)
+    elif page > 2:
+        previous_link = replace_query_param(url, page_param, page - 1)
+    return {
+        "count": count,
+        "next": next_link,
+        "previous": previous_link,
+        "results": serializer_class(objects, many=True).data,
+    }
+
+
+async def show_session_list(request):
+    queryset = ShowSession.objects.select_related(
+        "astronomy_show", "planetarium_dome"
+    )
+    try:
+        queryset = ShowSessionFilter().filter_queryset(
+            QueryParams(request), queryset, view=None
+        )
+    except ValidationError as exc:
+        return render(exc.detail, status.HTTP_400_BAD_REQUEST)
+    data = await paginate(request, queryset, ShowSessionListSerializer)
+    if data is None:
+        return not_found(OrderPagination.invalid_page_message)
+    return render(data)
+
+
+async def show_session_detail(request, pk: int):
+    try:
+        show_session = await ShowSession.objects.select_related(
+            "astronomy_show", "planetarium_dome"
+        ).prefetch_related("astronomy_show__show_theme").aget(pk=pk)
+    except ShowSession.DoesNotExist:
+        return not_found()
+
+    taken_seats = [
+        seat
+        async for seat in show_session.tickets.values_list("seat", flat=True)
+    ]
+    serializer = ShowSessionDetailSerializer(
+        show_session, context={"taken_seats": taken_seats}
+    )
+    return render(serializer.data)
+
+
+async def get_seat_map_data(pk: int) -> dict | None:
+    try:
+        show_session = await ShowSession.objects.select_related(
+            "planetarium_dome"
+        ).only(
+            "seat_map",
+            "planetarium_dome__rows",
+            "planetarium_dome__seats_in_row",
+        ).aget(pk=pk)
+    except ShowSession.DoesNotExist:
+        return None
+    return SeatMapSerializer(show_session.get_seat_map()).data
+
+
+async def show_session_seat_map(request, pk: int):
+    data = await get_seat_map_data(pk)
+    if data is None:
+        return not_found()
+    return render(data)
+
+
+def server_sent_event(event: str, data) -> bytes:
+    return b"event: %s\ndata: %s\n\n" % (
+        event.encode(),
+        JSONRenderer().render(data),
+    )
+
+
+async def show_session_events(request, pk: int):
+    """Stream seat changes of a session as Server-Sent Events.
+
+    The stream opens with a ``snapshot`` event holding the seat map,
+    followed by ``taken``/``released`` events with the affected
+    ``[row, seat]`` pairs. A new snapshot is sent whenever the client
+    fell too far behind. Streams end after
+    ``PLANETARIUM_EVENTS_MAX_AGE`` seconds and EventSource clients
+    reconnect on their own.
+
+    Needs an ASGI server: under WSGI Django drains the stream into one
+    response, so it would only be sent once the stream ends.
+    """
+    if not isinstance(request, ASGIRequest):
+        return render(
+            {"detail": "Event streams need the ASGI application."},
+            status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    broker = get_broker()
+    # Subscribe before reading the snapshot so no change falls between.
+    subscription = broker.subscribe(pk)
+    snapshot = await get_seat_map_data(pk)
+    if snapshot is None:
+        broker.unsubscribe(subscription)
+        return not_found()
+
+    async def stream():
+        deadline = time.monotonic() + settings.PLANETARIUM_EVENTS_MAX_AGE
+        try:
+            yield b"retry: 3000\n\n"
+            yield server_sent_event("snapshot", snapshot)
+            while time.monotonic() < deadline:
+                event = await subscription.get(
+                    timeout=settings.PLANETARIUM_EVENTS_HEARTBEAT
+                )
+                if subscription.lost:
+                    subscription.lost = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    yield server_sent_event(
+                        "snapshot", await get_seat_map_data(pk)
+                    )
+                elif event is None:
+                    yield b": keepalive\n\n"
+                else:
+                    yield server_sent_event(event["type"], event)
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(
+        stream(), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def astronomy_show_list(request):
+    queryset = AstronomyShow.objects.prefetch_related("show_theme")
+    q = request.GET.get("q", "").strip()
+    if q:
+        queryset = search_shows(queryset, q)
+    data = await paginate(request, queryset, AstronomyShowSerializer)
+    if data is None:
+        return not_found(OrderPagination.invalid_page_message)
+    return render(data)
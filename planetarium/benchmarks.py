@@ -0,0 +1,28 @@
+"""Helpers shared by the benchmark and load test commands"""
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of ``values``"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+@contextmanager
+def patched_setting(name: str, value):
+    """Set ``settings.<name>`` for the duration of a run.
+
+    For settings read on every request, such as
+    ``PLANETARIUM_THROTTLE_RATES``.
+    """
+    previous = getattr(settings, name)
+    setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        setattr(settings, name, previous)
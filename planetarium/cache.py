@@ -0,0 +1,96 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from planetarium.replicas import reading_from_replica
+
+KEY_PREFIX = "planetarium:catalog"
+STATS = ("hit", "miss")
+
+
+def _version_key(model) -> str:
+    return f"{KEY_PREFIX}:version:{model._meta.label_lower}"
+
+
+def _incr(key: str, initial: int = 1) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, initial, timeout=None):
+            cache.incr(key)
+
+
+def get_versions(models) -> list[int]:
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_version(model) -> None:
+    """Invalidate every cached response that depends on ``model``.
+
+    A missing version starts from the current time so that a version
+    evicted from the cache never maps back onto stale entries.
+    """
+    _incr(_version_key(model), initial=int(time.time() * 1000))
+
+
+def record(stat: str) -> None:
+    _incr(f"{KEY_PREFIX}:stats:{stat}")
+
+
+def get_stats() -> dict[str, int]:
+    keys = {f"{KEY_PREFIX}:stats:{stat}": stat for stat in STATS}
+    counters = cache.get_many(keys)
+    return {stat: counters.get(key, 0) for key, stat in keys.items()}
+
+
+class CatalogCacheMixin:
+    """Read-through cache for the ``list`` and ``retrieve`` actions.
+
+    Serialized data is cached under a key made of the request URL and the
+    current versions of ``cache_models``; saving or deleting any of these
+    models bumps its version, which makes older entries unreachable.
+    The ``X-Cache`` response header tells whether the cache was hit.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_cache_key(self, request) -> str:
+        versions = ".".join(map(str, get_versions(self.cache_models)))
+        url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        return f"{KEY_PREFIX}:{self.basename}:{self.action}:{versions}:{url}"
+
+    def get_cached_response(self, view, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            record("hit")
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        record("miss")
+        response = view(request, *args, **kwargs)
+        # Replica data may predate the version in the key.
+        if (
+            response.status_code == status.HTTP_200_OK
+            and not reading_from_replica()
+        ):
+            cache.set(
+                key, response.data, settings.PLANETARIUM_CATALOG_CACHE_TIMEOUT
+            )
+        response["X-Cache"] = "MISS"
+        return response
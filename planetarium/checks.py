@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+)
+
+
+def has_shared_cache() -> bool:
+    return settings.CACHES["default"]["BACKEND"] not in PER_PROCESS_CACHES
+
+
+@register(Tags.caches, Tags.database)
+def check_replica_cache(app_configs, **kwargs):
+    """Replica pins must be visible to every process, see replicas.py"""
+    if not settings.PLANETARIUM_READ_REPLICAS or has_shared_cache():
+        return []
+    return [
+        Error(
+            "Read replicas are configured with a per-process cache.",
+            hint="Set REDIS_URL: read-your-writes pins are kept in the "
+            "default cache and must be shared by all processes.",
+            id="planetarium.E001",
+        )
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Idempotency locks and throttle buckets are only as wide as the cache"""
+    if has_shared_cache():
+        return []
+    return [
+        Warning(
+            "The default cache is per process.",
+            hint="Set REDIS_URL: with more than one process, Idempotency-Key "
+            "locks and stored responses and the throttle buckets are not "
+            "shared between them.",
+            id="planetarium.W001",
+        )
+    ]
@@ -0,0 +1,96 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+from planetarium.cache import get_versions
+
+
+def modified_state(queryset) -> tuple:
+    """``(count, latest updated_at)`` of ``queryset``, in one query"""
+    state = queryset.order_by().aggregate(
+        count=Count("pk"), updated_at=Max("updated_at")
+    )
+    return state["count"], state["updated_at"]
+
+
+class ConditionalGetMixin:
+    """ETag and Last-Modified validators for ``list`` and ``retrieve``.
+
+    The ETag is computed from the row count and the latest ``updated_at``
+    of the requested rows (one aggregate query) and from the catalog
+    cache versions of ``etag_models``, the catalog models the
+    representation also shows. A matching ``If-None-Match`` is answered
+    with 304 before any row is fetched or serialized. Views behind the
+    catalog cache keep their validators next to the cached data.
+
+    ``Last-Modified`` is informational only: deleting rows doesn't
+    advance it, so ``If-Modified-Since`` is not honoured.
+    """
+
+    etag_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_etag_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_validators(self, request) -> tuple[str, float | None]:
+        get_cache_key = getattr(self, "get_cache_key", None)
+        if get_cache_key is None:
+            return self.compute_validators(request)
+
+        key = f"{get_cache_key(request)}:validators"
+        validators = cache.get(key)
+        if validators is None:
+            validators = self.compute_validators(request)
+            cache.set(
+                key, validators, settings.PLANETARIUM_CATALOG_CACHE_TIMEOUT
+            )
+        return validators
+
+    def compute_validators(self, request) -> tuple[str, float | None]:
+        count, updated_at = modified_state(self.get_etag_queryset())
+        key = (
+            f"{request.get_full_path()}:{request.accepted_renderer.format}:"
+            f"{count}:{updated_at}:{get_versions(self.etag_models)}"
+        )
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        return etag, updated_at.timestamp() if updated_at else None
+
+    def get_conditional_response(self, view, request, *args, **kwargs):
+        try:
+            etag, last_modified = self.get_validators(request)
+        except (TypeError, ValueError, ValidationError):
+            # A malformed lookup, the view answers it with 404.
+            return view(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = view(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """Events of one show session delivered to one async consumer.
+
+    When the consumer falls behind by more than ``maxsize`` events they
+    are dropped and ``lost`` is set, so it can resynchronise from a
+    fresh snapshot instead of replaying a backlog.
+    """
+
+    def __init__(self, show_session_id: int, maxsize: int = 100):
+        self.show_session_id = show_session_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.lost = False
+
+    def deliver(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lost = True
+
+    async def get(self, timeout: float) -> dict | None:
+        """Wait for the next event, ``None`` when ``timeout`` expires"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBackend:
+    """In-process fan-out of seat events.
+
+    Publishers may run on any thread; every subscriber receives events on
+    its own event loop. Only subscribers in the same process see the
+    events, which is what a single ASGI worker (and the tests) need; a
+    multi-process deployment plugs in a backend with the same
+    ``subscribe``/``unsubscribe``/``publish`` interface backed by an
+    external broker.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = defaultdict(set)
+
+    def subscribe(self, show_session_id: int) -> Subscription:
+        subscription = Subscription(show_session_id)
+        with self.lock:
+            self.subscribers[show_session_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self.lock:
+            subscribers = self.subscribers[subscription.show_session_id]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.subscribers[subscription.show_session_id]
+
+    def publish(self, show_session_id: int, event: dict) -> None:
+        with self.lock:
+            subscribers = list(self.subscribers.get(show_session_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.deliver, event
+                )
+            except RuntimeError:
+                # the subscriber's loop is closed, it went away
+                self.unsubscribe(subscription)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.PLANETARIUM_EVENTS_BACKEND)()
+
+
+def publish_seats(show_session_id: int, seats: list, taken: bool) -> None:
+    get_broker().publish(
+        show_session_id,
+        {
+            "type": "taken" if taken else "released",
+            "show_session": show_session_id,
+            "seats": [[row, seat] for row, seat in seats],
+        },
+    )
@@ -0,0 +1,186 @@
+"""Read-only list pages serialized straight from ``.values()`` rows.
+
+A ``ValuesSerializer`` is compiled once per serializer class: every
+output field becomes a column lookup (plus the field's own
+``to_representation`` where the database value is not already the JSON
+value), so a page is built without model instances or per-field
+``get_attribute`` calls. The output matches the serializer's.
+
+Fields that don't map onto a column are declared on the serializer:
+``values_columns`` maps the field name to the columns it needs and an
+optional ``represent_<name>(*values)`` computes the value. Forward
+many-to-many ``SlugRelatedField`` lists are loaded with one extra query
+per page.
+"""
+from functools import cache, partial
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Fields whose to_representation of a database value is the value itself
+PLAIN_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+)
+
+
+def load_slugs(model, source: str, slug_field: str, ids: list) -> dict:
+    """``{id: [slug, ...]}`` of the ``source`` many-to-many relation"""
+    field = model._meta.get_field(source)
+    lookup = field.related_query_name()
+    slugs = {}
+    for pk, slug in field.related_model._default_manager.filter(
+        **{f"{lookup}__in": ids}
+    ).values_list(lookup, slug_field):
+        slugs.setdefault(pk, []).append(slug)
+    return slugs
+
+
+def convert(column: str, to_representation):
+    def get(row):
+        value = row[column]
+        return None if value is None else to_representation(value)
+
+    return get
+
+
+def compute(columns: tuple, method):
+    return lambda row: method(*[row[column] for column in columns])
+
+
+class ValuesSerializer:
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        self.model = serializer.Meta.model
+        self.columns = {"id"}
+        self.loaders = []
+        self.accessors = [
+            (name, self.compile_field(serializer, name, field))
+            for name, field in serializer.fields.items()
+            if not field.write_only
+        ]
+
+    def compile_field(self, serializer, name: str, field):
+        columns = getattr(serializer, "values_columns", {}).get(name)
+        if columns is not None:
+            self.columns.update(columns)
+            method = getattr(serializer, f"represent_{name}", None)
+            if method is None:
+                return itemgetter(*columns)
+            return compute(columns, method)
+
+        if isinstance(field, serializers.ManyRelatedField) and isinstance(
+            field.child_relation, serializers.SlugRelatedField
+        ):
+            self.loaders.append(
+                (
+                    name,
+                    partial(
+                        load_slugs,
+                        self.model,
+                        field.source,
+                        field.child_relation.slug_field,
+                    ),
+                )
+            )
+            return itemgetter(name)
+
+        path = list(field.source_attrs)
+        if isinstance(field, serializers.SlugRelatedField):
+            path.append(field.slug_field)
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            pass
+        elif isinstance(
+            field,
+            (
+                serializers.BaseSerializer,
+                serializers.RelatedField,
+                serializers.ManyRelatedField,
+                serializers.SerializerMethodField,
+            ),
+        ) or not self.is_column(path):
+            raise ImproperlyConfigured(
+                f"{type(serializer).__name__}.{name} needs an entry in "
+                "values_columns to be serialized from values()"
+            )
+
+        column = "__".join(path)
+        self.columns.add(column)
+        if isinstance(field, (*PLAIN_FIELDS, serializers.RelatedField)):
+            return itemgetter(column)
+        return convert(column, field.to_representation)
+
+    def is_column(self, path: list) -> bool:
+        model = self.model
+        for attr in path[:-1]:
+            try:
+                field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                return False
+            if not (field.many_to_one or field.one_to_one):
+                return False
+            model = field.related_model
+        try:
+            return model._meta.get_field(path[-1]).concrete
+        except FieldDoesNotExist:
+            return False
+
+    def values(self, queryset):
+        """Rows of ``queryset`` with every column the output reads.
+
+        Ordering fields are fetched too, for keyset pagination cursors;
+        the queryset's model may differ from the serializer's (a history
+        view), so its own ordering is the one paginated.
+        """
+        ordering = [
+            field.lstrip("-")
+            for field in (
+                queryset.query.order_by or queryset.model._meta.ordering
+            )
+            if isinstance(field, str)
+        ]
+        return queryset.prefetch_related(None).values(
+            *self.columns.union(ordering)
+        )
+
+    def to_representation(self, rows: list[dict]) -> list[dict]:
+        if self.loaders:
+            ids = [row["id"] for row in rows]
+            for name, load in self.loaders:
+                values = load(ids)
+                for row in rows:
+                    row[name] = values.get(row["id"], [])
+        accessors = self.accessors
+        return [{name: get(row) for name, get in accessors} for row in rows]
+
+
+values_serializer = cache(ValuesSerializer)
+
+
+class ValuesListMixin:
+    """Serve ``list`` from ``.values()`` rows.
+
+    Enabled with the ``PLANETARIUM_VALUES_LISTS`` setting; requests for
+    sparse fieldsets or expansions keep using the serializer.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_values_list(request):
+            return super().list(request, *args, **kwargs)
+
+        values = values_serializer(self.get_serializer_class())
+        queryset = values.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values.to_representation(page))
+        return Response(values.to_representation(list(queryset)))
+
+    def use_values_list(self, request) -> bool:
+        return settings.PLANETARIUM_VALUES_LISTS and not (
+            "fields" in request.query_params
+            or "expand" in request.query_params
+        )
@@ -0,0 +1,193 @@
+"""Sparse fieldsets (``?fields=``) and explicit expansion (``?expand=``).
+
+Both parameters take comma separated field names, dotted to reach into
+nested serializers: ``?fields=id,tickets.row,tickets.seat`` keeps only
+these fields, and ``?expand=tickets.show_session`` renders a relation
+listed in the serializer's ``expandable_fields`` as a nested object
+instead of its default (usually a primary key). Responses of requests
+without these parameters are unchanged.
+
+Viewsets build their querysets with ``FieldsetViewMixin`` so that only
+the relations the response actually renders are joined or prefetched.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_paths(value: str) -> dict:
+    """``"id,tickets.row"`` -> ``{"id": {}, "tickets": {"row": {}}}``"""
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in path.strip().split("."):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def merge_paths(tree: dict, other: dict) -> dict:
+    for name, subtree in other.items():
+        merge_paths(tree.setdefault(name, {}), subtree)
+    return tree
+
+
+class FieldsetMixin:
+    """Serializer mixin honouring ``?fields=`` and ``?expand=``.
+
+    ``expandable_fields`` maps a field name to ``(serializer, kwargs)``,
+    the serializer given as a class or a dotted path. ``field_relations``
+    lists the model relations (``__`` separated) a non-relational field,
+    e.g. a property, reads so that they get joined as well.
+    """
+
+    expandable_fields = {}
+    field_relations = {}
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fieldsets = None
+        if fields is not None or expand is not None:
+            self.fieldsets = (fields or {}, expand or {})
+
+    def get_fieldsets(self) -> tuple[dict, dict]:
+        """Requested ``(fields, expand)`` trees of this serializer.
+
+        Nested serializers receive their subtrees from the parent; only
+        the top-level one reads the query parameters, and only for reads.
+        """
+        if self.fieldsets is not None:
+            return self.fieldsets
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        request = self.context.get("request")
+        if (
+            parent is not None
+            or request is None
+            or request.method not in SAFE_METHODS
+        ):
+            return {}, {}
+        return (
+            parse_paths(request.query_params.get("fields", "")),
+            parse_paths(request.query_params.get("expand", "")),
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, expand = self.get_fieldsets()
+
+        expanded = set()
+        for name, subtree in expand.items():
+            if name not in self.expandable_fields:
+                continue
+            serializer_class, kwargs = self.expandable_fields[name]
+            if isinstance(serializer_class, str):
+                serializer_class = import_string(serializer_class)
+            fields[name] = serializer_class(
+                read_only=True,
+                fields=requested.get(name),
+                expand=subtree,
+                **kwargs,
+            )
+            expanded.add(name)
+
+        if requested:
+            fields = type(fields)(
+                (name, field)
+                for name, field in fields.items()
+                if name in requested
+            )
+
+        for name, field in fields.items():
+            nested = getattr(field, "child", field)
+            if name not in expanded and isinstance(nested, FieldsetMixin):
+                nested.fieldsets = (
+                    requested.get(name, {}),
+                    expand.get(name, {}),
+                )
+        return fields
+
+
+def serializer_relations(serializer, model) -> dict:
+    """Tree of the ``model`` relations rendered by ``serializer``"""
+    tree = {}
+    fields = serializer.fields
+    for name, paths in getattr(serializer, "field_relations", {}).items():
+        if name in fields:
+            for path in paths:
+                merge_paths(tree, parse_paths(path.replace("__", ".")))
+
+    for field in fields.values():
+        if field.write_only or isinstance(
+            field, serializers.PrimaryKeyRelatedField
+        ):
+            continue
+        nested = getattr(field, "child", field)
+        if not isinstance(nested, serializers.BaseSerializer):
+            nested = None
+        if field.source == "*":
+            if nested is not None:
+                merge_paths(tree, serializer_relations(nested, model))
+            continue
+
+        node, current = tree, model
+        for attr in field.source_attrs:
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation:
+                break
+            node = node.setdefault(attr, {})
+            current = model_field.related_model
+        else:
+            if nested is not None and node is not tree:
+                merge_paths(node, serializer_relations(nested, current))
+    return tree
+
+
+def select_relations(queryset, tree: dict):
+    """Join forward relations of ``tree`` and prefetch the others"""
+    select, prefetch = [], []
+
+    def collect(model, tree, prefix):
+        for name, subtree in tree.items():
+            field = model._meta.get_field(name)
+            path = prefix + name
+            if field.many_to_many or field.one_to_many:
+                if field.one_to_many:
+                    # prefetching already fills the back reference
+                    subtree = {
+                        attr: value
+                        for attr, value in subtree.items()
+                        if attr != field.field.name
+                    }
+                related = field.related_model._default_manager.all()
+                prefetch.append(
+                    Prefetch(
+                        path, queryset=select_relations(related, subtree)
+                    )
+                )
+            else:
+                select.append(path)
+                collect(field.related_model, subtree, f"{path}__")
+
+    collect(queryset.model, tree, "")
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class FieldsetViewMixin:
+    """Join and prefetch what the response serializer renders"""
+
+    def select_fieldset_relations(self, queryset):
+        return select_relations(
+            queryset,
+            serializer_relations(self.get_serializer(), queryset.model),
+        )
@@ -0,0 +1,106 @@
+from datetime import date, datetime, time
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from planetarium.models import AstronomyShow
+
+
+def params_to_ints(name: str, value: str) -> list[int]:
+    try:
+        return [int(str_id) for str_id in value.split(",")]
+    except ValueError:
+        raise ValidationError(
+            {name: "Expected a comma separated list of ids."}
+        )
+
+
+def parse_day(name: str, value: str) -> date:
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({name: "Expected an ISO date."})
+    return day
+
+
+def parse_time(name: str, value: str) -> datetime:
+    """Accept an ISO datetime or a date (midnight, local time)"""
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is not None:
+                moment = datetime.combine(day, time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValidationError({name: "Expected an ISO date or datetime."})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class ShowSessionFilter(BaseFilterBackend):
+    """AND-combined query parameter filters for show sessions.
+
+    Every condition narrows the same queryset; themes are matched through
+    a subquery on the M2M table, so sessions are never duplicated and no
+    DISTINCT is needed.
+    """
+
+    true_values = ("1", "true", "yes")
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        astronomy_show = params.get("astronomy_show")
+        if astronomy_show:
+            queryset = queryset.filter(
+                astronomy_show_id__in=params_to_ints(
+                    "astronomy_show", astronomy_show
+                )
+            )
+
+        planetarium_dome = params.get("planetarium_dome")
+        if planetarium_dome:
+            queryset = queryset.filter(
+                planetarium_dome_id__in=params_to_ints(
+                    "planetarium_dome", planetarium_dome
+                )
+            )
+
+        show_theme = params.get("show_theme")
+        if show_theme:
+            themed_shows = AstronomyShow.show_theme.through.objects.filter(
+                showtheme_id__in=params_to_ints("show_theme", show_theme)
+            ).values("astronomyshow_id")
+            queryset = queryset.filter(astronomy_show_id__in=themed_shows)
+
+        show_time_after = params.get("show_time_after")
+        if show_time_after:
+            queryset = queryset.filter(
+                show_time__gte=parse_time(
+                    "show_time_after", show_time_after
+                )
+            )
+
+        show_time_before = params.get("show_time_before")
+        if show_time_before:
+            queryset = queryset.filter(
+                show_time__lt=parse_time(
+                    "show_time_before", show_time_before
+                )
+            )
+
+        if params.get("available", "").lower() in self.true_values:
+            queryset = queryset.filter(
+                tickets_sold__lt=F("planetarium_dome__rows")
+                * F("planetarium_dome__seats_in_row")
+            )
+
+        return queryset
@@ -0,0 +1,248 @@
+"""Streaming load and dump of planetarium data in Django's fixture format.
+
+Unlike ``loaddata``/``dumpdata`` nothing here holds the whole fixture in
+memory: the JSON array is decoded one object at a time and rows are
+written in batches per model, in dependency order.
+"""
+import json
+from collections import Counter, defaultdict
+from typing import Iterable, Iterator, TextIO
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from planetarium.occupancy import rebuild_many
+from planetarium.schedule import rebuild_all
+from planetarium.search import update_search_vectors
+
+# Dependency order: every model only references models listed before it
+# (reservations also reference users, which are not part of the dump).
+MODELS = (
+    "planetarium.showtheme",
+    "planetarium.astronomyshow",
+    "planetarium.planetariumdome",
+    "planetarium.showsession",
+    "planetarium.reservation",
+    "planetarium.ticket",
+    "planetarium.archivedshowsession",
+    "planetarium.archivedreservation",
+    "planetarium.archivedticket",
+)
+
+
+def iter_json_array(stream: TextIO, chunk_size: int = 64 * 1024) -> Iterator:
+    """Yield the items of the JSON array in ``stream`` one by one"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        while position < len(buffer) and (
+            buffer[position].isspace() or buffer[position] == ","
+        ):
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Fixture must be a JSON array")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield item
+                continue
+        elif eof:
+            raise ValueError("Unexpected end of fixture")
+
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+class FixtureLoader:
+    """Insert fixture objects in batches, bypassing ``save()`` and signals.
+
+    Rows are written like ``loaddata`` writes them (raw, so e.g.
+    ``auto_now_add`` values are kept and existing primary keys are
+    overwritten), foreign keys are checked once at the end, then the
+    occupancy of every touched show session, the schedule and the
+    search vectors are rebuilt. Objects of other models are counted in
+    ``skipped``.
+    """
+
+    def __init__(self, batch_size: int = 1000, using: str = DEFAULT_DB_ALIAS):
+        self.batch_size = batch_size
+        self.using = using
+        self.connection = connections[using]
+        self.pending = defaultdict(list)
+        self.show_themes = []
+        self.loaded = Counter()
+        self.skipped = Counter()
+        self.session_ids = set()
+
+    def load(self, records: Iterable[dict]) -> None:
+        with transaction.atomic(using=self.using):
+            with self.connection.constraint_checks_disabled():
+                objects = serializers.deserialize(
+                    "python", self._supported(records), using=self.using
+                )
+                for deserialized in objects:
+                    self._add(deserialized)
+                for label in MODELS:
+                    self._flush(label)
+            self.connection.check_constraints(table_names=self._tables())
+            self._reset_sequences()
+            rebuild_many(self.session_ids, self.batch_size)
+            if self.loaded:
+                rebuild_all()
+                update_search_vectors()
+
+    def _supported(self, records: Iterable[dict]) -> Iterator[dict]:
+        for record in records:
+            label = record["model"].lower()
+            if label in MODELS:
+                yield record
+            else:
+                self.skipped[label] += 1
+
+    def _add(self, deserialized) -> None:
+        obj = deserialized.object
+        label = obj._meta.label_lower
+        for field in obj._meta.concrete_fields:
+            # snapshots taken before updated_at existed
+            if getattr(field, "auto_now", False) and not getattr(
+                obj, field.attname
+            ):
+                setattr(obj, field.attname, timezone.now())
+        self.pending[label].append(obj)
+        show_themes = deserialized.m2m_data.get("show_theme")
+        if show_themes is not None:
+            self.show_themes.append((obj.pk, show_themes))
+        if len(self.pending[label]) >= self.batch_size:
+            self._flush(label)
+
+    def _flush(self, label: str) -> None:
+        objs = self.pending.pop(label, [])
+        if not objs:
+            return
+        model = apps.get_model(label)
+        self._insert(model, objs)
+        self.loaded[label] += len(objs)
+
+        if label == "planetarium.showsession":
+            self.session_ids.update(obj.pk for obj in objs)
+        elif label == "planetarium.ticket":
+            self.session_ids.update(obj.show_session_id for obj in objs)
+        elif label == "planetarium.astronomyshow":
+            self._flush_show_themes(model)
+
+    def _flush_show_themes(self, model) -> None:
+        through = model.show_theme.through
+        through.objects.using(self.using).filter(
+            astronomyshow_id__in=[show_id for show_id, _ in self.show_themes]
+        ).delete()
+        through.objects.using(self.using).bulk_create(
+            [
+                through(astronomyshow_id=show_id, showtheme_id=theme_id)
+                for show_id, theme_ids in self.show_themes
+                for theme_id in theme_ids
+            ],
+            batch_size=self.batch_size,
+        )
+        self.show_themes = []
+
+    def _insert(self, model, objs: list) -> None:
+        opts = model._meta
+        fields = opts.concrete_fields
+        update_fields = [field for field in fields if not field.primary_key]
+        batch_size = max(
+            self.connection.ops.bulk_batch_size(fields, objs), 1
+        )
+        # Same raw insert as Model.save_base(raw=True), many rows at once.
+        for start in range(0, len(objs), batch_size):
+            model._base_manager.using(self.using)._insert(
+                objs[start: start + batch_size],
+                fields=fields,
+                raw=True,
+                using=self.using,
+                on_conflict=OnConflict.UPDATE,
+                update_fields=update_fields,
+                unique_fields=[opts.pk],
+            )
+
+    def _tables(self) -> list[str]:
+        models = [apps.get_model(label) for label in self.loaded]
+        tables = [model._meta.db_table for model in models]
+        if "planetarium.astronomyshow" in self.loaded:
+            tables.append(
+                apps.get_model("planetarium.astronomyshow")
+                .show_theme.through._meta.db_table
+            )
+        return tables
+
+    def _reset_sequences(self) -> None:
+        models = [apps.get_model(label) for label in self.loaded]
+        statements = self.connection.ops.sequence_reset_sql(
+            no_style(), models
+        )
+        with self.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def dump(
+    stream: TextIO,
+    batch_size: int = 1000,
+    using: str = DEFAULT_DB_ALIAS,
+) -> Counter:
+    """Write planetarium data to ``stream`` as a fixture, row by row.
+
+    The output is a JSON array with one object per line, loadable by
+    both ``load_planetarium`` and ``loaddata``.
+    """
+    serializer = serializers.get_serializer("python")()
+    dumped = Counter()
+    separator = "[\n"
+    for label in MODELS:
+        model = apps.get_model(label)
+        queryset = model._base_manager.using(using).order_by("pk")
+        if label == "planetarium.astronomyshow":
+            queryset = queryset.prefetch_related("show_theme")
+        batch = []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) < batch_size:
+                continue
+            separator = _write(stream, serializer, batch, separator)
+            dumped[label] += len(batch)
+            batch = []
+        if batch:
+            separator = _write(stream, serializer, batch, separator)
+            dumped[label] += len(batch)
+    stream.write("[]\n" if separator == "[\n" else "\n]\n")
+    return dumped
+
+
+def _write(stream: TextIO, serializer, objs: list, separator: str) -> str:
+    for record in serializer.serialize(objs):
+        stream.write(separator)
+        stream.write(
+            json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False)
+        )
+        separator = ",\n"
+    return separator
@@ -0,0 +1,219 @@
+from datetime import timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from planetarium.models import (
+    HeldSeat,
+    SeatHold,
+    ShowSession,
+    Ticket,
+)
+from planetarium.occupancy import occupy_seats
+from planetarium.seating import best_block
+
+SEAT_TAKEN_MESSAGE = "This seat is already taken."
+NO_BLOCK_MESSAGE = "No {count} adjacent seats are available."
+SESSION_GONE_MESSAGE = "This show session no longer exists."
+HOLD_LIMIT_MESSAGE = "At most {limit} seats of a session can be held."
+
+
+def lock_sessions(session_ids: Iterable[int]) -> dict[int, ShowSession]:
+    """Lock show session rows in ascending id order.
+
+    Every writer that books or holds seats goes through this first, so
+    concurrent checkouts queue on the session rows in the same order
+    instead of racing each other to the unique constraints. A session
+    deleted since the request was validated is reported as invalid.
+    """
+    session_ids = set(session_ids)
+    sessions = {
+        show_session.id: show_session
+        for show_session in ShowSession.objects.select_for_update(
+            of=("self",)
+        )
+        .select_related("planetarium_dome")
+        .filter(id__in=session_ids)
+        .order_by("id")
+    }
+    if len(sessions) < len(session_ids):
+        raise ValidationError({"show_session": [SESSION_GONE_MESSAGE]})
+    return sessions
+
+
+def sweep_expired_holds(session_ids: Iterable[int] | None = None) -> int:
+    holds = SeatHold.objects.filter(expires_at__lte=timezone.now())
+    if session_ids is not None:
+        holds = holds.filter(show_session_id__in=set(session_ids))
+    deleted, per_model = holds.delete()
+    return per_model.get(SeatHold._meta.label, 0)
+
+
+def held_seats(
+    seats: set[tuple[int, int, int]], user_id: int | None = None
+) -> set:
+    """Return which ``(row, seat, show_session_id)`` are held by others"""
+    if not seats:
+        return set()
+    active = HeldSeat.objects.filter(
+        show_session_id__in={show_session for _, _, show_session in seats},
+        row__in={row for row, _, _ in seats},
+        seat__in={seat for _, seat, _ in seats},
+        hold__expires_at__gt=timezone.now(),
+    )
+    if user_id is not None:
+        active = active.exclude(hold__user_id=user_id)
+    return seats.intersection(
+        active.values_list("row", "seat", "show_session_id")
+    )
+
+
+def active_held_seats(show_session_id: int) -> set[tuple[int, int]]:
+    """``(row, seat)`` of every live hold on a session"""
+    return set(
+        HeldSeat.objects.filter(
+            show_session_id=show_session_id,
+            hold__expires_at__gt=timezone.now(),
+        ).values_list("row", "seat")
+    )
+
+
+def _check_available(
+    sessions: dict[int, ShowSession], seats: set, user_id: int | None
+) -> None:
+    for row, seat, show_session_id in seats:
+        seat_map = sessions[show_session_id].get_seat_map()
+        if seat_map.contains(row, seat) and seat_map.is_taken(row, seat):
+            raise ValidationError(SEAT_TAKEN_MESSAGE)
+    if held_seats(seats, user_id):
+        raise ValidationError(SEAT_TAKEN_MESSAGE)
+
+
+def create_hold(
+    user_id: int, show_session_id: int, seats: list[dict], minutes: int
+) -> SeatHold:
+    with transaction.atomic():
+        sessions = lock_sessions([show_session_id])
+        show_session = sessions[show_session_id]
+        sweep_expired_holds([show_session_id])
+
+        requested = {
+            (seat["row"], seat["seat"], show_session_id) for seat in seats
+        }
+        if len(requested) != len(seats):
+            raise ValidationError(SEAT_TAKEN_MESSAGE)
+        # Expired holds were swept above, the rest count against the user.
+        held = HeldSeat.objects.filter(
+            show_session_id=show_session_id, hold__user_id=user_id
+        ).count()
+        limit = settings.PLANETARIUM_SEAT_HOLD_MAX_SEATS
+        if held + len(requested) > limit:
+            raise ValidationError(HOLD_LIMIT_MESSAGE.format(limit=limit))
+        dome = show_session.planetarium_dome
+        for row, seat, _ in requested:
+            Ticket.validate_seat_and_row(
+                seat=seat,
+                num_seat=dome.seats_in_row,
+                row=row,
+                num_rows=dome.rows,
+            )
+        _check_available(sessions, requested, user_id=None)
+
+        hold = SeatHold.objects.create(
+            show_session=show_session,
+            user_id=user_id,
+            expires_at=timezone.now() + timedelta(minutes=minutes),
+        )
+        HeldSeat.objects.bulk_create(
+            HeldSeat(
+                hold=hold, show_session=show_session, row=row, seat=seat
+            )
+            for row, seat, _ in sorted(requested)
+        )
+        return hold
+
+
+def hold_best_seats(
+    user_id: int, show_session_id: int, count: int, minutes: int
+) -> SeatHold:
+    """Hold the best block of ``count`` adjacent seats for the user.
+
+    The block is chosen under the session lock, so the hold cannot lose
+    a race for the seats it was computed from.
+    """
+    with transaction.atomic():
+        show_session = lock_sessions([show_session_id])[show_session_id]
+        sweep_expired_holds([show_session_id])
+        block = best_block(
+            show_session.get_seat_map(),
+            count,
+            blocked=active_held_seats(show_session_id),
+        )
+        if block is None:
+            raise ValidationError(NO_BLOCK_MESSAGE.format(count=count))
+        return create_hold(
+            user_id=user_id,
+            show_session_id=show_session_id,
+            seats=[{"row": row, "seat": seat} for row, seat in block],
+            minutes=minutes,
+        )
+
+
+def book_seats(reservation, tickets_data: list[dict]) -> list[Ticket]:
+    """Insert tickets while holding the locks of their sessions.
+
+    Availability is re-checked under the lock, so a lost race surfaces
+    as a validation error rather than an IntegrityError.
+    """
+    requested = {
+        (ticket["row"], ticket["seat"], ticket["show_session"].id)
+        for ticket in tickets_data
+    }
+    sessions = lock_sessions(
+        show_session for _, _, show_session in requested
+    )
+    _check_available(sessions, requested, user_id=reservation.user_id)
+    tickets = Ticket.objects.bulk_create(
+        Ticket(reservation=reservation, **ticket_data)
+        for ticket_data in tickets_data
+    )
+    occupy_seats(tickets)
+    return tickets
+
+
+def convert_hold(hold: SeatHold, reservation) -> list[Ticket]:
+    """Turn a live hold into tickets of ``reservation``.
+
+    The held seats are re-checked against the seat map under the session
+    lock, so a seat sold despite the hold is reported as taken instead of
+    failing on the unique constraint.
+    """
+    sessions = lock_sessions([hold.show_session_id])
+    hold = (
+        SeatHold.objects.select_for_update()
+        .filter(id=hold.id, expires_at__gt=timezone.now())
+        .first()
+    )
+    if hold is None:
+        raise ValidationError("Seat hold has expired.")
+    seats = list(hold.seats.all())
+    _check_available(
+        sessions,
+        {(seat.row, seat.seat, seat.show_session_id) for seat in seats},
+        user_id=hold.user_id,
+    )
+    tickets = Ticket.objects.bulk_create(
+        Ticket(
+            reservation=reservation,
+            show_session_id=seat.show_session_id,
+            row=seat.row,
+            seat=seat.seat,
+        )
+        for seat in seats
+    )
+    occupy_seats(tickets)
+    hold.delete()
+    return tickets
@@ -0,0 +1,135 @@
+"""Idempotency keys for create requests.
+
+A POST to a viewset with ``IdempotencyMixin`` may carry an
+``Idempotency-Key`` header. The first successful response to a key is
+kept in the cache, per user, for ``PLANETARIUM_IDEMPOTENCY_TTL`` seconds
+and retries with the same key get it back (marked with
+``Idempotent-Replayed: true``) without running the view again.
+
+Concurrent duplicates wait, for at most
+``PLANETARIUM_IDEMPOTENCY_LOCK_SECONDS``, behind a lock taken with
+``cache.add`` by the first of them, then replay its response or get 409
+if it is still running. The lock lives for
+``PLANETARIUM_IDEMPOTENCY_LOCK_TTL`` seconds, so that a crashed worker
+can't block a key forever; it must outlast the slowest request the
+server lets run (its request timeout), as a retry arriving after the
+lock expired runs the view again. A request only releases its own lock.
+Failed requests are not stored, so they can be retried with the same
+key. Reusing a key with another body is rejected
+with 422. Keys are refused on file uploads, whose bodies are not
+fingerprinted.
+
+Stored responses and locks only work across processes with a shared
+cache (``manage.py check --deploy`` warns with ``planetarium.W001``).
+"""
+import hashlib
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+KEY_PREFIX = "planetarium:idempotency"
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05
+
+
+def request_fingerprint(request) -> str:
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    payload = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class IdempotencyMixin:
+    """``Idempotency-Key`` support for ``create``, see the module docstring"""
+
+    def get_idempotency_key(self, request, key: str) -> str:
+        digest = hashlib.sha256(f"{request.path}:{key}".encode()).hexdigest()
+        return f"{KEY_PREFIX}:{request.user.pk}:{digest}"
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name=HEADER,
+                location=OpenApiParameter.HEADER,
+                description="Retries with the same key replay the first "
+                "successful response instead of creating again",
+            ),
+        ]
+    )
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None or request.user.pk is None:
+            return super().create(request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                {HEADER: f"Expected 1 to {MAX_KEY_LENGTH} characters."}
+            )
+
+        if request.FILES:
+            raise ValidationError(
+                {HEADER: "Not supported on requests with file uploads."}
+            )
+
+        cache_key = self.get_idempotency_key(request, key)
+        lock_key = f"{cache_key}:lock"
+        fingerprint = request_fingerprint(request)
+        token = uuid.uuid4().hex
+        deadline = (
+            time.monotonic() + settings.PLANETARIUM_IDEMPOTENCY_LOCK_SECONDS
+        )
+        while True:
+            stored = cache.get(cache_key)
+            if stored is not None:
+                return self.replay_response(stored, fingerprint)
+            if cache.add(
+                lock_key, token, settings.PLANETARIUM_IDEMPOTENCY_LOCK_TTL
+            ):
+                break
+            if time.monotonic() >= deadline:
+                return Response(
+                    {"detail": f"A request with this {HEADER} is running."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            response = super().create(request, *args, **kwargs)
+            if status.is_success(response.status_code):
+                cache.set(
+                    cache_key,
+                    {
+                        "fingerprint": fingerprint,
+                        "status": response.status_code,
+                        "data": response.data,
+                        "headers": dict(response.items()),
+                    },
+                    settings.PLANETARIUM_IDEMPOTENCY_TTL,
+                )
+            return response
+        finally:
+            # After the TTL the lock may belong to a retry by now.
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    def replay_response(self, stored: dict, fingerprint: str) -> Response:
+        if stored["fingerprint"] != fingerprint:
+            return Response(
+                {"detail": f"This {HEADER} was used with another request."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        return Response(
+            stored["data"],
+            status=stored["status"],
+            headers={**stored["headers"], REPLAYED_HEADER: "true"},
+        )
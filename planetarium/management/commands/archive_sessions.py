@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from planetarium.archive import archive_chunk
+from planetarium.filters import parse_time
+
+
+class Command(BaseCommand):
+    help = (
+        "Move show sessions that started before a date, their tickets and "
+        "fully archived reservations into the archive tables"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            required=True,
+            help="ISO date or datetime, dates are local midnight",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Sessions moved per transaction",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between chunks",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            before = parse_time("before", options["before"])
+        except ValidationError as error:
+            raise CommandError(error.detail["before"])
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        totals = {"sessions": 0, "tickets": 0, "reservations": 0}
+        while True:
+            archived = archive_chunk(before, options["chunk_size"])
+            if not archived["sessions"]:
+                break
+            for name, count in archived.items():
+                totals[name] += count
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"{archived['sessions']} session(s), "
+                    f"{archived['tickets']} ticket(s), "
+                    f"{archived['reservations']} reservation(s) archived."
+                )
+            time.sleep(options["pause"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{totals['sessions']} session(s), "
+                f"{totals['tickets']} ticket(s) and "
+                f"{totals['reservations']} reservation(s) archived."
+            )
+        )
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient
+from django.urls import reverse
+
+from planetarium.benchmarks import patched_setting, percentile
+from planetarium.models import ShowSession
+
+ENDPOINTS = {
+    "show_sessions": ("showsession-list", False),
+    "show_session": ("showsession-detail", True),
+    "seat_map": ("showsession-seat-map", True),
+    "astronomy_shows": ("astronomyshow-list", False),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync DRF read endpoints with their async versions "
+        "under concurrent in-process ASGI requests and print JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint", choices=sorted(ENDPOINTS), default="show_sessions"
+        )
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=50)
+
+    def handle(self, *args, **options):
+        name, detail = ENDPOINTS[options["endpoint"]]
+        args = []
+        if detail:
+            show_session = ShowSession.objects.order_by("id").first()
+            if show_session is None:
+                raise CommandError("At least one show session is required.")
+            args = [show_session.id]
+
+        report = {"endpoint": options["endpoint"]}
+        for mode, url_name in (("sync", name), ("async", f"async-{name}")):
+            url = reverse(f"planetarium:{url_name}", args=args)
+            # The async views don't use the catalog cache, so the sync
+            # views mustn't either: both modes read the database.
+            with patched_setting(
+                "ALLOWED_HOSTS", [*settings.ALLOWED_HOSTS, "testserver"]
+            ), patched_setting("PLANETARIUM_CATALOG_CACHE_TIMEOUT", 0):
+                report[mode] = asyncio.run(
+                    self.run(url, options["requests"], options["concurrency"])
+                )
+        report["speedup"] = round(
+            report["async"]["throughput_rps"]
+            / report["sync"]["throughput_rps"],
+            2,
+        )
+        self.stdout.write(json.dumps(report, indent=2))
+
+    @staticmethod
+    async def run(url: str, requests: int, concurrency: int) -> dict:
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def fetch():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append((time.perf_counter() - started) * 1000)
+                return response.status_code
+
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(fetch() for _ in range(requests)))
+        duration = time.perf_counter() - started
+        return {
+            "requests": requests,
+            "concurrency": concurrency,
+            "errors": sum(code != 200 for code in statuses),
+            "duration_s": round(duration, 3),
+            "throughput_rps": round(requests / duration, 2),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "mean": round(statistics.fmean(latencies), 2),
+            },
+        }
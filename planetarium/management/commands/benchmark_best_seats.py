@@ -0,0 +1,78 @@
+import json
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from planetarium.benchmarks import percentile
+from planetarium.occupancy import SeatMap
+from planetarium.seating import best_block
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark of the best-seats allocator on randomly filled "
+        "seat maps, printed as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20)
+        parser.add_argument("--seats-in-row", type=int, default=25)
+        parser.add_argument("--count", type=int, default=4)
+        parser.add_argument(
+            "--occupancy",
+            type=float,
+            default=0.7,
+            help="Share of taken seats, between 0 and 1",
+        )
+        parser.add_argument(
+            "--maps", type=int, default=100, help="Distinct seat maps"
+        )
+        parser.add_argument("--iterations", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        seat_maps = [
+            self.random_seat_map(rng, options) for _ in range(options["maps"])
+        ]
+
+        latencies = []
+        found = 0
+        for i in range(options["iterations"]):
+            seat_map = seat_maps[i % len(seat_maps)]
+            started = time.perf_counter()
+            block = best_block(seat_map, options["count"])
+            latencies.append((time.perf_counter() - started) * 1_000_000)
+            found += block is not None
+
+        self.stdout.write(
+            json.dumps(
+                {
+                    "seats": options["rows"] * options["seats_in_row"],
+                    "count": options["count"],
+                    "occupancy": options["occupancy"],
+                    "iterations": options["iterations"],
+                    "found": found,
+                    "latency_us": {
+                        "p50": round(percentile(latencies, 50), 1),
+                        "p95": round(percentile(latencies, 95), 1),
+                        "p99": round(percentile(latencies, 99), 1),
+                        "mean": round(statistics.fmean(latencies), 1)
+                        if latencies
+                        else 0,
+                    },
+                },
+                indent=2,
+            )
+        )
+
+    @staticmethod
+    def random_seat_map(rng: random.Random, options: dict) -> SeatMap:
+        seat_map = SeatMap(options["rows"], options["seats_in_row"])
+        for row in range(1, options["rows"] + 1):
+            for seat in range(1, options["seats_in_row"] + 1):
+                if rng.random() < options["occupancy"]:
+                    seat_map.occupy(row, seat)
+        return seat_map
@@ -0,0 +1,126 @@
+import json
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from planetarium import cache
+from planetarium.benchmarks import percentile
+from planetarium.models import AstronomyShow, ShowTheme
+from planetarium.pagination import OrderPagination
+from planetarium.search import search_shows, update_search_vectors
+
+WORDS = (
+    "nebula galaxy comet asteroid pulsar quasar supernova orbit planet "
+    "moon eclipse horizon cosmos gravity telescope aurora meteor stellar "
+    "constellation universe radiation spectrum singularity wormhole "
+    "exoplanet satellite voyage journey mystery origin frontier ring "
+    "dust cloud light dark matter energy star cluster black hole"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure astronomy show search latency (count and first page) "
+        "on a synthetic catalog and print JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--shows", type=int, default=100_000)
+        parser.add_argument("--themes", type=int, default=20)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the synthetic catalog instead of deleting it",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.label = f"searchbench-{uuid.uuid4().hex[:8]}"
+        started = time.perf_counter()
+        self.seed(options)
+        seeded = time.perf_counter() - started
+        try:
+            report = self.run(options)
+        finally:
+            if not options["keep"]:
+                self.cleanup()
+        report["seed_s"] = round(seeded, 2)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def words(self, count: int) -> str:
+        return " ".join(self.random.choices(WORDS, k=count))
+
+    def seed(self, options: dict) -> None:
+        themes = ShowTheme.objects.bulk_create(
+            ShowTheme(name=f"{self.label} {self.words(1)} {i}")
+            for i in range(options["themes"])
+        )
+        through = AstronomyShow.show_theme.through
+        batch_size = options["batch_size"]
+        for start in range(0, options["shows"], batch_size):
+            stop = min(start + batch_size, options["shows"])
+            shows = AstronomyShow.objects.bulk_create(
+                AstronomyShow(
+                    title=f"{self.label} {i} {self.words(3)}",
+                    description=self.words(25),
+                )
+                for i in range(start, stop)
+            )
+            ids = [show.id for show in shows]
+            through.objects.bulk_create(
+                through(astronomyshow_id=show_id, showtheme_id=theme.id)
+                for show_id in ids
+                for theme in self.random.sample(themes, k=2)
+            )
+            update_search_vectors(ids)
+        # bulk_create sends no signals
+        cache.bump_version(AstronomyShow)
+
+    def cleanup(self) -> None:
+        shows = AstronomyShow.objects.filter(
+            title__startswith=f"{self.label} "
+        )
+        ids = list(shows.values_list("id", flat=True))
+        AstronomyShow.show_theme.through.objects.filter(
+            astronomyshow__in=shows
+        ).delete()
+        # Skips loading every show just to send its delete signals.
+        shows._raw_delete(shows.db)
+        update_search_vectors(ids)
+        ShowTheme.objects.filter(name__startswith=f"{self.label} ").delete()
+        cache.bump_version(AstronomyShow)
+
+    def run(self, options: dict) -> dict:
+        latencies = []
+        matches = []
+        for _ in range(options["queries"]):
+            q = self.words(self.random.randint(1, 2))
+            started = time.perf_counter()
+            queryset = search_shows(AstronomyShow.objects.all(), q)
+            matches.append(queryset.count())
+            list(queryset[: OrderPagination.page_size])
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        return {
+            "vendor": connection.vendor,
+            "shows": options["shows"],
+            "queries": options["queries"],
+            "mean_matches": round(statistics.fmean(matches), 1)
+            if matches
+            else 0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "mean": round(statistics.fmean(latencies), 2)
+                if latencies
+                else 0,
+            },
+        }
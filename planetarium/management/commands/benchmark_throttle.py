@@ -0,0 +1,88 @@
+import json
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from planetarium.benchmarks import patched_setting, percentile
+from planetarium.throttling import (
+    IPTokenBucketThrottle,
+    UserTokenBucketThrottle,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark of the token-bucket throttle check against the "
+        "configured cache, printed as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20000)
+        parser.add_argument(
+            "--clients", type=int, default=100, help="Distinct buckets"
+        )
+        parser.add_argument(
+            "--capacity",
+            type=int,
+            default=50,
+            help="Tokens per client and minute",
+        )
+
+    def handle(self, *args, **options):
+        # A fresh scope, so every run starts with full buckets.
+        scope = f"benchmark-{uuid.uuid4().hex[:8]}"
+        view = SimpleNamespace(throttle_scope=scope)
+        rate = f"{options['capacity']}/min"
+        requests = [
+            SimpleNamespace(
+                user=SimpleNamespace(pk=i),
+                META={"REMOTE_ADDR": f"10.0.{i // 256 % 256}.{i % 256}"},
+            )
+            for i in range(options["clients"])
+        ]
+
+        report = {
+            "cache": settings.CACHES["default"]["BACKEND"],
+            "iterations": options["iterations"],
+            "clients": options["clients"],
+            "rate": rate,
+            "throttles": {},
+        }
+        with patched_setting(
+            "PLANETARIUM_THROTTLE_RATES",
+            {f"{scope}_user": rate, f"{scope}_ip": rate},
+        ):
+            for throttle_class in (
+                UserTokenBucketThrottle,
+                IPTokenBucketThrottle,
+            ):
+                report["throttles"][throttle_class.kind] = self.measure(
+                    throttle_class(), view, requests, options["iterations"]
+                )
+        self.stdout.write(json.dumps(report, indent=2))
+
+    @staticmethod
+    def measure(throttle, view, requests: list, iterations: int) -> dict:
+        latencies = []
+        allowed = 0
+        for i in range(iterations):
+            request = requests[i % len(requests)]
+            started = time.perf_counter()
+            allowed += throttle.allow_request(request, view)
+            latencies.append((time.perf_counter() - started) * 1_000_000)
+        return {
+            "allowed": allowed,
+            "refused": iterations - allowed,
+            "latency_us": {
+                "p50": round(percentile(latencies, 50), 1),
+                "p95": round(percentile(latencies, 95), 1),
+                "p99": round(percentile(latencies, 99), 1),
+                "mean": round(statistics.fmean(latencies), 1)
+                if latencies
+                else 0,
+            },
+        }
@@ -0,0 +1,146 @@
+import json
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from planetarium.benchmarks import percentile
+from planetarium.fastlists import ValuesSerializer
+from planetarium.fieldsets import select_relations, serializer_relations
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket,
+)
+from planetarium.serializers import (
+    AstronomyShowSerializer,
+    ShowSessionListSerializer,
+    TicketListSerializer,
+)
+
+LISTS = {
+    "astronomy_shows": (AstronomyShow, AstronomyShowSerializer),
+    "show_sessions": (ShowSession, ShowSessionListSerializer),
+    "tickets": (Ticket, TicketListSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-item time of list serializers with the .values() "
+        "path on synthetic pages and print JSON; the data is rolled back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items", type=int, default=100, help="Items per page"
+        )
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options["items"])
+            report = {
+                "items": options["items"],
+                "iterations": options["iterations"],
+                "lists": {
+                    name: self.compare(model, serializer_class, options)
+                    for name, (model, serializer_class) in LISTS.items()
+                },
+            }
+            transaction.set_rollback(True)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def seed(self, items: int) -> None:
+        label = f"valuesbench-{uuid.uuid4().hex[:8]}"
+        themes = ShowTheme.objects.bulk_create(
+            ShowTheme(name=f"{label} {i}") for i in range(3)
+        )
+        dome = PlanetariumDome.objects.create(
+            name=label, rows=items, seats_in_row=10
+        )
+        shows = AstronomyShow.objects.bulk_create(
+            AstronomyShow(title=f"{label} {i}", description=label)
+            for i in range(items)
+        )
+        through = AstronomyShow.show_theme.through
+        through.objects.bulk_create(
+            through(astronomyshow_id=show.id, showtheme_id=theme.id)
+            for show in shows
+            for theme in themes[:2]
+        )
+        now = timezone.now()
+        sessions = ShowSession.objects.bulk_create(
+            ShowSession(
+                astronomy_show=show,
+                planetarium_dome=dome,
+                show_time=now + timedelta(hours=i + 1),
+            )
+            for i, show in enumerate(shows)
+        )
+        reservation = Reservation.objects.create(
+            user=get_user_model().objects.create(email=f"{label}@test.com")
+        )
+        Ticket.objects.bulk_create(
+            Ticket(
+                row=i + 1,
+                seat=1,
+                show_session=show_session,
+                reservation=reservation,
+            )
+            for i, show_session in enumerate(sessions)
+        )
+
+    def compare(self, model, serializer_class, options: dict) -> dict:
+        items = options["items"]
+        queryset = select_relations(
+            model.objects.all(),
+            serializer_relations(serializer_class(), model),
+        )[:items]
+        values = ValuesSerializer(serializer_class)
+        values_queryset = values.values(model.objects.all())[:items]
+
+        def serialize():
+            return serializer_class(list(queryset.all()), many=True).data
+
+        def serialize_values():
+            return values.to_representation(list(values_queryset.all()))
+
+        serializer_us = self.per_item(serialize, items, options)
+        values_us = self.per_item(serialize_values, items, options)
+        return {
+            "serializer_us_per_item": self.summary(serializer_us),
+            "values_us_per_item": self.summary(values_us),
+            "speedup": round(
+                statistics.median(serializer_us)
+                / statistics.median(values_us),
+                2,
+            ),
+        }
+
+    @staticmethod
+    def per_item(serialize, items: int, options: dict) -> list[float]:
+        latencies = []
+        for _ in range(options["iterations"]):
+            started = time.perf_counter()
+            serialize()
+            latencies.append(
+                (time.perf_counter() - started) * 1_000_000 / items
+            )
+        return latencies
+
+    @staticmethod
+    def summary(latencies: list[float]) -> dict:
+        return {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "mean": round(statistics.fmean(latencies), 2),
+        }
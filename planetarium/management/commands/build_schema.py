@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from planetarium.schema import code_version, write_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema served at api/schema/ for the current "
+        "code version"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=settings.PLANETARIUM_SCHEMA_FILE,
+            help="Defaults to PLANETARIUM_SCHEMA_FILE",
+        )
+
+    def handle(self, *args, **options):
+        write_schema(options["file"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Schema for code version {code_version()} written to "
+                f"{options['file']}."
+            )
+        )
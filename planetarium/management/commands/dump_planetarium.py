@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from planetarium.fixtures import MODELS, dump
+
+
+class Command(BaseCommand):
+    help = (
+        "Export planetarium data as a JSON fixture, streaming rows in "
+        "batches instead of building the whole dump in memory"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-o",
+            "--output",
+            help="File to write the fixture to, stdout by default",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                dumped = dump(output, batch_size=options["batch_size"])
+            report = self.stdout
+        else:
+            self.stdout.ending = ""
+            dumped = dump(self.stdout, batch_size=options["batch_size"])
+            # Keep stdout a valid fixture.
+            report = self.stderr
+        duration = time.perf_counter() - started
+
+        for label in MODELS:
+            if dumped[label]:
+                report.write(f"{label}: {dumped[label]} rows")
+        total = sum(dumped.values())
+        rate = total / duration if duration else 0
+        report.write(
+            self.style.SUCCESS(
+                f"Dumped {total} rows in {duration:.2f}s ({rate:.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,61 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import IntegrityError
+
+from planetarium import cache
+from planetarium.fixtures import MODELS, FixtureLoader, iter_json_array
+from planetarium.models import AstronomyShow, PlanetariumDome, ShowTheme
+
+
+class Command(BaseCommand):
+    help = (
+        "Load planetarium data from a JSON fixture without reading it "
+        "into memory: objects are parsed one at a time and inserted in "
+        "batches per model"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "fixture", help="Path of the JSON fixture, '-' for stdin"
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        loader = FixtureLoader(batch_size=options["batch_size"])
+        started = time.perf_counter()
+        try:
+            if options["fixture"] == "-":
+                loader.load(iter_json_array(sys.stdin))
+            else:
+                with open(options["fixture"], encoding="utf-8") as fixture:
+                    loader.load(iter_json_array(fixture))
+        except (
+            OSError,
+            ValueError,
+            IntegrityError,
+            DeserializationError,
+        ) as exc:
+            raise CommandError(f"Could not load fixture: {exc}")
+        duration = time.perf_counter() - started
+
+        for model in (ShowTheme, AstronomyShow, PlanetariumDome):
+            cache.bump_version(model)
+
+        for label in MODELS:
+            if loader.loaded[label]:
+                self.stdout.write(f"{label}: {loader.loaded[label]} rows")
+        for label, count in sorted(loader.skipped.items()):
+            self.stdout.write(
+                self.style.WARNING(f"{label}: {count} objects skipped")
+            )
+        total = sum(loader.loaded.values())
+        rate = total / duration if duration else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {total} rows in {duration:.2f}s "
+                f"({rate:.0f} rows/s)."
+            )
+        )
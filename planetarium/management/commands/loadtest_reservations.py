@@ -0,0 +1,203 @@
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.benchmarks import patched_setting, percentile
+from planetarium.holds import SEAT_TAKEN_MESSAGE
+from planetarium.models import AstronomyShow, PlanetariumDome, ShowSession
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure reservation throughput: simulated users compete for "
+        "overlapping seats through POST reservations/ in a thread pool "
+        "and the results are printed as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--sessions", type=int, default=2)
+        parser.add_argument("--rows", type=int, default=20)
+        parser.add_argument("--seats-in-row", type=int, default=25)
+        parser.add_argument(
+            "--tickets",
+            type=int,
+            default=2,
+            help="Adjacent seats booked by each reservation",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the seeded data instead of deleting it afterwards",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.options = options
+        self.local = threading.local()
+        self.url = reverse("planetarium:reservation-list")
+        self.seed()
+        # Expected seat conflicts would otherwise log a warning each.
+        request_logger = logging.getLogger("django.request")
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        try:
+            # The load comes from one address, through a few users.
+            with patched_setting(
+                "PLANETARIUM_THROTTLE_RATES", {}
+            ), patched_setting(
+                "ALLOWED_HOSTS", [*settings.ALLOWED_HOSTS, "localhost"]
+            ):
+                report = self.run()
+        finally:
+            request_logger.setLevel(level)
+            if not options["keep"]:
+                self.cleanup()
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def seed(self) -> None:
+        label = f"loadtest-{uuid.uuid4().hex[:8]}"
+        self.show = AstronomyShow.objects.create(
+            title=label, description="Reservation load test"
+        )
+        self.dome = PlanetariumDome.objects.create(
+            name=label,
+            rows=self.options["rows"],
+            seats_in_row=self.options["seats_in_row"],
+        )
+        self.sessions = [
+            ShowSession.objects.create(
+                astronomy_show=self.show,
+                planetarium_dome=self.dome,
+                show_time=timezone.now() + timedelta(days=1, hours=hour),
+            )
+            for hour in range(self.options["sessions"])
+        ]
+        # Staff users: reservations can only be created by staff.
+        user_model = get_user_model()
+        self.users = user_model.objects.bulk_create(
+            user_model(email=f"{label}-{i}@loadtest.local", is_staff=True)
+            for i in range(self.options["users"])
+        )
+
+    def cleanup(self) -> None:
+        get_user_model().objects.filter(
+            id__in=[user.id for user in self.users]
+        ).delete()
+        self.show.delete()
+        self.dome.delete()
+
+    def get_client(self) -> APIClient:
+        if not hasattr(self.local, "client"):
+            self.local.client = APIClient(
+                SERVER_NAME="localhost", raise_request_exception=False
+            )
+        return self.local.client
+
+    def make_tickets(self) -> list[dict]:
+        count = min(self.options["tickets"], self.dome.seats_in_row)
+        show_session = self.random.choice(self.sessions)
+        row = self.random.randint(1, self.dome.rows)
+        first = self.random.randint(1, self.dome.seats_in_row - count + 1)
+        return [
+            {"row": row, "seat": seat, "show_session": show_session.id}
+            for seat in range(first, first + count)
+        ]
+
+    def reserve(self, user, tickets: list[dict]) -> dict:
+        client = self.get_client()
+        client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.post(
+                self.url, {"tickets": tickets}, format="json"
+            )
+            elapsed = time.perf_counter() - started
+
+        if response.status_code == status.HTTP_201_CREATED:
+            outcome = "success"
+        elif (
+            response.status_code == status.HTTP_400_BAD_REQUEST
+            and SEAT_TAKEN_MESSAGE in response.content.decode()
+        ):
+            outcome = "conflict"
+        else:
+            outcome = "error"
+        return {
+            "outcome": outcome,
+            "latency": elapsed,
+            "queries": len(queries),
+        }
+
+    def run_worker(self, jobs: list) -> list[dict]:
+        try:
+            return [self.reserve(*job) for job in jobs]
+        finally:
+            # Each thread opened its own connections.
+            connections.close_all()
+
+    def run(self) -> dict:
+        jobs = [
+            (self.random.choice(self.users), self.make_tickets())
+            for _ in range(self.options["requests"])
+        ]
+        workers = self.options["workers"]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(workers) as pool:
+            results = [
+                result
+                for worker_results in pool.map(
+                    self.run_worker,
+                    [jobs[worker::workers] for worker in range(workers)],
+                )
+                for result in worker_results
+            ]
+        duration = time.perf_counter() - started
+
+        latencies = [result["latency"] * 1000 for result in results]
+        queries = [result["queries"] for result in results]
+        outcomes = [result["outcome"] for result in results]
+        total = len(results)
+        return {
+            "requests": total,
+            "workers": self.options["workers"],
+            "duration_s": round(duration, 3),
+            "throughput_rps": round(total / duration, 2) if duration else 0,
+            "successes": outcomes.count("success"),
+            "conflicts": outcomes.count("conflict"),
+            "errors": outcomes.count("error"),
+            "conflict_rate": (
+                round(outcomes.count("conflict") / total, 4) if total else 0
+            ),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "mean": round(statistics.fmean(latencies), 2)
+                if latencies
+                else 0,
+            },
+            "queries_per_request": {
+                "mean": round(statistics.fmean(queries), 2) if queries else 0,
+                "max": max(queries, default=0),
+            },
+        }
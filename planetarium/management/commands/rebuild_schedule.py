@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from planetarium.schedule import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-day schedule rollup from show sessions"
+
+    def handle(self, *args, **options):
+        cells = rebuild_all()
+        self.stdout.write(
+            self.style.SUCCESS(f"{cells} schedule day(s) rebuilt.")
+        )
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from planetarium.models import ShowSession
+from planetarium.occupancy import rebuild_occupancy
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute tickets_sold and seat maps of show sessions "
+        "whose counters drifted from their tickets"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted sessions",
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            ShowSession.objects.select_related("planetarium_dome")
+            .annotate(
+                ticket_count=Count("tickets"),
+                # Legacy tickets outside the dome can't be in the seat map.
+                seated_count=Count(
+                    "tickets",
+                    filter=Q(
+                        tickets__row__gte=1,
+                        tickets__row__lte=F("planetarium_dome__rows"),
+                        tickets__seat__gte=1,
+                        tickets__seat__lte=F("planetarium_dome__seats_in_row"),
+                    ),
+                ),
+            )
+            .order_by("id")
+        )
+        fixed = 0
+        for show_session in drifted.iterator():
+            seat_map = show_session.get_seat_map()
+            if (
+                show_session.tickets_sold == show_session.ticket_count
+                and seat_map.taken_count() == show_session.seated_count
+            ):
+                continue
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Session {show_session.id}: "
+                    f"tickets_sold={show_session.tickets_sold}, "
+                    f"seat map={seat_map.taken_count()}, "
+                    f"tickets={show_session.ticket_count}"
+                )
+            )
+            fixed += 1
+            if not options["dry_run"]:
+                with transaction.atomic():
+                    rebuild_occupancy(
+                        ShowSession.objects.select_for_update(of=("self",))
+                        .select_related("planetarium_dome")
+                        .get(id=show_session.id)
+                    )
+        self.stdout.write(
+            self.style.SUCCESS(f"{fixed} drifted session(s) found.")
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from planetarium.holds import sweep_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Delete expired seat holds in bulk"
+
+    def handle(self, *args, **options):
+        swept = sweep_expired_holds()
+        self.stdout.write(
+            self.style.SUCCESS(f"{swept} expired seat hold(s) removed.")
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+def build_seat_maps(apps, schema_editor):
+    # The row-major bitset of planetarium.occupancy.SeatMap as of this
+    # migration: bit (row - 1) * seats_in_row + (seat - 1), most
+    # significant bit first.
+    ShowSession = apps.get_model("planetarium", "ShowSession")
+    Ticket = apps.get_model("planetarium", "Ticket")
+    for show_session in ShowSession.objects.select_related(
+        "planetarium_dome"
+    ).iterator():
+        dome = show_session.planetarium_dome
+        rows, seats_in_row = (dome.rows, dome.seats_in_row) if dome else (0, 0)
+        bits = bytearray((rows * seats_in_row + 7) // 8)
+        for row, seat in Ticket.objects.filter(
+            show_session_id=show_session.id
+        ).values_list("row", "seat"):
+            if 0 < row <= rows and 0 < seat <= seats_in_row:
+                index = (row - 1) * seats_in_row + (seat - 1)
+                bits[index // 8] |= 1 << (7 - index % 8)
+        ShowSession.objects.filter(id=show_session.id).update(
+            seat_map=bytes(bits)
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("planetarium", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="showsession",
+            name="seat_map",
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.RunPython(build_seat_maps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2 on 2026-10-18 03:51
+
+from collections import defaultdict
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+from rest_framework import serializers
+
+
+def tickets_left(show_session):
+    dome = show_session.planetarium_dome
+    return dome.rows * dome.seats_in_row - show_session.tickets_sold
+
+
+def build_schedule(apps, schema_editor):
+    ShowSession = apps.get_model("planetarium", "ShowSession")
+    ScheduleDay = apps.get_model("planetarium", "ScheduleDay")
+    show_time_field = serializers.DateTimeField()
+    cells = defaultdict(list)
+    sessions = (
+        ShowSession.objects.filter(planetarium_dome__isnull=False)
+        .select_related("astronomy_show", "planetarium_dome")
+        .order_by("show_time", "id")
+    )
+    for show_session in sessions.iterator():
+        day = timezone.localtime(show_session.show_time).date()
+        cells[day, show_session.planetarium_dome_id].append(show_session)
+    ScheduleDay.objects.bulk_create(
+        ScheduleDay(
+            day=day,
+            planetarium_dome_id=planetarium_dome_id,
+            sessions=[
+                {
+                    "id": show_session.id,
+                    "astronomy_show": show_session.astronomy_show.title,
+                    "show_time": show_time_field.to_representation(
+                        show_session.show_time
+                    ),
+                    "tickets_left": tickets_left(show_session),
+                }
+                for show_session in show_sessions
+            ],
+            seats_left=sum(map(tickets_left, show_sessions)),
+        )
+        for (day, planetarium_dome_id), show_sessions in cells.items()
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("planetarium", "0006_seat_holds"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduleDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("sessions", models.JSONField(default=list)),
+                ("seats_left", models.PositiveIntegerField(default=0)),
+                (
+                    "planetarium_dome",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="schedule",
+                        to="planetarium.planetariumdome",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["day", "planetarium_dome_id"],
+                "unique_together": {("day", "planetarium_dome")},
+            },
+        ),
+        migrations.RunPython(build_schedule, migrations.RunPython.noop),
+    ]
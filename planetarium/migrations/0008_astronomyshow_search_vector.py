@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-18 04:06
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+INDEX_NAME = "astronomyshow_search_idx"
+
+
+def add_search_index(apps, schema_editor):
+    # GIN and tsvector only exist on PostgreSQL; other databases keep the
+    # column empty and search without it.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "UPDATE planetarium_astronomyshow AS show SET search_vector = "
+        "setweight(to_tsvector(%s::regconfig, show.title), 'A') "
+        "|| setweight(to_tsvector(%s::regconfig, coalesce(("
+        "SELECT string_agg(theme.name, ' ') "
+        "FROM planetarium_astronomyshow_show_theme AS link "
+        "JOIN planetarium_showtheme AS theme "
+        "ON theme.id = link.showtheme_id "
+        "WHERE link.astronomyshow_id = show.id), '')), 'B') "
+        "|| setweight(to_tsvector(%s::regconfig, show.description), 'C')",
+        [settings.PLANETARIUM_SEARCH_CONFIG] * 3,
+    )
+    schema_editor.execute(
+        f"CREATE INDEX {INDEX_NAME} ON planetarium_astronomyshow "
+        "USING gin (search_vector)"
+    )
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("planetarium", "0007_schedule_day"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="astronomyshow",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
@@ -0,0 +1,190 @@
+# Generated by Django 4.2 on 2026-10-18 04:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Reads of reservation history see hot and archived rows alike.
+HISTORY_VIEWS = {
+    "planetarium_showsession_history": (
+        ("planetarium_showsession", "planetarium_archivedshowsession"),
+        (
+            "id",
+            "astronomy_show_id",
+            "planetarium_dome_id",
+            "show_time",
+            "tickets_sold",
+        ),
+    ),
+    "planetarium_reservation_history": (
+        ("planetarium_reservation", "planetarium_archivedreservation"),
+        ("id", "created_at", "user_id"),
+    ),
+    "planetarium_ticket_history": (
+        ("planetarium_ticket", "planetarium_archivedticket"),
+        ("id", "row", "seat", "show_session_id", "reservation_id"),
+    ),
+}
+
+
+def create_history_views(apps, schema_editor):
+    quote_name = schema_editor.quote_name
+    for view, (tables, columns) in HISTORY_VIEWS.items():
+        select = ", ".join(map(quote_name, columns))
+        schema_editor.execute(
+            f"CREATE VIEW {quote_name(view)} AS "
+            + " UNION ALL ".join(
+                f"SELECT {select} FROM {quote_name(table)}" for table in tables
+            )
+        )
+
+
+def drop_history_views(apps, schema_editor):
+    for view in HISTORY_VIEWS:
+        schema_editor.execute(
+            f"DROP VIEW IF EXISTS {schema_editor.quote_name(view)}"
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("planetarium", "0009_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReservationHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("created_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "planetarium_reservation_history",
+                "ordering": ["-created_at", "-id"],
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="ShowSessionHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("show_time", models.DateTimeField()),
+                ("tickets_sold", models.PositiveIntegerField()),
+            ],
+            options={
+                "db_table": "planetarium_showsession_history",
+                "ordering": ["-show_time"],
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="TicketHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("row", models.IntegerField()),
+                ("seat", models.IntegerField()),
+            ],
+            options={
+                "db_table": "planetarium_ticket_history",
+                "ordering": ["-reservation__created_at", "-id"],
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedShowSession",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("show_time", models.DateTimeField()),
+                ("tickets_sold", models.PositiveIntegerField(default=0)),
+                (
+                    "astronomy_show",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="planetarium.astronomyshow",
+                    ),
+                ),
+                (
+                    "planetarium_dome",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="planetarium.planetariumdome",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-show_time"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedTicket",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("row", models.IntegerField()),
+                ("seat", models.IntegerField()),
+                ("reservation_id", models.BigIntegerField(null=True)),
+                (
+                    "show_session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="planetarium.archivedshowsession",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedReservation",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("created_at", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="archivedticket",
+            index=models.Index(
+                fields=["reservation_id", "-id"],
+                name="archivedticket_reservation_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedreservation",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="archivedreservation_user_idx",
+            ),
+        ),
+        migrations.RunPython(create_history_views, drop_history_views),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-18 04:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("planetarium", "0010_archive"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="tickethistory",
+            options={"managed": False, "ordering": ["-reservation_id", "-id"]},
+        ),
+        migrations.RemoveIndex(
+            model_name="archivedticket",
+            name="archivedticket_reservation_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="ticket",
+            name="ticket_reservation_id_idx",
+        ),
+        migrations.AddIndex(
+            model_name="archivedticket",
+            index=models.Index(
+                fields=["-reservation_id", "-id"],
+                name="archivedticket_reservation_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["-reservation", "-id"],
+                name="ticket_reservation_desc_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2 on 2026-10-18 05:10
+
+from django.db import migrations
+
+FTS_TABLE = "planetarium_astronomyshow_fts"
+
+
+def add_fts_index(apps, schema_editor):
+    # The search fallback of SQLite; PostgreSQL has its GIN index (0008)
+    # and other databases search without an index.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} "
+        "USING fts5(title, themes, description)"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, title, themes, description) "
+        "SELECT show.id, show.title, coalesce(("
+        "SELECT group_concat(theme.name, ' ') "
+        "FROM planetarium_astronomyshow_show_theme AS link "
+        "JOIN planetarium_showtheme AS theme "
+        "ON theme.id = link.showtheme_id "
+        "WHERE link.astronomyshow_id = show.id), ''), show.description "
+        "FROM planetarium_astronomyshow AS show"
+    )
+
+
+def remove_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("planetarium", "0011_ticket_reservation_order"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fts_index, remove_fts_index),
+    ]
@@ -1,11 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
+from planetarium.occupancy import SeatMap
+
 
 class ShowTheme(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["name"]
@@ -21,6 +25,8 @@ class AstronomyShow(models.Model):
         "ShowTheme",
         related_name="astronomy_shows",
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["title"]
@@ -33,6 +39,7 @@ class PlanetariumDome(models.Model):
     name = models.CharField(max_length=100, unique=True)
     rows = models.PositiveIntegerField()
     seats_in_row = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["name"]
@@ -56,13 +63,38 @@ class ShowSession(models.Model):
         related_name="show_sessions",
     )
     show_time = models.DateTimeField()
+    seat_map = models.BinaryField(default=bytes, editable=False)
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-show_time"]
+        indexes = [
+            models.Index(
+                fields=["-show_time", "-id"], name="showsession_time_id_idx"
+            ),
+            models.Index(
+                fields=["astronomy_show", "show_time"],
+                name="showsession_show_time_idx",
+            ),
+            models.Index(
+                fields=["planetarium_dome", "show_time"],
+                name="showsession_dome_time_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.astronomy_show.title
 
+    @property
+    def tickets_left(self) -> int | None:
+        if self.planetarium_dome is None:
+            return None
+        return self.planetarium_dome.capacity - self.tickets_sold
+
+    def get_seat_map(self) -> SeatMap:
+        return SeatMap.from_session(self)
+
     def clean(self):
         if self.show_time <= timezone.now():
             raise ValidationError("Show session must be in future.")
@@ -74,6 +106,12 @@ class Reservation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="reservation_user_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return (f"Reservation №{self.id}, "
@@ -96,6 +134,12 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("row", "seat", "show_session")
         ordering = ["-reservation__created_at"]
+        indexes = [
+            models.Index(
+                fields=["-reservation", "-id"],
+                name="ticket_reservation_desc_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -118,3 +162,199 @@ class Ticket(models.Model):
             row=self.row,
             num_rows=self.show_session.planetarium_dome.rows,
         )
+
+
+class SeatHold(models.Model):
+    show_session = models.ForeignKey(
+        ShowSession, on_delete=models.CASCADE, related_name="seat_holds"
+    )
+    user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ["expires_at"]
+
+    def __str__(self):
+        return f"Hold №{self.id}, expires at: {self.expires_at}"
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expires_at <= timezone.now()
+
+
+class HeldSeat(models.Model):
+    hold = models.ForeignKey(
+        SeatHold, on_delete=models.CASCADE, related_name="seats"
+    )
+    show_session = models.ForeignKey(
+        ShowSession, on_delete=models.CASCADE, related_name="held_seats"
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+
+    class Meta:
+        unique_together = ("row", "seat", "show_session")
+        ordering = ["row", "seat"]
+
+    def __str__(self):
+        return f"{self.hold} (row: {self.row}, seat: {self.seat})"
+
+
+class ScheduleDay(models.Model):
+    """Show sessions of one dome on one local day, see ``schedule.py``"""
+
+    day = models.DateField()
+    planetarium_dome = models.ForeignKey(
+        PlanetariumDome, on_delete=models.CASCADE, related_name="schedule"
+    )
+    sessions = models.JSONField(default=list)
+    seats_left = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["day", "planetarium_dome_id"]
+        unique_together = ("day", "planetarium_dome")
+
+    def __str__(self):
+        return f"{self.planetarium_dome_id} on {self.day}"
+
+
+class ArchivedShowSession(models.Model):
+    """A past show session moved out of ``ShowSession``, see ``archive.py``"""
+
+    id = models.BigIntegerField(primary_key=True)
+    astronomy_show = models.ForeignKey(
+        AstronomyShow, on_delete=models.CASCADE, related_name="+"
+    )
+    planetarium_dome = models.ForeignKey(
+        PlanetariumDome,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    show_time = models.DateTimeField()
+    tickets_sold = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-show_time"]
+
+    def __str__(self) -> str:
+        return f"Archived session №{self.id}"
+
+
+class ArchivedReservation(models.Model):
+    """A reservation whose sessions have all been archived"""
+
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    user = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="+"
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="archivedreservation_user_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Archived reservation №{self.id}"
+
+
+class ArchivedTicket(models.Model):
+    """A ticket of an archived session.
+
+    ``reservation_id`` points to ``Reservation`` or, once all of its
+    sessions are archived, to ``ArchivedReservation``.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    show_session = models.ForeignKey(
+        ArchivedShowSession, on_delete=models.CASCADE, related_name="+"
+    )
+    reservation_id = models.BigIntegerField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-reservation_id", "-id"],
+                name="archivedticket_reservation_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Archived ticket №{self.id}"
+
+
+class ShowSessionHistory(models.Model):
+    """Hot and archived show sessions, a database view (migration 0010)"""
+
+    id = models.BigIntegerField(primary_key=True)
+    astronomy_show = models.ForeignKey(
+        AstronomyShow, on_delete=models.DO_NOTHING, related_name="+"
+    )
+    planetarium_dome = models.ForeignKey(
+        PlanetariumDome,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        related_name="+",
+    )
+    show_time = models.DateTimeField()
+    tickets_sold = models.PositiveIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "planetarium_showsession_history"
+        ordering = ["-show_time"]
+
+    __str__ = ShowSession.__str__
+    tickets_left = ShowSession.tickets_left
+
+
+class ReservationHistory(models.Model):
+    """Hot and archived reservations, a database view (migration 0010)"""
+
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    user = models.ForeignKey(
+        get_user_model(), on_delete=models.DO_NOTHING, related_name="+"
+    )
+
+    class Meta:
+        managed = False
+        db_table = "planetarium_reservation_history"
+        ordering = ["-created_at", "-id"]
+
+    __str__ = Reservation.__str__
+
+
+class TicketHistory(models.Model):
+    """Hot and archived tickets, a database view (migration 0010)"""
+
+    id = models.BigIntegerField(primary_key=True)
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    show_session = models.ForeignKey(
+        ShowSessionHistory, on_delete=models.DO_NOTHING, related_name="tickets"
+    )
+    reservation = models.ForeignKey(
+        ReservationHistory,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        related_name="tickets",
+    )
+
+    class Meta:
+        managed = False
+        db_table = "planetarium_ticket_history"
+        # Reservation ids grow with created_at; unlike the joined column
+        # they are covered by the ticket indexes (keyset pagination).
+        ordering = ["-reservation_id", "-id"]
+
+    __str__ = Ticket.__str__
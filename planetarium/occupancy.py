@@ -0,0 +1,198 @@
+import base64
+from collections import defaultdict
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.dispatch import Signal
+from django.utils import timezone
+
+# Sent after seats of a session were taken or released, inside the
+# transaction that changed them, with ``show_session_id``, ``seats``
+# (a list of ``(row, seat)``) and ``taken``.
+seats_changed = Signal()
+
+
+class SeatMap:
+    """Row-major bitset of taken seats for one show session.
+
+    Bit ``(row - 1) * seats_in_row + (seat - 1)`` is set when the seat is
+    taken; the most significant bit of the first byte is seat 1 of row 1.
+    """
+
+    def __init__(self, rows: int, seats_in_row: int, bits: bytes = b""):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        size = self.byte_length(rows, seats_in_row)
+        if len(bits) != size:
+            bits = bytes(size)
+        self.bits = bytearray(bits)
+
+    @staticmethod
+    def byte_length(rows: int, seats_in_row: int) -> int:
+        return (rows * seats_in_row + 7) // 8
+
+    def _position(self, row: int, seat: int) -> tuple[int, int]:
+        index = (row - 1) * self.seats_in_row + (seat - 1)
+        return index // 8, 7 - index % 8
+
+    def is_taken(self, row: int, seat: int) -> bool:
+        byte, bit = self._position(row, seat)
+        return bool(self.bits[byte] >> bit & 1)
+
+    def occupy(self, row: int, seat: int) -> None:
+        byte, bit = self._position(row, seat)
+        self.bits[byte] |= 1 << bit
+
+    def release(self, row: int, seat: int) -> None:
+        byte, bit = self._position(row, seat)
+        self.bits[byte] &= ~(1 << bit) & 0xFF
+
+    def taken_count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.bits)
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.bits).decode("ascii")
+
+    @classmethod
+    def from_session(cls, show_session) -> "SeatMap":
+        dome = show_session.planetarium_dome
+        if dome is None:
+            return cls(0, 0)
+        return cls(dome.rows, dome.seats_in_row, bytes(show_session.seat_map))
+
+    @classmethod
+    def build(cls, show_session) -> "SeatMap":
+        """Rebuild the map of a session from its tickets."""
+        seat_map = cls.from_session(show_session)
+        seat_map.bits = bytearray(len(seat_map.bits))
+        for row, seat in show_session.tickets.values_list("row", "seat"):
+            if seat_map.contains(row, seat):
+                seat_map.occupy(row, seat)
+        return seat_map
+
+    def contains(self, row: int, seat: int) -> bool:
+        return 0 < row <= self.rows and 0 < seat <= self.seats_in_row
+
+
+def _seats_by_session(tickets: Iterable) -> dict[int, list[tuple[int, int]]]:
+    seats = defaultdict(list)
+    for ticket in tickets:
+        seats[ticket.show_session_id].append((ticket.row, ticket.seat))
+    return seats
+
+
+def _apply(tickets: Iterable, taken: bool) -> None:
+    from planetarium.models import ShowSession
+
+    seats = _seats_by_session(tickets)
+    if not seats:
+        return
+    with transaction.atomic():
+        sessions = (
+            ShowSession.objects.select_for_update(of=("self",))
+            .select_related("planetarium_dome")
+            .filter(id__in=seats)
+            .order_by("id")
+        )
+        for show_session in sessions:
+            seat_map = SeatMap.from_session(show_session)
+            for row, seat in seats[show_session.id]:
+                if not seat_map.contains(row, seat):
+                    continue
+                if taken:
+                    seat_map.occupy(row, seat)
+                else:
+                    seat_map.release(row, seat)
+            sold = len(seats[show_session.id])
+            ShowSession.objects.filter(id=show_session.id).update(
+                seat_map=seat_map.to_bytes(),
+                # A drifted counter must not go below zero either.
+                tickets_sold=F("tickets_sold") + sold
+                if taken
+                else Greatest(F("tickets_sold") - sold, 0),
+                updated_at=timezone.now(),
+            )
+            seats_changed.send(
+                sender=ShowSession,
+                show_session_id=show_session.id,
+                seats=seats[show_session.id],
+                taken=taken,
+            )
+
+
+def occupy_seats(tickets: Iterable) -> None:
+    """Mark the seats of freshly created tickets as taken."""
+    _apply(tickets, taken=True)
+
+
+def release_seats(tickets: Iterable) -> None:
+    """Mark the seats of deleted tickets as free again."""
+    _apply(tickets, taken=False)
+
+
+def rebuild_occupancy(show_session) -> SeatMap:
+    """Recompute the seat map and sold counter of a session from tickets"""
+    seat_map = SeatMap.build(show_session)
+    show_session.seat_map = seat_map.to_bytes()
+    show_session.tickets_sold = show_session.tickets.count()
+    type(show_session).objects.filter(id=show_session.id).update(
+        seat_map=show_session.seat_map,
+        tickets_sold=show_session.tickets_sold,
+        updated_at=timezone.now(),
+    )
+    return seat_map
+
+
+def rebuild_many(
+    show_session_ids: Iterable[int], batch_size: int = 1000
+) -> int:
+    """Recompute occupancy of many sessions with a bounded memory footprint.
+
+    Sessions are processed ``batch_size`` at a time: one query for the
+    sessions, one streamed query for their tickets and one bulk update.
+    Returns the number of rebuilt sessions.
+    """
+    from planetarium.models import ShowSession, Ticket
+
+    ids = sorted(set(show_session_ids))
+    rebuilt = 0
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start: start + batch_size]
+        sessions = {
+            show_session.id: show_session
+            for show_session in ShowSession.objects.select_related(
+                "planetarium_dome"
+            ).only(
+                "planetarium_dome__rows", "planetarium_dome__seats_in_row"
+            ).filter(id__in=batch)
+        }
+        seat_maps = {}
+        for show_session in sessions.values():
+            dome = show_session.planetarium_dome
+            seat_maps[show_session.id] = (
+                SeatMap(dome.rows, dome.seats_in_row)
+                if dome
+                else SeatMap(0, 0)
+            )
+            show_session.tickets_sold = 0
+        tickets = Ticket.objects.filter(show_session_id__in=batch).values_list(
+            "show_session_id", "row", "seat"
+        )
+        for show_session_id, row, seat in tickets.iterator(chunk_size=5000):
+            sessions[show_session_id].tickets_sold += 1
+            if seat_maps[show_session_id].contains(row, seat):
+                seat_maps[show_session_id].occupy(row, seat)
+        now = timezone.now()
+        for show_session in sessions.values():
+            show_session.seat_map = seat_maps[show_session.id].to_bytes()
+            show_session.updated_at = now
+        ShowSession.objects.bulk_update(
+            sessions.values(), ["seat_map", "tickets_sold", "updated_at"]
+        )
+        rebuilt += len(sessions)
+    return rebuilt
@@ -1,7 +1,155 @@
+import base64
+import json
+from collections import OrderedDict
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class OrderPagination(PageNumberPagination):
+    """Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Passing ``?cursor=`` (empty for the first page) switches to keyset
+    pagination: pages are selected with a ``WHERE (field, id) < (...)``
+    condition on the queryset ordering with ``id`` as a tiebreaker, so
+    neither ``COUNT(*)`` nor ``OFFSET`` is issued.
+    """
+
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = True
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        self.position, self.reverse = self.decode_cursor(request, queryset)
+
+        field, descending = self.ordering
+        if self.reverse:
+            descending = not descending
+        order = "-" if descending else ""
+        queryset = queryset.order_by(f"{order}{field}", f"{order}id")
+        if self.position is not None:
+            value, pk = self.position
+            lookup = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{field}__{lookup}": value})
+                | Q(**{field: value, f"id__{lookup}": pk})
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.reverse:
+            results.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+        self.page_results = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page_results:
+            return None
+        return self.encode_cursor(self.page_results[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_results:
+            return None
+        return self.encode_cursor(self.page_results[0], reverse=True)
+
+    @staticmethod
+    def get_ordering(queryset) -> tuple[str, bool]:
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        field = ordering[0] if ordering else "-id"
+        return field.lstrip("-"), field.startswith("-")
+
+    @staticmethod
+    def get_ordering_field(queryset, field: str):
+        """The model field (or annotation output field) ordered by"""
+        if field in queryset.query.annotations:
+            return queryset.query.annotations[field].output_field
+        model = queryset.model
+        *path, name = field.split("__")
+        for attr in path:
+            model = model._meta.get_field(attr).related_model
+        return model._meta.get_field(name)
+
+    def decode_cursor(self, request, queryset) -> tuple:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        field = self.get_ordering_field(queryset, self.ordering[0])
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            value, pk = cursor["p"]
+            value = field.to_python(value)
+            if value is None:
+                raise ValueError("Cursor without a position")
+            return (value, int(pk)), bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        field, _ = self.ordering
+        if isinstance(instance, dict):
+            # a .values() row
+            value, pk = instance[field], instance["id"]
+        else:
+            value = reduce(getattr, field.split("__"), instance)
+            pk = instance.pk
+        cursor = json.dumps(
+            {"p": [value, pk], "r": int(reverse)},
+            default=str,
+        )
+        encoded = base64.urlsafe_b64encode(cursor.encode()).decode()
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Switch to keyset pagination; pass an "
+                "empty value for the first page, then follow the links.",
+                "schema": {"type": "string"},
+            }
+        )
+        return parameters
@@ -0,0 +1,136 @@
+"""Read replicas for safe API requests.
+
+Viewsets with ``ReplicaReadMixin`` run the queries of GET/HEAD/OPTIONS
+requests on one of ``PLANETARIUM_READ_REPLICAS`` (``ReplicaRouter``
+reads the alias chosen for the current request from a context
+variable). Everything else, including every write, uses ``default``.
+
+* Read-your-writes: a user's unsafe request pins the user's reads to
+  the primary for ``PLANETARIUM_REPLICA_PIN_SECONDS``. Pins are kept in
+  the cache, so all processes must share one (check
+  ``planetarium.E001``).
+* Failover: a replica that fails to connect or to answer a query is
+  skipped for ``PLANETARIUM_REPLICA_RETRY_SECONDS``; a safe request that
+  failed on it is retried once, on the next healthy replica or on the
+  primary.
+
+Replication lag beyond the pin window is not tracked: other users may
+read slightly stale data. The catalog cache is only filled from the
+primary, so a lagging replica never gets cached under a new version.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import (
+    DatabaseError,
+    InterfaceError,
+    OperationalError,
+    connections,
+)
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_KEY_PREFIX = "planetarium:replicas:pin"
+
+_read_alias = ContextVar("planetarium_read_alias", default=None)
+_unhealthy = {}
+
+
+def reading_from_replica() -> bool:
+    return _read_alias.get() is not None
+
+
+def mark_unhealthy(alias: str) -> None:
+    _unhealthy[alias] = (
+        time.monotonic() + settings.PLANETARIUM_REPLICA_RETRY_SECONDS
+    )
+
+
+def is_healthy(alias: str) -> bool:
+    if _unhealthy.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        mark_unhealthy(alias)
+        return False
+    _unhealthy.pop(alias, None)
+    return True
+
+
+def choose_replica() -> str | None:
+    """A healthy replica alias, ``None`` (the primary) if there is none"""
+    replicas = list(settings.PLANETARIUM_READ_REPLICAS)
+    random.shuffle(replicas)
+    for alias in replicas:
+        if is_healthy(alias):
+            return alias
+    return None
+
+
+def _pin_key(user_id) -> str:
+    return f"{PIN_KEY_PREFIX}:{user_id}"
+
+
+def pin_to_primary(user_id) -> None:
+    if user_id is not None:
+        cache.set(
+            _pin_key(user_id), True, settings.PLANETARIUM_REPLICA_PIN_SECONDS
+        )
+
+
+def is_pinned(user_id) -> bool:
+    return user_id is not None and bool(cache.get(_pin_key(user_id)))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.PLANETARIUM_READ_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """Serve safe requests from a read replica, see the module docstring"""
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_alias.set(None)
+        try:
+            try:
+                return super().dispatch(request, *args, **kwargs)
+            except (InterfaceError, OperationalError):
+                alias = _read_alias.get()
+                if alias is None:
+                    raise
+                mark_unhealthy(alias)
+                _read_alias.set(None)
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned(
+            getattr(request.user, "pk", None)
+        ):
+            _read_alias.set(choose_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(getattr(request.user, "pk", None))
+        return response
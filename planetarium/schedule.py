@@ -0,0 +1,149 @@
+"""Per-day rollup of show sessions behind the ``schedule`` endpoint.
+
+Each ``ScheduleDay`` row holds the serialized sessions of one dome on one
+day in the project's ``TIME_ZONE`` together with the seats left on that
+day, so a calendar range is a single indexed read. Rows are rebuilt one
+(day, dome) cell at a time whenever a session changes. Bookings only
+move seat counts, so they patch their session's entry in place after
+commit (``refresh_session_seats``) instead of rebuilding the day under
+the dome lock. Sessions without a dome cannot be booked and are left
+out.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
+
+from django.db import transaction
+from django.utils import timezone
+
+from planetarium.models import PlanetariumDome, ScheduleDay, ShowSession
+from planetarium.serializers import ScheduleSessionSerializer
+
+Cell = tuple[date, int]
+
+
+def local_day(moment: datetime) -> date:
+    return timezone.localtime(moment).date()
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end = timezone.make_aware(
+        datetime.combine(day + timedelta(days=1), time.min)
+    )
+    return start, end
+
+
+def rebuild_day(day: date, planetarium_dome_id: int) -> None:
+    """Recompute the rollup row of one dome on one day"""
+    with transaction.atomic():
+        # Serializes rebuilds of the dome's cells, so the last writer
+        # always saw the latest committed sessions.
+        dome = (
+            PlanetariumDome.objects.select_for_update()
+            .filter(id=planetarium_dome_id)
+            .first()
+        )
+        if dome is None:
+            return
+        # Queues behind seat refreshes of the cell, see below.
+        ScheduleDay.objects.select_for_update().filter(
+            day=day, planetarium_dome_id=dome.id
+        ).first()
+        start, end = day_bounds(day)
+        sessions = list(
+            ShowSession.objects.filter(
+                planetarium_dome_id=dome.id,
+                show_time__gte=start,
+                show_time__lt=end,
+            )
+            .select_related("astronomy_show", "planetarium_dome")
+            .order_by("show_time", "id")
+        )
+        if not sessions:
+            ScheduleDay.objects.filter(
+                day=day, planetarium_dome_id=dome.id
+            ).delete()
+            return
+        ScheduleDay.objects.update_or_create(
+            day=day,
+            planetarium_dome_id=dome.id,
+            defaults={
+                "sessions": ScheduleSessionSerializer(
+                    sessions, many=True
+                ).data,
+                "seats_left": sum(
+                    show_session.tickets_left for show_session in sessions
+                ),
+            },
+        )
+
+
+def refresh_session_seats(show_session_id: int) -> None:
+    """Update ``tickets_left`` of one session in its rollup row.
+
+    Only the cell row is locked, and the session's counters are read
+    after the lock is taken, so concurrent refreshes of one day never
+    overwrite each other with older counts.
+    """
+    cell = session_cells(ShowSession.objects.filter(id=show_session_id))
+    if not cell:
+        return
+    ((day, planetarium_dome_id),) = cell
+    with transaction.atomic():
+        schedule_day = (
+            ScheduleDay.objects.select_for_update()
+            .filter(day=day, planetarium_dome_id=planetarium_dome_id)
+            .first()
+        )
+        show_session = (
+            ShowSession.objects.select_related("planetarium_dome")
+            .only(
+                "tickets_sold",
+                "planetarium_dome__rows",
+                "planetarium_dome__seats_in_row",
+            )
+            .filter(id=show_session_id)
+            .first()
+        )
+        if schedule_day is None or show_session is None:
+            return
+        for entry in schedule_day.sessions:
+            if entry["id"] == show_session_id:
+                entry["tickets_left"] = show_session.tickets_left
+        schedule_day.seats_left = sum(
+            entry["tickets_left"] for entry in schedule_day.sessions
+        )
+        schedule_day.save(
+            update_fields=("sessions", "seats_left", "updated_at")
+        )
+
+
+def rebuild_cells(cells: Iterable[Cell]) -> None:
+    for day, planetarium_dome_id in sorted(set(cells)):
+        if planetarium_dome_id is not None:
+            rebuild_day(day, planetarium_dome_id)
+
+
+def session_cells(show_sessions) -> set[Cell]:
+    """Cells of the sessions in a ``ShowSession`` queryset"""
+    return {
+        (local_day(show_time), planetarium_dome_id)
+        for show_time, planetarium_dome_id in show_sessions.values_list(
+            "show_time", "planetarium_dome_id"
+        )
+        if planetarium_dome_id is not None
+    }
+
+
+def rebuild_all() -> int:
+    """Recompute the whole rollup, returns the number of cells"""
+    cells = set()
+    sessions = ShowSession.objects.filter(
+        planetarium_dome__isnull=False
+    ).values_list("show_time", "planetarium_dome_id")
+    for show_time, planetarium_dome_id in sessions.iterator(chunk_size=5000):
+        cells.add((local_day(show_time), planetarium_dome_id))
+    with transaction.atomic():
+        ScheduleDay.objects.all().delete()
+        rebuild_cells(cells)
+    return len(cells)
@@ -0,0 +1,142 @@
+"""Pre-generated OpenAPI schema.
+
+``CachedSpectacularAPIView`` generates the schema once per code version,
+language and API version and keeps it, rendered, in memory. At build
+time ``manage.py build_schema`` writes the default schema to
+``PLANETARIUM_SCHEMA_FILE``, which workers then load instead of
+generating it. The code version is ``PLANETARIUM_CODE_VERSION`` (e.g.
+the deployed commit) or else a hash of the project's Python sources and
+of the versions of the packages that shape the schema.
+
+Responses carry an ETag made of the code version, the language, the API
+version and the format, and answer ``If-None-Match`` with 304.
+"""
+import functools
+import hashlib
+import json
+from pathlib import Path
+
+import django
+import drf_spectacular
+import rest_framework
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from drf_spectacular.views import SpectacularAPIView
+
+_schemas = {}
+_rendered = {}
+
+
+@functools.cache
+def code_version() -> str:
+    if settings.PLANETARIUM_CODE_VERSION:
+        return settings.PLANETARIUM_CODE_VERSION
+
+    base_dir = Path(settings.BASE_DIR)
+    source_dirs = {base_dir / settings.ROOT_URLCONF.split(".")[0]} | {
+        Path(app_config.path)
+        for app_config in apps.get_app_configs()
+        if Path(app_config.path).is_relative_to(base_dir)
+    }
+    digest = hashlib.md5()
+    for version in (
+        django.__version__,
+        rest_framework.VERSION,
+        drf_spectacular.__version__,
+    ):
+        digest.update(version.encode())
+    for path in sorted(
+        path for source_dir in source_dirs for path in source_dir.rglob("*.py")
+    ):
+        digest.update(str(path.relative_to(base_dir)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def generate_schema(request=None, api_version=None) -> dict:
+    generator = SpectacularAPIView.generator_class(api_version=api_version)
+    return generator.get_schema(
+        request=request, public=SpectacularAPIView.serve_public
+    )
+
+
+def write_schema(path) -> None:
+    Path(path).write_text(
+        json.dumps({"version": code_version(), "schema": generate_schema()})
+    )
+
+
+def is_cacheable(language: str) -> bool:
+    # ?lang= takes any string, keep memory bounded
+    return language == settings.LANGUAGE_CODE or language in dict(
+        settings.LANGUAGES
+    )
+
+
+def read_schema(path) -> dict | None:
+    """The schema built for the current code version, if there is one"""
+    try:
+        built = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    if built.get("version") != code_version():
+        return None
+    return built["schema"]
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """``SpectacularAPIView`` serving the schema from memory, see above"""
+
+    def get_schema(self, request, api_version) -> dict:
+        key = (code_version(), translation.get_language(), api_version)
+        schema = _schemas.get(key)
+        if schema is None:
+            if key[1:] == (settings.LANGUAGE_CODE, None):
+                schema = read_schema(settings.PLANETARIUM_SCHEMA_FILE)
+            if schema is None:
+                schema = generate_schema(request, api_version)
+            if is_cacheable(key[1]):
+                _schemas[key] = schema
+        return schema
+
+    # Called by SpectacularAPIView.get() within the requested language.
+    def _get_schema_response(self, request):
+        api_version = (
+            self.api_version
+            or request.version
+            or self._get_version_parameter(request)
+        )
+        renderer = request.accepted_renderer
+        key = (
+            code_version(),
+            translation.get_language(),
+            api_version,
+            renderer.media_type,
+        )
+        etag = quote_etag(hashlib.md5(repr(key).encode()).hexdigest())
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            content = _rendered.get(key)
+            if content is None:
+                content = renderer.render(
+                    self.get_schema(request, api_version),
+                    renderer.media_type,
+                    self.get_renderer_context(),
+                )
+                if is_cacheable(key[1]):
+                    _rendered[key] = content
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            response = HttpResponse(content, content_type=content_type)
+            response["Content-Disposition"] = (
+                "inline; "
+                f'filename="{self._get_filename(request, api_version)}"'
+            )
+        response["ETag"] = etag
+        return response
@@ -0,0 +1,175 @@
+"""Ranked full-text search over astronomy shows.
+
+On PostgreSQL every show stores a weighted ``tsvector`` (title A, theme
+names B, description C) in ``AstronomyShow.search_vector``, indexed
+with GIN and ranked with ``ts_rank``. Other databases leave the column
+empty and fall back to case-insensitive matches ranked with the same
+weights. On SQLite (the test setup) the matching rows come from an FTS5
+index, ``planetarium_astronomyshow_fts``, of the same three texts kept
+up to date by ``update_search_vectors``: every term matches word
+prefixes there. The remaining backends match substrings with a scan.
+"""
+from functools import reduce
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connection
+from django.db.models import (
+    Case,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from planetarium.models import AstronomyShow
+
+# PostgreSQL's default ts_rank weights of A, B and C.
+TITLE_WEIGHT = 1.0
+THEME_WEIGHT = 0.4
+DESCRIPTION_WEIGHT = 0.2
+
+FTS_TABLE = "planetarium_astronomyshow_fts"
+
+
+def is_supported() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def has_fts_index() -> bool:
+    return connection.vendor == "sqlite"
+
+
+def search_vector():
+    config = settings.PLANETARIUM_SEARCH_CONFIG
+    theme_names = (
+        AstronomyShow.show_theme.through.objects.filter(
+            astronomyshow_id=OuterRef("pk")
+        )
+        .values("astronomyshow_id")
+        .annotate(names=StringAgg("showtheme__name", " "))
+        .values("names")
+    )
+    return (
+        SearchVector("title", weight="A", config=config)
+        + SearchVector(
+            Coalesce(Subquery(theme_names), Value("")),
+            weight="B",
+            config=config,
+        )
+        + SearchVector("description", weight="C", config=config)
+    )
+
+
+def update_search_vectors(show_ids: Iterable[int] | None = None) -> None:
+    """Recompute stored vectors of the given shows (all by default)"""
+    if has_fts_index():
+        update_fts_rows(show_ids)
+    if not is_supported():
+        return
+    shows = AstronomyShow.objects.all()
+    if show_ids is not None:
+        shows = shows.filter(id__in=list(show_ids))
+    shows.update(search_vector=search_vector())
+
+
+def update_fts_rows(show_ids: Iterable[int] | None = None) -> None:
+    """Replace the FTS5 rows of the given shows, deleted ones included"""
+    where, params = "", []
+    if show_ids is not None:
+        params = list(show_ids)
+        if not params:
+            return
+        where = f"IN ({', '.join(['%s'] * len(params))})"
+    through = AstronomyShow.show_theme.through._meta.db_table
+    theme = AstronomyShow.show_theme.field.related_model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE}"
+            + (f" WHERE rowid {where}" if where else ""),
+            params,
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, themes, description) "
+            "SELECT show.id, show.title, coalesce(("
+            "SELECT group_concat(theme.name, ' ') "
+            f"FROM {through} AS link JOIN {theme} AS theme "
+            "ON theme.id = link.showtheme_id "
+            "WHERE link.astronomyshow_id = show.id), ''), show.description "
+            f"FROM {AstronomyShow._meta.db_table} AS show"
+            + (f" WHERE show.id {where}" if where else ""),
+            params,
+        )
+
+
+def fts_query(terms: list[str]) -> str:
+    """Every term as a quoted prefix, FTS5 ANDs them"""
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_shows(queryset, q: str):
+    """Filter ``queryset`` to shows matching ``q``, most relevant first"""
+    if is_supported():
+        query = SearchQuery(
+            q,
+            search_type="websearch",
+            config=settings.PLANETARIUM_SEARCH_CONFIG,
+        )
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-id")
+        )
+
+    terms = q.split()
+    if not terms:
+        return queryset.none()
+    if has_fts_index():
+        queryset = queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [fts_query(terms)],
+            )
+        )
+    themed = AstronomyShow.show_theme.through.objects.values(
+        "astronomyshow_id"
+    )
+    ranks = []
+    for term in terms:
+        themed_term = themed.filter(showtheme__name__icontains=term)
+        if not has_fts_index():
+            queryset = queryset.filter(
+                Q(title__icontains=term)
+                | Q(description__icontains=term)
+                | Q(id__in=themed_term)
+            )
+        ranks += [
+            Case(
+                When(title__icontains=term, then=Value(TITLE_WEIGHT)),
+                default=Value(0.0),
+            ),
+            Case(
+                When(id__in=themed_term, then=Value(THEME_WEIGHT)),
+                default=Value(0.0),
+            ),
+            Case(
+                When(
+                    description__icontains=term,
+                    then=Value(DESCRIPTION_WEIGHT),
+                ),
+                default=Value(0.0),
+            ),
+        ]
+    return queryset.annotate(
+        rank=reduce(lambda total, rank: total + rank, ranks)
+    ).order_by("-rank", "-id")
@@ -0,0 +1,85 @@
+"""Best-available allocation of contiguous seats.
+
+Rows are scanned as integers: the bitset of a ``SeatMap`` row (seat 1 is
+the most significant bit) is inverted into a mask of free seats and its
+runs of ones are peeled off with ``bit_length``, so the cost grows with
+the number of free runs rather than with the number of seats.
+"""
+from typing import Iterable
+
+from planetarium.occupancy import SeatMap
+
+Interval = tuple[int, int]
+
+
+class FreeSeats:
+    """Per-row free intervals of a seat map, computed on demand"""
+
+    def __init__(self, seat_map: SeatMap, blocked: Iterable = ()):
+        self.rows = seat_map.rows
+        self.seats_in_row = seat_map.seats_in_row
+        self.size = len(seat_map.bits) * 8
+        taken = int.from_bytes(seat_map.bits, "big")
+        for row, seat in blocked:
+            if seat_map.contains(row, seat):
+                taken |= 1 << self._shift(row, seat)
+        self.taken = taken
+        self.row_mask = (1 << self.seats_in_row) - 1
+
+    def _shift(self, row: int, seat: int) -> int:
+        return self.size - 1 - ((row - 1) * self.seats_in_row + seat - 1)
+
+    def intervals(self, row: int) -> list[Interval]:
+        """Free runs of ``row`` as inclusive ``(first, last)`` seats"""
+        free = ~(self.taken >> self._shift(row, self.seats_in_row))
+        free &= self.row_mask
+        runs = []
+        while free:
+            top = free.bit_length()
+            # Positions below the run: everything under its first taken seat.
+            bottom = (~free & ((1 << top) - 1)).bit_length()
+            runs.append(
+                (self.seats_in_row - top + 1, self.seats_in_row - bottom)
+            )
+            free &= (1 << bottom) - 1
+        return runs
+
+
+def best_block(
+    seat_map: SeatMap, count: int, blocked: Iterable = ()
+) -> list[tuple[int, int]] | None:
+    """Pick ``count`` adjacent free seats as close to the centre as possible.
+
+    A block scores the distance of its row from the middle row plus the
+    distance of its middle from the middle seat; rows are visited from
+    the centre outwards and the scan stops once no farther row can beat
+    the best block found. ``blocked`` seats (e.g. held ones) count as
+    taken. Returns ``(row, seat)`` pairs or ``None``.
+    """
+    if count < 1 or count > seat_map.seats_in_row:
+        return None
+    free_seats = FreeSeats(seat_map, blocked)
+    middle_row = (seat_map.rows + 1) / 2
+    middle_seat = (seat_map.seats_in_row + 1) / 2
+    ideal_first = int(middle_seat - (count - 1) / 2)
+
+    best = None
+    rows = sorted(
+        range(1, seat_map.rows + 1), key=lambda row: abs(row - middle_row)
+    )
+    for row in rows:
+        row_distance = abs(row - middle_row)
+        if best is not None and row_distance >= best[0]:
+            break
+        for first, last in free_seats.intervals(row):
+            if last - first + 1 < count:
+                continue
+            start = min(max(ideal_first, first), last - count + 1)
+            score = row_distance + abs(start + (count - 1) / 2 - middle_seat)
+            if best is None or score < best[0]:
+                best = (score, row, start)
+
+    if best is None:
+        return None
+    _, row, start = best
+    return [(row, seat) for seat in range(start, start + count)]
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import transaction
+from rest_framework.exceptions import ValidationError
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator, UniqueTogetherValidator
 
@@ -9,10 +11,20 @@ from planetarium.models import (
     PlanetariumDome,
     Ticket,
     Reservation,
+    SeatHold,
+    HeldSeat,
+    ScheduleDay,
 )
+from planetarium.holds import (
+    SEAT_TAKEN_MESSAGE,
+    book_seats,
+    convert_hold,
+    held_seats,
+)
+from planetarium.fieldsets import FieldsetMixin
 
 
-class ShowThemeSerializer(serializers.ModelSerializer):
+class ShowThemeSerializer(FieldsetMixin, serializers.ModelSerializer):
     name = serializers.CharField(
         validators=[
             UniqueValidator(
@@ -24,13 +36,14 @@ class ShowThemeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ShowTheme
-        fields = "__all__"
+        fields = ("id", "name")
 
 
-class AstronomyShowSerializer(serializers.ModelSerializer):
+class AstronomyShowSerializer(FieldsetMixin, serializers.ModelSerializer):
     show_theme = serializers.SlugRelatedField(
         many=True, read_only=True, slug_field="name"
     )
+    expandable_fields = {"show_theme": (ShowThemeSerializer, {"many": True})}
 
     class Meta:
         model = AstronomyShow
@@ -41,10 +54,28 @@ class AstronomyShowDetailSerializer(AstronomyShowSerializer):
     show_theme = ShowThemeSerializer(many=True, read_only=True)
 
 
-class TicketSerializer(serializers.ModelSerializer):
+class TicketSerializer(FieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        "show_session": (
+            "planetarium.serializers.ShowSessionListSerializer",
+            {},
+        ),
+        "reservation": (
+            "planetarium.serializers.ReservationUserSerializer",
+            {},
+        ),
+    }
+
     class Meta:
         model = Ticket
         fields = "__all__"
+        extra_kwargs = {
+            "show_session": {
+                "queryset": ShowSession.objects.select_related(
+                    "planetarium_dome"
+                )
+            }
+        }
         validators = [
             UniqueTogetherValidator(
                 Ticket.objects.all(),
@@ -63,11 +94,25 @@ class TicketSerializer(serializers.ModelSerializer):
         )
         return data
 
+    def create(self, validated_data) -> Ticket:
+        """Book the seat under its session lock, honouring seat holds"""
+        reservation = validated_data.pop("reservation")
+        (ticket,) = book_seats(reservation, [validated_data])
+        return ticket
+
+
+class ShowSessionSerializer(FieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        "astronomy_show": (AstronomyShowSerializer, {}),
+        "planetarium_dome": (
+            "planetarium.serializers.PlanetariumDomeSerializer",
+            {},
+        ),
+    }
 
-class ShowSessionSerializer(serializers.ModelSerializer):
     class Meta:
         model = ShowSession
-        fields = "__all__"
+        fields = ("id", "astronomy_show", "planetarium_dome", "show_time")
 
 
 class ShowSessionListSerializer(ShowSessionSerializer):
@@ -78,6 +123,15 @@ class ShowSessionListSerializer(ShowSessionSerializer):
         many=False, read_only=True, slug_field="title"
     )
     tickets_left = serializers.IntegerField(read_only=True)
+    field_relations = {"tickets_left": ("planetarium_dome",)}
+    values_columns = {
+        "planetarium_dome": ("planetarium_dome__name",),
+        "tickets_left": (
+            "planetarium_dome__rows",
+            "planetarium_dome__seats_in_row",
+            "tickets_sold",
+        ),
+    }
 
     class Meta:
         model = ShowSession
@@ -89,8 +143,14 @@ class ShowSessionListSerializer(ShowSessionSerializer):
             "tickets_left",
         )
 
+    @staticmethod
+    def represent_tickets_left(rows, seats_in_row, tickets_sold):
+        if rows is None:
+            return None
+        return rows * seats_in_row - tickets_sold
 
-class PlanetariumDomeSerializer(serializers.ModelSerializer):
+
+class PlanetariumDomeSerializer(FieldsetMixin, serializers.ModelSerializer):
     name = serializers.CharField(
         validators=[
             UniqueValidator(
@@ -121,9 +181,38 @@ class ShowSessionDetailSerializer(ShowSessionListSerializer):
         )
 
     def get_taken_seats(self, obj):
+        if "taken_seats" in self.context:
+            return self.context["taken_seats"]
         return obj.tickets.values_list("seat", flat=True)
 
 
+class ScheduleSessionSerializer(ShowSessionListSerializer):
+    class Meta:
+        model = ShowSession
+        fields = ("id", "astronomy_show", "show_time", "tickets_left")
+
+
+class ScheduleDaySerializer(serializers.ModelSerializer):
+    planetarium_dome = PlanetariumDomeSerializer(many=False, read_only=True)
+
+    class Meta:
+        model = ScheduleDay
+        fields = ("planetarium_dome", "seats_left", "sessions")
+
+
+class SeatMapSerializer(serializers.Serializer):
+    """Taken seats of a session as a row-major bitset.
+
+    Bit ``(row - 1) * seats_in_row + (seat - 1)`` of ``bits`` (base64,
+    most significant bit first) is set when the seat is taken.
+    """
+
+    rows = serializers.IntegerField(read_only=True)
+    seats_in_row = serializers.IntegerField(read_only=True)
+    taken = serializers.IntegerField(source="taken_count", read_only=True)
+    bits = serializers.CharField(source="to_base64", read_only=True)
+
+
 class TicketListSerializer(TicketSerializer):
     astronomy_show = serializers.CharField(
         source="show_session.astronomy_show.title", read_only=True
@@ -139,7 +228,7 @@ class TicketListSerializer(TicketSerializer):
         )
 
 
-class ReservationUserSerializer(serializers.ModelSerializer):
+class ReservationUserSerializer(FieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Reservation
         fields = ["id", "user", "created_at"]
@@ -150,21 +239,152 @@ class TicketDetailSerializer(TicketSerializer):
     reservation = ReservationUserSerializer(many=False, read_only=True)
 
 
-class ReservationSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+class BatchedShowSessionField(serializers.PrimaryKeyRelatedField):
+    """Resolve sessions from the batch prefetched by the list serializer"""
+
+    def to_internal_value(self, data):
+        sessions = getattr(self.parent, "prefetched_sessions", {})
+        try:
+            return sessions[int(data)]
+        except (KeyError, TypeError, ValueError):
+            return super().to_internal_value(data)
+
+
+class BulkTicketListSerializer(serializers.ListSerializer):
+    """Validate a batch of tickets with a constant number of queries.
+
+    Sessions (with their domes), already taken seats and seats held by
+    other users are fetched once for the whole batch instead of once per
+    ticket.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.prefetch(data)
+        return super().to_internal_value(data)
+
+    def prefetch(self, data: list) -> None:
+        requested = set()
+        for item in data:
+            try:
+                requested.add(
+                    (
+                        int(item["row"]),
+                        int(item["seat"]),
+                        int(item["show_session"]),
+                    )
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+
+        session_ids = {show_session for _, _, show_session in requested}
+        self.child.prefetched_sessions = (
+            ShowSession.objects.select_related("planetarium_dome").in_bulk(
+                session_ids
+            )
+        )
+        self.child.taken_seats = set()
+        if requested:
+            self.child.taken_seats = requested.intersection(
+                Ticket.objects.filter(
+                    show_session_id__in=session_ids,
+                    row__in={row for row, _, _ in requested},
+                    seat__in={seat for _, seat, _ in requested},
+                ).values_list("row", "seat", "show_session_id")
+            )
+            request = self.context.get("request")
+            self.child.taken_seats |= held_seats(
+                requested, getattr(getattr(request, "user", None), "pk", None)
+            )
+
+
+class ReservationTicketSerializer(TicketSerializer):
+    show_session = BatchedShowSessionField(
+        queryset=ShowSession.objects.select_related("planetarium_dome")
+    )
+
+    class Meta(TicketSerializer.Meta):
+        validators = []
+        list_serializer_class = BulkTicketListSerializer
+
+    def validate(self, attrs) -> dict:
+        seat = (attrs["row"], attrs["seat"], attrs["show_session"].id)
+        taken_seats = getattr(self, "taken_seats", set())
+        if seat in taken_seats:
+            raise ValidationError(SEAT_TAKEN_MESSAGE)
+        data = super(ReservationTicketSerializer, self).validate(attrs)
+        taken_seats.add(seat)
+        return data
+
+
+class ReservationSerializer(FieldsetMixin, serializers.ModelSerializer):
+    tickets = ReservationTicketSerializer(
+        many=True, read_only=False, allow_empty=False, required=False
+    )
+    hold = serializers.PrimaryKeyRelatedField(
+        queryset=SeatHold.objects.all(), write_only=True, required=False
+    )
 
     class Meta:
         model = Reservation
         fields = "__all__"
+        read_only_fields = ("user",)
+
+    def validate(self, attrs) -> dict:
+        data = super(ReservationSerializer, self).validate(attrs)
+        if ("tickets" in attrs) == ("hold" in attrs):
+            raise ValidationError("Provide either tickets or a seat hold.")
+        hold = attrs.get("hold")
+        if hold is not None:
+            if hold.user_id != self.context["request"].user.pk:
+                raise ValidationError({"hold": "Unknown seat hold."})
+            if hold.is_expired:
+                raise ValidationError({"hold": "Seat hold has expired."})
+        return data
 
     def create(self, validated_data) -> Reservation:
         with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
+            tickets_data = validated_data.pop("tickets", None)
+            hold = validated_data.pop("hold", None)
             reservation = Reservation.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(reservation=reservation, **ticket_data)
+            if hold is not None:
+                convert_hold(hold, reservation)
+            else:
+                book_seats(reservation, tickets_data)
             return reservation
 
 
+class HeldSeatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HeldSeat
+        fields = ("row", "seat")
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    seats = HeldSeatSerializer(many=True, allow_empty=False)
+    minutes = serializers.IntegerField(
+        write_only=True,
+        required=False,
+        min_value=1,
+        max_value=settings.PLANETARIUM_SEAT_HOLD_MAX_MINUTES,
+    )
+
+    class Meta:
+        model = SeatHold
+        fields = ("id", "show_session", "seats", "expires_at", "minutes")
+        read_only_fields = ("show_session", "expires_at")
+
+
+class BestSeatsSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1)
+    minutes = serializers.IntegerField(
+        write_only=True,
+        required=False,
+        min_value=1,
+        max_value=settings.PLANETARIUM_SEAT_HOLD_MAX_MINUTES,
+    )
+    seats = HeldSeatSerializer(many=True, read_only=True)
+
+
 class ReservationDetailSerializer(ReservationSerializer):
     tickets = TicketDetailSerializer(many=True, read_only=True)
@@ -0,0 +1,224 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from planetarium import cache
+from planetarium.events import publish_seats
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    ShowSession,
+    ShowTheme,
+    Ticket,
+)
+from planetarium.occupancy import (
+    occupy_seats,
+    rebuild_occupancy,
+    release_seats,
+    seats_changed,
+)
+from planetarium.schedule import (
+    local_day,
+    rebuild_cells,
+    refresh_session_seats,
+    session_cells,
+)
+from planetarium.search import update_search_vectors
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_previous_seat(sender, instance, raw=False, **kwargs):
+    instance._previous_seat = None
+    if instance.pk and not raw:
+        instance._previous_seat = (
+            Ticket.objects.filter(pk=instance.pk)
+            .only("row", "seat", "show_session")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def take_seat(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_previous_seat", None)
+    if previous is not None:
+        release_seats([previous])
+    occupy_seats([instance])
+
+
+@receiver(post_delete, sender=Ticket)
+def free_seat(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, ShowSession):
+        return
+    release_seats([instance])
+
+
+@receiver(seats_changed)
+def broadcast_seats(sender, show_session_id, seats, taken, **kwargs):
+    transaction.on_commit(
+        lambda: publish_seats(show_session_id, seats, taken)
+    )
+
+
+@receiver(post_save, sender=ShowSession)
+def refresh_session_occupancy(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        rebuild_occupancy(instance)
+
+
+@receiver(post_save, sender=PlanetariumDome)
+def refresh_dome_occupancy(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    for show_session in instance.show_sessions.select_related(
+        "planetarium_dome"
+    ):
+        rebuild_occupancy(show_session)
+
+
+@receiver(pre_save, sender=ShowSession)
+def remember_previous_schedule_day(sender, instance, raw=False, **kwargs):
+    instance._previous_cells = set()
+    if instance.pk and not raw:
+        instance._previous_cells = session_cells(
+            ShowSession.objects.filter(pk=instance.pk)
+        )
+
+
+@receiver(post_save, sender=ShowSession)
+def refresh_session_schedule(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    rebuild_cells(
+        {(local_day(instance.show_time), instance.planetarium_dome_id)}
+        | getattr(instance, "_previous_cells", set())
+    )
+
+
+@receiver(post_delete, sender=ShowSession)
+def drop_session_schedule(sender, instance, **kwargs):
+    rebuild_cells(
+        [(local_day(instance.show_time), instance.planetarium_dome_id)]
+    )
+
+
+@receiver(post_save, sender=AstronomyShow)
+@receiver(post_save, sender=PlanetariumDome)
+def refresh_schedule(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        rebuild_cells(session_cells(instance.show_sessions.all()))
+
+
+@receiver(seats_changed)
+def refresh_seats_schedule(sender, show_session_id, **kwargs):
+    # After commit, so bookings never wait on the day's rollup row. The
+    # booking is committed by then: a failed refresh is only logged, and
+    # ``rebuild_schedule`` repairs the rollup.
+    transaction.on_commit(
+        lambda: refresh_session_seats(show_session_id), robust=True
+    )
+
+
+@receiver(post_save, sender=AstronomyShow)
+def refresh_show_search_vector(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_search_vectors([instance.id])
+
+
+@receiver(post_delete, sender=AstronomyShow)
+def drop_show_search_vector(sender, instance, **kwargs):
+    update_search_vectors([instance.id])
+
+
+@receiver(m2m_changed, sender=AstronomyShow.show_theme.through)
+def refresh_themed_search_vectors(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not reverse:
+        if action.startswith("post_"):
+            update_search_vectors([instance.id])
+    elif action == "pre_clear":
+        remember_themed_shows(ShowTheme, instance)
+    elif action == "post_clear":
+        update_search_vectors(instance._previous_show_ids)
+    elif action.startswith("post_"):
+        update_search_vectors(pk_set)
+
+
+@receiver(pre_delete, sender=ShowTheme)
+def remember_themed_shows(sender, instance, **kwargs):
+    instance._previous_show_ids = list(
+        instance.astronomy_shows.values_list("id", flat=True)
+    )
+
+
+@receiver(post_save, sender=ShowTheme)
+def refresh_theme_search_vectors(
+    sender, instance, created, raw=False, **kwargs
+):
+    if not created and not raw:
+        update_search_vectors(
+            instance.astronomy_shows.values_list("id", flat=True)
+        )
+
+
+@receiver(post_delete, sender=ShowTheme)
+def drop_theme_from_search_vectors(sender, instance, **kwargs):
+    update_search_vectors(getattr(instance, "_previous_show_ids", []))
+
+
+@receiver(pre_save, sender=ShowTheme)
+@receiver(pre_save, sender=AstronomyShow)
+@receiver(pre_save, sender=PlanetariumDome)
+@receiver(pre_save, sender=ShowSession)
+def stamp_raw_update(sender, instance, raw=False, **kwargs):
+    # Raw saves (loaddata) skip auto_now, and fixtures written before
+    # updated_at existed don't carry it.
+    if raw and instance.updated_at is None:
+        instance.updated_at = timezone.now()
+
+
+@receiver(m2m_changed, sender=AstronomyShow.show_theme.through)
+def touch_themed_shows(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        show_ids = [instance.id]
+    elif action == "post_clear":
+        show_ids = instance._previous_show_ids
+    else:
+        show_ids = pk_set
+    AstronomyShow.objects.filter(id__in=show_ids).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=ShowTheme)
+@receiver(post_delete, sender=ShowTheme)
+@receiver(post_save, sender=AstronomyShow)
+@receiver(post_delete, sender=AstronomyShow)
+@receiver(post_save, sender=PlanetariumDome)
+@receiver(post_delete, sender=PlanetariumDome)
+def invalidate_catalog_cache(sender, **kwargs):
+    _invalidate(sender)
+
+
+@receiver(m2m_changed, sender=AstronomyShow.show_theme.through)
+def invalidate_show_themes_cache(sender, action, **kwargs):
+    if action.startswith("post_"):
+        _invalidate(AstronomyShow)
+
+
+def _invalidate(model):
+    # Bumping again on commit drops entries cached by readers that saw
+    # the pre-commit state in between.
+    cache.bump_version(model)
+    transaction.on_commit(lambda: cache.bump_version(model))
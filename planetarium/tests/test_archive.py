@@ -0,0 +1,197 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.archive import archive_chunk
+from planetarium.holds import create_hold
+from planetarium.models import (
+    ArchivedReservation,
+    ArchivedShowSession,
+    ArchivedTicket,
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ScheduleDay,
+    SeatHold,
+    ShowSession,
+    Ticket,
+)
+
+RESERVATION_URL = reverse("planetarium:reservation-list")
+TICKET_URL = reverse("planetarium:ticket-list")
+
+
+class ArchiveSessionsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(self.user)
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Description"
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=10, seats_in_row=10
+        )
+        now = timezone.now()
+        self.past_sessions = [
+            ShowSession.objects.create(
+                astronomy_show=show,
+                planetarium_dome=dome,
+                show_time=now - timedelta(days=days),
+            )
+            for days in (30, 20)
+        ]
+        self.future_session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=dome,
+            show_time=now + timedelta(days=1),
+        )
+        # all in the past, and partly in the future
+        self.past_reservation = self.reserve(
+            (1, 1, self.past_sessions[0]), (2, 2, self.past_sessions[1])
+        )
+        self.mixed_reservation = self.reserve(
+            (3, 3, self.past_sessions[0]), (4, 4, self.future_session)
+        )
+
+    def reserve(self, *seats) -> Reservation:
+        reservation = Reservation.objects.create(user=self.user)
+        for row, seat, show_session in seats:
+            Ticket.objects.create(
+                row=row,
+                seat=seat,
+                show_session=show_session,
+                reservation=reservation,
+            )
+        return reservation
+
+    def archive(self, before, **options) -> str:
+        out = StringIO()
+        call_command(
+            "archive_sessions",
+            before=before.isoformat(),
+            stdout=out,
+            **options,
+        )
+        return out.getvalue()
+
+    def get_history(self) -> list[bytes]:
+        urls = [
+            (RESERVATION_URL, {}),
+            (RESERVATION_URL, {"expand": "tickets.show_session"}),
+            (
+                reverse(
+                    "planetarium:reservation-detail",
+                    args=[self.past_reservation.id],
+                ),
+                {},
+            ),
+            (TICKET_URL, {}),
+            (TICKET_URL, {"expand": "show_session,reservation"}),
+        ]
+        history = []
+        for url, params in urls:
+            res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            history.append(res.content)
+        return history
+
+    def test_archive(self):
+        history = self.get_history()
+        self.assertEqual(json.loads(history[3])["count"], 4)
+
+        out = self.archive(timezone.now(), chunk_size=1)
+
+        self.assertIn(
+            "2 session(s), 3 ticket(s) and 1 reservation(s) archived", out
+        )
+        self.assertEqual(
+            list(ShowSession.objects.all()), [self.future_session]
+        )
+        self.assertEqual(ArchivedShowSession.objects.count(), 2)
+        self.assertEqual(
+            list(Ticket.objects.values_list("row", flat=True)), [4]
+        )
+        self.assertEqual(ArchivedTicket.objects.count(), 3)
+        self.assertEqual(
+            list(Reservation.objects.all()), [self.mixed_reservation]
+        )
+        self.assertEqual(
+            list(ArchivedReservation.objects.values_list("id", flat=True)),
+            [self.past_reservation.id],
+        )
+        self.assertEqual(self.get_history(), history)
+
+    def test_reservation_moves_with_its_last_session(self):
+        self.archive(timezone.now())
+        history = self.get_history()
+
+        self.archive(timezone.now() + timedelta(days=2))
+
+        self.assertFalse(Reservation.objects.exists())
+        self.assertEqual(ArchivedReservation.objects.count(), 2)
+        self.assertEqual(self.get_history(), history)
+
+    def test_only_older_sessions_are_archived(self):
+        out = self.archive(timezone.now() - timedelta(days=25))
+
+        self.assertIn("1 session(s), 2 ticket(s) and 0 reservation", out)
+        self.assertEqual(
+            list(ArchivedShowSession.objects.values_list("id", flat=True)),
+            [self.past_sessions[0].id],
+        )
+
+    def test_query_count_does_not_depend_on_ticket_count(self):
+        self.reserve((9, 9, self.past_sessions[0]))
+        with CaptureQueriesContext(connection) as few:
+            archived = archive_chunk(timezone.now(), chunk_size=1)
+        self.assertEqual(archived["reservations"], 1)
+
+        self.reserve(
+            *(
+                (row, seat, self.past_sessions[1])
+                for row in range(5, 11)
+                for seat in range(1, 11)
+            )
+        )
+        with CaptureQueriesContext(connection) as many:
+            archived = archive_chunk(timezone.now(), chunk_size=1)
+
+        self.assertEqual(archived["tickets"], 61)
+        self.assertEqual(archived["reservations"], 2)
+        self.assertEqual(len(many), len(few))
+
+    def test_holds_and_schedule_go_with_sessions(self):
+        create_hold(
+            self.user.id,
+            self.past_sessions[0].id,
+            [{"row": 9, "seat": 9}],
+            minutes=5,
+        )
+        self.assertEqual(ScheduleDay.objects.count(), 3)
+
+        self.archive(timezone.now())
+
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(
+            list(ScheduleDay.objects.values_list("day", flat=True)),
+            [timezone.localdate(self.future_session.show_time)],
+        )
+
+    def test_invalid_options(self):
+        with self.assertRaises(CommandError):
+            call_command("archive_sessions", before="yesterday")
+        with self.assertRaises(CommandError):
+            self.archive(timezone.now(), chunk_size=0)
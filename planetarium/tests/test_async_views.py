@@ -0,0 +1,110 @@
+import json
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket,
+)
+
+
+class AsyncReadViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.async_client = AsyncClient()
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        theme = ShowTheme.objects.create(name="Stars")
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=5, seats_in_row=5
+        )
+        for i in range(12):
+            show = AstronomyShow.objects.create(
+                title=f"Show {i}", description="Description"
+            )
+            show.show_theme.add(theme)
+            self.show_session = ShowSession.objects.create(
+                astronomy_show=show,
+                planetarium_dome=dome,
+                show_time=timezone.now() + timedelta(days=i + 1),
+            )
+        reservation = Reservation.objects.create(user=user)
+        for seat in (1, 2):
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                show_session=self.show_session,
+                reservation=reservation,
+            )
+
+    async def get_json(self, url):
+        response = await self.async_client.get(url)
+        return response.status_code, json.loads(response.content)
+
+    def assertSameAsSync(self, sync_name, async_name, args=(), query=""):
+        sync_response = self.client.get(
+            reverse(f"planetarium:{sync_name}", args=args) + query
+        )
+        async_url = reverse(f"planetarium:{async_name}", args=args) + query
+        status_code, data = async_to_sync(self.get_json)(async_url)
+
+        self.assertEqual(status_code, sync_response.status_code)
+        expected = json.loads(sync_response.content)
+        if isinstance(expected, dict):
+            for link in ("next", "previous"):
+                if expected.get(link):
+                    expected[link] = expected[link].replace(
+                        reverse(f"planetarium:{sync_name}", args=args),
+                        reverse(f"planetarium:{async_name}", args=args),
+                    )
+        self.assertEqual(data, expected)
+
+    def test_show_session_list(self):
+        self.assertSameAsSync(
+            "showsession-list", "async-showsession-list"
+        )
+        self.assertSameAsSync(
+            "showsession-list", "async-showsession-list", query="?page=2"
+        )
+        self.assertSameAsSync(
+            "showsession-list",
+            "async-showsession-list",
+            query="?astronomy_show=x",
+        )
+
+    def test_show_session_detail(self):
+        self.assertSameAsSync(
+            "showsession-detail",
+            "async-showsession-detail",
+            args=[self.show_session.id],
+        )
+        self.assertSameAsSync(
+            "showsession-detail",
+            "async-showsession-detail",
+            args=[self.show_session.id + 100],
+        )
+
+    def test_seat_map(self):
+        self.assertSameAsSync(
+            "showsession-seat-map",
+            "async-showsession-seat-map",
+            args=[self.show_session.id],
+        )
+
+    def test_astronomy_show_list(self):
+        self.assertSameAsSync(
+            "astronomyshow-list", "async-astronomyshow-list", query="?page=2"
+        )
@@ -0,0 +1,162 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    SeatHold,
+    ShowSession,
+    Ticket,
+)
+from planetarium.occupancy import SeatMap
+from planetarium.seating import FreeSeats, best_block
+
+
+def best_seats_url(show_session_id):
+    return reverse(
+        "planetarium:showsession-best-seats", args=[show_session_id]
+    )
+
+
+class BestBlockTest(TestCase):
+    def test_free_intervals(self):
+        seat_map = SeatMap(rows=2, seats_in_row=10)
+        for seat in (1, 4, 5, 10):
+            seat_map.occupy(1, seat)
+
+        free_seats = FreeSeats(seat_map, blocked=[(2, 3)])
+
+        self.assertEqual(free_seats.intervals(1), [(2, 3), (6, 9)])
+        self.assertEqual(free_seats.intervals(2), [(1, 2), (4, 10)])
+
+    def test_empty_map_gets_the_centre(self):
+        self.assertEqual(
+            best_block(SeatMap(rows=5, seats_in_row=10), 2),
+            [(3, 5), (3, 6)],
+        )
+
+    def test_row_distance_is_weighed_against_seat_distance(self):
+        seat_map = SeatMap(rows=5, seats_in_row=10)
+        seat_map.occupy(3, 5)
+
+        # one seat off centre in the middle row ties with the row behind
+        self.assertEqual(best_block(seat_map, 2), [(3, 6), (3, 7)])
+
+        for seat in range(3, 9):
+            seat_map.occupy(3, seat)
+        self.assertEqual(best_block(seat_map, 2), [(2, 5), (2, 6)])
+
+    def test_blocked_seats_and_no_room(self):
+        seat_map = SeatMap(rows=1, seats_in_row=4)
+        seat_map.occupy(1, 1)
+
+        self.assertIsNone(best_block(seat_map, 2, blocked=[(1, 3)]))
+        self.assertEqual(best_block(seat_map, 3), [(1, 2), (1, 3), (1, 4)])
+        self.assertIsNone(best_block(seat_map, 5))
+        self.assertIsNone(best_block(SeatMap(0, 0), 1))
+
+
+class BestSeatsApiTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.show_session = ShowSession.objects.create(
+            astronomy_show=AstronomyShow.objects.create(
+                title="Cosmic Voyage", description="Description"
+            ),
+            planetarium_dome=PlanetariumDome.objects.create(
+                name="Dome", rows=3, seats_in_row=4
+            ),
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        reservation = Reservation.objects.create(user=self.user)
+        for seat in (2, 3):
+            Ticket.objects.create(
+                row=2,
+                seat=seat,
+                show_session=self.show_session,
+                reservation=reservation,
+            )
+        self.url = best_seats_url(self.show_session.id)
+
+    def test_get_best_seats(self):
+        res = self.client.get(self.url, {"count": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["seats"],
+            [{"row": 1, "seat": 2}, {"row": 1, "seat": 3}],
+        )
+
+    def test_get_without_room(self):
+        res = self.client.get(self.url, {"count": 5})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["seats"], [])
+
+    def test_count_is_required(self):
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_post_holds_the_block(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.post(self.url, {"count": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        hold = SeatHold.objects.get(id=res.data["id"])
+        self.assertEqual(hold.user, self.user)
+        self.assertEqual(
+            list(hold.seats.values_list("row", "seat")), [(1, 2), (1, 3)]
+        )
+
+        # the held block is no longer offered
+        res = self.client.get(self.url, {"count": 2})
+        self.assertEqual(
+            res.data["seats"],
+            [{"row": 3, "seat": 2}, {"row": 3, "seat": 3}],
+        )
+
+    def test_post_without_room(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.post(self.url, {"count": 5})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_post_requires_authentication(self):
+        res = self.client.post(self.url, {"count": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BenchmarkBestSeatsTest(TestCase):
+    def test_report(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_best_seats",
+            iterations=20,
+            maps=2,
+            seed=1,
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["seats"], 500)
+        self.assertEqual(report["iterations"], 20)
+        self.assertIn("p99", report["latency_us"])
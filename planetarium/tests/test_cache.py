@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from planetarium.cache import get_stats
+from planetarium.models import AstronomyShow, ShowTheme
+
+ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+
+
+class CatalogCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.theme = ShowTheme.objects.create(name="Stars")
+        self.show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Embark on a cosmic adventure."
+        )
+        self.show.show_theme.add(self.theme)
+
+    def test_second_request_is_served_from_cache(self):
+        res = self.client.get(ASTRONOMY_SHOW_URL)
+        self.assertEqual(res["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(ASTRONOMY_SHOW_URL)
+
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(cached.data, res.data)
+        self.assertEqual(get_stats(), {"hit": 1, "miss": 1})
+
+    def test_save_invalidates(self):
+        self.client.get(ASTRONOMY_SHOW_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.show.title = "Stellar Phenomena"
+            self.show.save()
+
+        res = self.client.get(ASTRONOMY_SHOW_URL)
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["title"], "Stellar Phenomena")
+
+    def test_theme_changes_invalidate_shows(self):
+        self.client.get(ASTRONOMY_SHOW_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.theme.name = "Planets"
+            self.theme.save()
+        res = self.client.get(ASTRONOMY_SHOW_URL)
+        self.assertEqual(res.data["results"][0]["show_theme"], ["Planets"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.show.show_theme.clear()
+        res = self.client.get(ASTRONOMY_SHOW_URL)
+        self.assertEqual(res.data["results"][0]["show_theme"], [])
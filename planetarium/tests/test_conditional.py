@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket,
+)
+
+ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+SCHEDULE_URL = reverse("planetarium:schedule-list")
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Description"
+        )
+        self.dome = PlanetariumDome.objects.create(
+            name="Dome", rows=10, seats_in_row=10
+        )
+        self.show_session = ShowSession.objects.create(
+            astronomy_show=self.show,
+            planetarium_dome=self.dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+
+    def get_etag(self, url, **params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res["ETag"]
+
+    def test_not_modified_skips_serialization(self):
+        etag = self.get_etag(SHOW_SESSION_URL)
+
+        # only the aggregate behind the ETag
+        with self.assertNumQueries(1):
+            res = self.client.get(SHOW_SESSION_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+        self.assertEqual(res["ETag"], etag)
+        self.assertIn("Last-Modified", res)
+
+    def test_etag_varies_with_the_query(self):
+        self.assertNotEqual(
+            self.get_etag(SHOW_SESSION_URL),
+            self.get_etag(SHOW_SESSION_URL, page_size=1),
+        )
+
+    def test_bookings_change_the_etag(self):
+        etag = self.get_etag(SHOW_SESSION_URL)
+        detail_url = reverse(
+            "planetarium:showsession-detail", args=[self.show_session.id]
+        )
+        detail_etag = self.get_etag(detail_url)
+
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            show_session=self.show_session,
+            reservation=Reservation.objects.create(
+                user=get_user_model().objects.create_user(
+                    email="test@test.com", password="testpass"
+                )
+            ),
+        )
+
+        self.assertNotEqual(self.get_etag(SHOW_SESSION_URL), etag)
+        self.assertNotEqual(self.get_etag(detail_url), detail_etag)
+
+    def test_related_catalog_changes_change_the_etag(self):
+        etag = self.get_etag(SHOW_SESSION_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dome.name = "Big Dome"
+            self.dome.save()
+
+        self.assertNotEqual(self.get_etag(SHOW_SESSION_URL), etag)
+
+    def test_deleted_rows_change_the_etag(self):
+        etag = self.get_etag(SHOW_SESSION_URL)
+
+        ShowSession.objects.create(
+            astronomy_show=self.show,
+            planetarium_dome=self.dome,
+            show_time=timezone.now() + timedelta(days=2),
+        ).delete()
+
+        self.assertEqual(self.get_etag(SHOW_SESSION_URL), etag)
+        self.show_session.delete()
+        self.assertNotEqual(self.get_etag(SHOW_SESSION_URL), etag)
+
+    def test_cached_catalog(self):
+        etag = self.get_etag(ASTRONOMY_SHOW_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(
+                ASTRONOMY_SHOW_URL, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.show.show_theme.add(ShowTheme.objects.create(name="Stars"))
+
+        self.assertNotEqual(self.get_etag(ASTRONOMY_SHOW_URL), etag)
+
+    def test_schedule(self):
+        day = timezone.localdate(self.show_session.show_time)
+        params = {"from": day, "to": day}
+        etag = self.get_etag(SCHEDULE_URL, **params)
+
+        res = self.client.get(SCHEDULE_URL, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.show_session.show_time += timedelta(days=1)
+        self.show_session.save()
+        self.assertNotEqual(self.get_etag(SCHEDULE_URL, **params), etag)
+
+    def test_unknown_object(self):
+        for pk in (0, "nope"):
+            res = self.client.get(
+                reverse("planetarium:showsession-detail", args=[pk])
+            )
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertNotIn("ETag", res)
+
+
+class CompressionTest(TestCase):
+    def test_large_responses_are_gzipped(self):
+        for i in range(20):
+            AstronomyShow.objects.create(
+                title=f"Show {i}", description="Description " * 20
+            )
+
+        res = APIClient().get(
+            ASTRONOMY_SHOW_URL, HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertTrue(res["ETag"].startswith("W/"))
@@ -0,0 +1,115 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from planetarium.events import get_broker
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    Ticket,
+)
+
+
+def events_url(show_session_id):
+    return reverse(
+        "planetarium:async-showsession-events", args=[show_session_id]
+    )
+
+
+def parse_event(chunk: bytes) -> tuple[str, dict]:
+    lines = dict(
+        line.split(": ", 1) for line in chunk.decode().strip().splitlines()
+    )
+    return lines["event"], json.loads(lines["data"])
+
+
+class SeatEventsTest(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Embark on a cosmic adventure."
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=4, seats_in_row=6
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        self.reservation = Reservation.objects.create(user=user)
+
+    def create_ticket(self, row, seat):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Ticket.objects.create(
+                row=row,
+                seat=seat,
+                show_session=self.session,
+                reservation=self.reservation,
+            )
+
+    def delete_ticket(self, ticket):
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.delete()
+
+    async def test_ticket_changes_are_published(self):
+        broker = get_broker()
+        subscription = broker.subscribe(self.session.id)
+        try:
+            ticket = await sync_to_async(self.create_ticket)(2, 3)
+            event = await subscription.get(timeout=1)
+            self.assertEqual(
+                event,
+                {
+                    "type": "taken",
+                    "show_session": self.session.id,
+                    "seats": [[2, 3]],
+                },
+            )
+
+            await sync_to_async(self.delete_ticket)(ticket)
+            event = await subscription.get(timeout=1)
+            self.assertEqual(event["type"], "released")
+        finally:
+            broker.unsubscribe(subscription)
+        self.assertNotIn(self.session.id, broker.subscribers)
+
+    async def test_stream(self):
+        response = await AsyncClient().get(events_url(self.session.id))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = aiter(response.streaming_content)
+
+        self.assertTrue((await anext(chunks)).startswith(b"retry:"))
+        event, data = parse_event(await anext(chunks))
+        self.assertEqual(event, "snapshot")
+        self.assertEqual(data["taken"], 0)
+
+        next_chunk = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0)
+        await sync_to_async(self.create_ticket)(1, 1)
+        event, data = parse_event(await asyncio.wait_for(next_chunk, 1))
+        self.assertEqual(event, "taken")
+        self.assertEqual(data["seats"], [[1, 1]])
+        await chunks.aclose()
+
+    async def test_unknown_session(self):
+        response = await AsyncClient().get(events_url(self.session.id + 100))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(get_broker().subscribers, {})
+
+    def test_wsgi_is_refused(self):
+        response = Client().get(events_url(self.session.id))
+
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(get_broker().subscribers, {})
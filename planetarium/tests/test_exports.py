@@ -0,0 +1,150 @@
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    Ticket,
+)
+
+TICKET_EXPORT_URL = reverse("planetarium:ticket-export")
+RESERVATION_EXPORT_URL = reverse("planetarium:reservation-export")
+
+
+def read_body(response) -> str:
+    return b"".join(response.streaming_content).decode()
+
+
+class ExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = get_user_model().objects.create_user(
+            email="staff@test.com", password="testpass", is_staff=True
+        )
+        self.customer = get_user_model().objects.create_user(
+            email="customer@test.com", password="testpass"
+        )
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Description"
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=5, seats_in_row=5
+        )
+        self.sessions = [
+            ShowSession.objects.create(
+                astronomy_show=show,
+                planetarium_dome=dome,
+                show_time=timezone.now() + timedelta(days=day),
+            )
+            for day in (1, 2)
+        ]
+        self.old = Reservation.objects.create(user=self.customer)
+        Reservation.objects.filter(id=self.old.id).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+        self.new = Reservation.objects.create(user=self.staff)
+        Ticket.objects.create(
+            row=1, seat=1, show_session=self.sessions[0], reservation=self.old
+        )
+        Ticket.objects.create(
+            row=1, seat=2, show_session=self.sessions[0], reservation=self.new
+        )
+        Ticket.objects.create(
+            row=1, seat=1, show_session=self.sessions[1], reservation=self.new
+        )
+
+    def test_staff_only(self):
+        self.client.force_authenticate(self.customer)
+
+        res = self.client.get(TICKET_EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_tickets_csv_covers_all_users(self):
+        self.client.force_authenticate(self.staff)
+
+        res = self.client.get(TICKET_EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertIn('filename="tickets.csv"', res["Content-Disposition"])
+        rows = list(csv.DictReader(StringIO(read_body(res))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(
+            {int(row["reservation"]) for row in rows},
+            {self.old.id, self.new.id},
+        )
+        self.assertEqual(rows[0]["astronomy_show"], "Cosmic Voyage")
+        self.assertEqual(rows[0]["planetarium_dome"], "Dome")
+
+    def test_tickets_ndjson_filtered_by_session_and_date(self):
+        self.client.force_authenticate(self.staff)
+        created_after = (timezone.now() - timedelta(days=1)).date()
+
+        res = self.client.get(
+            TICKET_EXPORT_URL,
+            {
+                "export_format": "ndjson",
+                "show_session": self.sessions[0].id,
+                "created_after": created_after.isoformat(),
+            },
+        )
+
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in read_body(res).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["reservation"], self.new.id)
+        self.assertEqual(rows[0]["seat"], 2)
+
+    def test_reservations_filtered_by_session(self):
+        self.client.force_authenticate(self.staff)
+
+        res = self.client.get(
+            RESERVATION_EXPORT_URL, {"show_session": self.sessions[1].id}
+        )
+
+        rows = list(csv.DictReader(StringIO(read_body(res))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(int(rows[0]["id"]), self.new.id)
+        self.assertEqual(rows[0]["email"], "staff@test.com")
+        self.assertEqual(rows[0]["tickets"], "2")
+
+    def test_invalid_parameters(self):
+        self.client.force_authenticate(self.staff)
+
+        for params in (
+            {"export_format": "xml"},
+            {"created_before": "yesterday"},
+            {"show_session": "one"},
+        ):
+            res = self.client.get(RESERVATION_EXPORT_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_archived_rows_are_exported(self):
+        self.client.force_authenticate(self.staff)
+        before = {
+            url: read_body(self.client.get(url))
+            for url in (TICKET_EXPORT_URL, RESERVATION_EXPORT_URL)
+        }
+
+        call_command(
+            "archive_sessions",
+            before=(timezone.now() + timedelta(days=3)).isoformat(),
+            stdout=StringIO(),
+        )
+
+        self.assertFalse(Ticket.objects.exists())
+        for url, body in before.items():
+            self.assertEqual(read_body(self.client.get(url)), body)
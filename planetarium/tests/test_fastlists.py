@@ -0,0 +1,158 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.fastlists import ValuesSerializer
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket,
+)
+from planetarium.serializers import (
+    ShowSessionDetailSerializer,
+    TicketDetailSerializer,
+)
+
+ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+TICKET_URL = reverse("planetarium:ticket-list")
+
+
+class ValuesListParityTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(self.user)
+        themes = [
+            ShowTheme.objects.create(name=name)
+            for name in ("Stars", "Black holes", "Moons")
+        ]
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=10, seats_in_row=12
+        )
+        now = timezone.now()
+        for i in range(4):
+            show = AstronomyShow.objects.create(
+                title=f"Show {i}", description="Black holes and stars"
+            )
+            show.show_theme.set(themes[:i])
+            show_session = ShowSession.objects.create(
+                astronomy_show=show,
+                planetarium_dome=dome if i else None,
+                show_time=now + timedelta(days=i + 1, microseconds=i),
+            )
+            if i:
+                reservation = Reservation.objects.create(user=self.user)
+                for seat in range(1, i + 1):
+                    Ticket.objects.create(
+                        row=i,
+                        seat=seat,
+                        show_session=show_session,
+                        reservation=reservation,
+                    )
+
+    def get_content(self, url: str, params: dict) -> bytes:
+        cache.clear()
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.content
+
+    def assertSameContent(self, url: str, params: dict):
+        with override_settings(PLANETARIUM_VALUES_LISTS=False):
+            expected = self.get_content(url, params)
+        with override_settings(PLANETARIUM_VALUES_LISTS=True):
+            self.assertEqual(self.get_content(url, params), expected)
+
+    def test_astronomy_shows(self):
+        for params in ({}, {"page_size": 2, "page": 2}, {"q": "holes"}):
+            self.assertSameContent(ASTRONOMY_SHOW_URL, params)
+
+    def test_show_sessions(self):
+        for params in (
+            {},
+            {"available": "true"},
+            {"cursor": "", "page_size": 2},
+        ):
+            self.assertSameContent(SHOW_SESSION_URL, params)
+
+    def test_show_sessions_next_cursor_page(self):
+        with override_settings(PLANETARIUM_VALUES_LISTS=True):
+            content = self.get_content(
+                SHOW_SESSION_URL, {"cursor": "", "page_size": 2}
+            )
+        next_url = json.loads(content)["next"]
+
+        self.assertSameContent(next_url, {})
+
+    def test_tickets(self):
+        for params in (
+            {},
+            {"page_size": 1, "page": 3},
+            {"cursor": "", "page_size": 2},
+        ):
+            self.assertSameContent(TICKET_URL, params)
+
+    def test_tickets_next_cursor_page(self):
+        with override_settings(PLANETARIUM_VALUES_LISTS=True):
+            content = self.get_content(
+                TICKET_URL, {"cursor": "", "page_size": 2}
+            )
+        next_url = json.loads(content)["next"]
+
+        self.assertSameContent(next_url, {})
+
+    def test_values_path_is_used(self):
+        with override_settings(PLANETARIUM_VALUES_LISTS=True):
+            with self.assertNumQueries(2) as context:
+                self.get_content(TICKET_URL, {})
+
+        # only the columns of the output are selected
+        columns = context.captured_queries[-1]["sql"].split(" FROM ")[0]
+        self.assertIn('"planetarium_astronomyshow"."title"', columns)
+        self.assertNotIn('"planetarium_ticket"."reservation_id"', columns)
+
+    def test_fieldsets_use_the_serializer(self):
+        with override_settings(PLANETARIUM_VALUES_LISTS=True):
+            content = self.get_content(SHOW_SESSION_URL, {"fields": "id"})
+
+        self.assertEqual(set(json.loads(content)["results"][0]), {"id"})
+
+    def test_nested_serializers_are_rejected(self):
+        for serializer_class in (
+            ShowSessionDetailSerializer,
+            TicketDetailSerializer,
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                ValuesSerializer(serializer_class)
+
+
+class BenchmarkValuesListsTest(TestCase):
+    def test_report_and_rollback(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_values_lists", items=5, iterations=3, stdout=out
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(
+            set(report["lists"]),
+            {"astronomy_shows", "show_sessions", "tickets"},
+        )
+        self.assertIn("speedup", report["lists"]["tickets"])
+        self.assertFalse(AstronomyShow.objects.exists())
@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.fieldsets import parse_paths
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket,
+)
+
+RESERVATION_URL = reverse("planetarium:reservation-list")
+TICKET_URL = reverse("planetarium:ticket-list")
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+
+
+class ParsePathsTest(TestCase):
+    def test_dotted_paths_become_a_tree(self):
+        self.assertEqual(
+            parse_paths("id, tickets.row,tickets.seat,,tickets."),
+            {"id": {}, "tickets": {"row": {}, "seat": {}}},
+        )
+        self.assertEqual(parse_paths(""), {})
+
+
+class FieldsetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(self.user)
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Description"
+        )
+        show.show_theme.add(ShowTheme.objects.create(name="Stars"))
+        self.show_session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=PlanetariumDome.objects.create(
+                name="Dome", rows=10, seats_in_row=10
+            ),
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+        for seat in range(1, 4):
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                show_session=self.show_session,
+                reservation=self.reservation,
+            )
+
+    def get(self, url, **params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_default_representation_is_unchanged(self):
+        reservation = self.get(RESERVATION_URL)["results"][0]
+
+        self.assertEqual(
+            set(reservation), {"id", "tickets", "created_at", "user"}
+        )
+        self.assertEqual(
+            reservation["tickets"][0]["show_session"], self.show_session.id
+        )
+
+    def test_sparse_nested_fields(self):
+        detail_url = reverse(
+            "planetarium:reservation-detail", args=[self.reservation.id]
+        )
+
+        reservation = self.get(detail_url, fields="id,tickets.seat")
+
+        self.assertEqual(set(reservation), {"id", "tickets"})
+        self.assertEqual(
+            sorted(ticket["seat"] for ticket in reservation["tickets"]),
+            [1, 2, 3],
+        )
+        self.assertEqual(set(reservation["tickets"][0]), {"seat"})
+
+    def test_expand(self):
+        ticket = self.get(
+            TICKET_URL,
+            fields="id,show_session.planetarium_dome",
+            expand="show_session.planetarium_dome",
+        )["results"][0]
+
+        self.assertEqual(
+            ticket["show_session"]["planetarium_dome"]["capacity"], 100
+        )
+        self.assertEqual(set(ticket["show_session"]), {"planetarium_dome"})
+
+        show_session = self.get(
+            SHOW_SESSION_URL, expand="astronomy_show.show_theme"
+        )["results"][0]
+        self.assertEqual(
+            show_session["astronomy_show"]["show_theme"][0]["name"], "Stars"
+        )
+
+    def test_unknown_names_are_ignored(self):
+        show_session = self.get(
+            SHOW_SESSION_URL, fields="id,nope", expand="nope,show_time"
+        )["results"][0]
+
+        self.assertEqual(show_session, {"id": self.show_session.id})
+
+    def test_writes_ignore_fieldsets(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.post(
+            f"{RESERVATION_URL}?fields=id",
+            {
+                "tickets": [
+                    {"row": 2, "seat": 1, "show_session": self.show_session.id}
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn("tickets", res.data)
+
+    def test_queries_follow_the_requested_fields(self):
+        with self.assertNumQueries(2):
+            self.get(RESERVATION_URL, fields="id,created_at")
+        # tickets are prefetched only when requested, joined with their
+        # sessions and shows only when these are expanded
+        with self.assertNumQueries(3) as context:
+            self.get(
+                RESERVATION_URL,
+                expand="tickets.show_session",
+                fields="id,tickets.show_session.astronomy_show",
+            )
+        tickets_sql = context.captured_queries[-1]["sql"]
+        self.assertIn('"planetarium_astronomyshow"', tickets_sql)
+        self.assertNotIn('"planetarium_planetariumdome"', tickets_sql)
@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.request import Request
+
+from planetarium.filters import ShowSessionFilter
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    ShowSession,
+    ShowTheme,
+)
+
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+
+
+class ShowSessionFilterTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.stars = ShowTheme.objects.create(name="Stars")
+        self.planets = ShowTheme.objects.create(name="Planets")
+        self.show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Embark on a cosmic adventure."
+        )
+        self.show.show_theme.add(self.stars, self.planets)
+        self.other_show = AstronomyShow.objects.create(
+            title="Stellar Phenomena", description="Wonders of stars."
+        )
+        self.other_show.show_theme.add(self.planets)
+        self.dome = PlanetariumDome.objects.create(
+            name="Dome", rows=1, seats_in_row=1
+        )
+        self.other_dome = PlanetariumDome.objects.create(
+            name="Other dome", rows=5, seats_in_row=5
+        )
+        self.now = timezone.now()
+        self.session = ShowSession.objects.create(
+            astronomy_show=self.show,
+            planetarium_dome=self.dome,
+            show_time=self.now + timedelta(days=1),
+        )
+        self.other_dome_session = ShowSession.objects.create(
+            astronomy_show=self.show,
+            planetarium_dome=self.other_dome,
+            show_time=self.now + timedelta(days=3),
+        )
+        self.other_show_session = ShowSession.objects.create(
+            astronomy_show=self.other_show,
+            planetarium_dome=self.dome,
+            show_time=self.now + timedelta(days=5),
+        )
+
+    def get_ids(self, params):
+        res = self.client.get(SHOW_SESSION_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {item["id"] for item in res.data["results"]}
+
+    def test_filters_are_combined(self):
+        ids = self.get_ids(
+            {
+                "astronomy_show": self.show.id,
+                "planetarium_dome": self.dome.id,
+            }
+        )
+
+        self.assertEqual(ids, {self.session.id})
+
+    def test_filter_by_theme_does_not_duplicate(self):
+        res = self.client.get(
+            SHOW_SESSION_URL,
+            {"show_theme": f"{self.stars.id},{self.planets.id}"},
+        )
+
+        self.assertEqual(res.data["count"], 3)
+        self.assertEqual(
+            self.get_ids({"show_theme": self.stars.id}),
+            {self.session.id, self.other_dome_session.id},
+        )
+
+    def test_filter_by_show_time(self):
+        ids = self.get_ids(
+            {
+                "show_time_after": (self.now + timedelta(days=2)).date(),
+                "show_time_before": (self.now + timedelta(days=4)).date(),
+            }
+        )
+
+        self.assertEqual(ids, {self.other_dome_session.id})
+
+    def test_filter_available(self):
+        ShowSession.objects.filter(id=self.session.id).update(tickets_sold=1)
+
+        ids = self.get_ids({"available": "true"})
+
+        self.assertEqual(
+            ids, {self.other_dome_session.id, self.other_show_session.id}
+        )
+
+    def test_invalid_values_rejected(self):
+        for params in (
+            {"astronomy_show": "one"},
+            {"show_time_after": "tomorrow"},
+        ):
+            res = self.client.get(SHOW_SESSION_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_show_time_range_uses_composite_index(self):
+        request = Request(
+            APIRequestFactory().get(
+                SHOW_SESSION_URL,
+                {
+                    "astronomy_show": self.show.id,
+                    "show_time_after": self.now.date(),
+                },
+            )
+        )
+
+        queryset = ShowSessionFilter().filter_queryset(
+            request, ShowSession.objects.all(), view=None
+        )
+        if connection.vendor == "postgresql":
+            # a handful of rows would otherwise always be a seq scan
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+        self.assertIn("showsession_show_time_idx", queryset.explain())
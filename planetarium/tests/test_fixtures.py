@@ -0,0 +1,186 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from planetarium.fixtures import iter_json_array
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket,
+)
+
+
+class IterJsonArrayTest(TestCase):
+    def test_items_split_across_chunks(self):
+        items = [
+            {"model": "a", "pk": i, "fields": {"s": "x]," * i}}
+            for i in range(20)
+        ]
+        stream = StringIO(json.dumps(items, indent=2))
+
+        self.assertEqual(list(iter_json_array(stream, chunk_size=7)), items)
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array(StringIO(" [ ] "))), [])
+
+    def test_truncated_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(StringIO('[{"a": 1}, {"b"'), chunk_size=4))
+
+    def test_not_an_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(StringIO('{"a": 1}')))
+
+
+class LoadDumpPlanetariumTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        theme = ShowTheme.objects.create(name="Stars")
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Description"
+        )
+        show.show_theme.add(theme)
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=5, seats_in_row=5
+        )
+        self.show_session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+        Reservation.objects.filter(id=self.reservation.id).update(
+            created_at=timezone.now().replace(microsecond=0)
+            - timedelta(days=3)
+        )
+        for seat in (1, 2):
+            Ticket.objects.create(
+                row=2,
+                seat=seat,
+                show_session=self.show_session,
+                reservation=self.reservation,
+            )
+        handle, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def dump(self):
+        call_command(
+            "dump_planetarium",
+            output=self.path,
+            batch_size=2,
+            stdout=StringIO(),
+        )
+
+    def load(self):
+        out = StringIO()
+        call_command("load_planetarium", self.path, batch_size=2, stdout=out)
+        return out.getvalue()
+
+    def test_round_trip(self):
+        created_at = Reservation.objects.get().created_at
+        self.dump()
+        with open(self.path) as fixture:
+            self.assertEqual(len(json.load(fixture)), 7)
+        for model in (ShowTheme, AstronomyShow, PlanetariumDome, Reservation):
+            model.objects.all().delete()
+
+        output = self.load()
+
+        self.assertIn("Loaded 7 rows", output)
+        show = AstronomyShow.objects.get()
+        self.assertEqual(
+            list(show.show_theme.values_list("name", flat=True)), ["Stars"]
+        )
+        self.assertEqual(Reservation.objects.get().created_at, created_at)
+        show_session = ShowSession.objects.get()
+        self.assertEqual(show_session.tickets_sold, 2)
+        seat_map = show_session.get_seat_map()
+        self.assertTrue(seat_map.is_taken(2, 1))
+        self.assertTrue(seat_map.is_taken(2, 2))
+        self.assertEqual(seat_map.taken_count(), 2)
+        # sequences continue after the loaded primary keys
+        self.assertGreater(ShowTheme.objects.create(name="New").id, 1)
+
+    def test_existing_rows_are_overwritten(self):
+        self.dump()
+        ShowTheme.objects.update(name="Renamed")
+
+        self.load()
+
+        self.assertEqual(ShowTheme.objects.get().name, "Stars")
+        self.assertEqual(Ticket.objects.count(), 2)
+        self.assertEqual(ShowSession.objects.get().tickets_sold, 2)
+
+    def test_other_models_are_skipped(self):
+        with open(self.path, "w") as fixture:
+            json.dump(
+                [
+                    {"model": "auth.permission", "pk": 1, "fields": {}},
+                    {
+                        "model": "planetarium.showtheme",
+                        "pk": 100,
+                        "fields": {"name": "Galaxies"},
+                    },
+                ],
+                fixture,
+            )
+
+        output = self.load()
+
+        self.assertIn("auth.permission: 1 objects skipped", output)
+        self.assertTrue(ShowTheme.objects.filter(pk=100).exists())
+
+    def test_missing_reference_rolls_back(self):
+        with open(self.path, "w") as fixture:
+            json.dump(
+                [
+                    {
+                        "model": "planetarium.showtheme",
+                        "pk": 100,
+                        "fields": {"name": "Galaxies"},
+                    },
+                    {
+                        "model": "planetarium.reservation",
+                        "pk": 100,
+                        "fields": {
+                            "created_at": "2023-12-11T14:29:18Z",
+                            "user": self.user.id + 1000,
+                        },
+                    },
+                ],
+                fixture,
+            )
+
+        with self.assertRaises(CommandError):
+            self.load()
+        self.assertFalse(ShowTheme.objects.filter(pk=100).exists())
+
+    def test_malformed_object(self):
+        with open(self.path, "w") as fixture:
+            json.dump(
+                [
+                    {
+                        "model": "planetarium.showtheme",
+                        "pk": "first",
+                        "fields": {"name": "Galaxies"},
+                    },
+                ],
+                fixture,
+            )
+
+        with self.assertRaisesMessage(CommandError, "Could not load"):
+            self.load()
+        self.assertFalse(ShowTheme.objects.filter(name="Galaxies").exists())
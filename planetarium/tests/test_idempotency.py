@@ -0,0 +1,215 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium import idempotency
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    Ticket,
+)
+from planetarium.views import ReservationViewSet
+
+RESERVATION_URL = reverse("planetarium:reservation-list")
+TICKET_URL = reverse("planetarium:ticket-list")
+
+
+class IdempotencyKeyTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@test.com", password="testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Description"
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=10, seats_in_row=10
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+
+    def reserve(self, key, seat=1, client=None):
+        return (client or self.client).post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": seat, "show_session": self.session.id}
+                ]
+            },
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_the_response(self):
+        res = self.reserve("key-1")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn(idempotency.REPLAYED_HEADER, res)
+
+        with self.assertNumQueries(0):
+            retry = self.reserve("key-1")
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, res.data)
+        self.assertEqual(retry[idempotency.REPLAYED_HEADER], "true")
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_ticket_create(self):
+        data = {"row": 2, "seat": 3, "show_session": self.session.id}
+
+        first = self.client.post(TICKET_URL, data, HTTP_IDEMPOTENCY_KEY="t")
+        retry = self.client.post(TICKET_URL, data, HTTP_IDEMPOTENCY_KEY="t")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_keys_are_per_user_and_key(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@test.com", password="testpass", is_staff=True
+        )
+        other_client = APIClient()
+        other_client.force_authenticate(other_user)
+        self.reserve("key-1")
+
+        res = self.reserve("key-1", client=other_client)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.reserve("key-2", seat=2)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.count(), 2)
+
+    def test_failed_requests_are_not_stored(self):
+        self.reserve("key-1")
+
+        res = self.reserve("key-2")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        Ticket.objects.all().delete()
+        res = self.reserve("key-2")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_key_reused_with_another_body(self):
+        self.reserve("key-1")
+
+        res = self.reserve("key-1", seat=2)
+
+        self.assertEqual(
+            res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_invalid_key(self):
+        res = self.reserve("k" * (idempotency.MAX_KEY_LENGTH + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_file_upload_rejected(self):
+        res = self.client.post(
+            TICKET_URL,
+            {
+                "row": 1,
+                "seat": 1,
+                "show_session": self.session.id,
+                "attachment": SimpleUploadedFile("seat.txt", b"1"),
+            },
+            format="multipart",
+            HTTP_IDEMPOTENCY_KEY="key-1",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(idempotency.HEADER, res.data)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_form_body(self):
+        data = {"row": 1, "seat": 1, "show_session": self.session.id}
+        res = self.client.post(
+            TICKET_URL, data, format="multipart", HTTP_IDEMPOTENCY_KEY="key-1"
+        )
+        retry = self.client.post(
+            TICKET_URL, data, format="multipart", HTTP_IDEMPOTENCY_KEY="key-1"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry[idempotency.REPLAYED_HEADER], "true")
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_per_process_cache_warns_on_deploy(self):
+        checks = run_checks(include_deployment_checks=True)
+        self.assertIn("planetarium.W001", [check.id for check in checks])
+
+    @override_settings(PLANETARIUM_IDEMPOTENCY_LOCK_SECONDS=0)
+    def test_concurrent_duplicate_is_rejected(self):
+        cache.add(self.lock_key("key-1"), True, 10)
+
+        res = self.reserve("key-1")
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_concurrent_duplicate_waits_for_the_lock(self):
+        lock_key = self.lock_key("key-1")
+        cache.add(lock_key, True, 10)
+
+        with mock.patch.object(
+            idempotency.time,
+            "sleep",
+            side_effect=lambda seconds: cache.delete(lock_key),
+        ) as sleep:
+            res = self.reserve("key-1")
+
+        sleep.assert_called_once()
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIsNone(cache.get(lock_key))
+
+    def test_lock_of_a_retry_is_not_released(self):
+        lock_key = self.lock_key("key-1")
+        perform_create = ReservationViewSet.perform_create
+
+        def take_over_the_lock(view, serializer):
+            # the lock expired and a retry took it meanwhile
+            cache.set(lock_key, "retry", 10)
+            perform_create(view, serializer)
+
+        with mock.patch.object(
+            ReservationViewSet,
+            "perform_create",
+            autospec=True,
+            side_effect=take_over_the_lock,
+        ):
+            res = self.reserve("key-1")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(cache.get(lock_key), "retry")
+
+    @override_settings(PLANETARIUM_IDEMPOTENCY_LOCK_TTL=123)
+    def test_lock_lives_for_the_lock_ttl(self):
+        with mock.patch.object(
+            idempotency.cache, "add", wraps=idempotency.cache.add
+        ) as add:
+            self.reserve("key-1")
+
+        self.assertEqual(add.call_args.args[2], 123)
+
+    def lock_key(self, key: str) -> str:
+        request = mock.Mock(path=RESERVATION_URL, user=self.user)
+        mixin = idempotency.IdempotencyMixin()
+        return f"{mixin.get_idempotency_key(request, key)}:lock"
@@ -0,0 +1,242 @@
+import base64
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    Ticket,
+)
+from planetarium.occupancy import SeatMap
+
+
+def seat_map_url(show_session_id):
+    return reverse("planetarium:showsession-seat-map", args=[show_session_id])
+
+
+class SeatMapTest(TestCase):
+    def test_occupy_and_release(self):
+        seat_map = SeatMap(rows=3, seats_in_row=5)
+        seat_map.occupy(1, 1)
+        seat_map.occupy(3, 5)
+        self.assertTrue(seat_map.is_taken(1, 1))
+        self.assertTrue(seat_map.is_taken(3, 5))
+        self.assertFalse(seat_map.is_taken(2, 3))
+        self.assertEqual(seat_map.taken_count(), 2)
+        self.assertEqual(len(seat_map.to_bytes()), 2)
+
+        seat_map.release(1, 1)
+        self.assertFalse(seat_map.is_taken(1, 1))
+        self.assertEqual(seat_map.taken_count(), 1)
+
+
+class ShowSessionSeatMapTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Embark on a cosmic adventure."
+        )
+        self.dome = PlanetariumDome.objects.create(
+            name="Dome", rows=4, seats_in_row=6
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=self.dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+
+    def seat_map(self):
+        self.session.refresh_from_db()
+        return self.session.get_seat_map()
+
+    def test_ticket_create_and_delete_update_seat_map(self):
+        ticket = Ticket.objects.create(
+            row=2, seat=3, show_session=self.session,
+            reservation=self.reservation,
+        )
+        self.assertTrue(self.seat_map().is_taken(2, 3))
+
+        ticket.delete()
+        self.assertEqual(self.seat_map().taken_count(), 0)
+
+    def test_ticket_move_updates_seat_map(self):
+        ticket = Ticket.objects.create(
+            row=2, seat=3, show_session=self.session,
+            reservation=self.reservation,
+        )
+        ticket.seat = 4
+        ticket.save()
+
+        seat_map = self.seat_map()
+        self.assertFalse(seat_map.is_taken(2, 3))
+        self.assertTrue(seat_map.is_taken(2, 4))
+
+    def test_dome_resize_rebuilds_seat_map(self):
+        Ticket.objects.create(
+            row=2, seat=3, show_session=self.session,
+            reservation=self.reservation,
+        )
+        self.dome.seats_in_row = 10
+        self.dome.save()
+
+        seat_map = self.seat_map()
+        self.assertEqual(seat_map.seats_in_row, 10)
+        self.assertTrue(seat_map.is_taken(2, 3))
+
+    def test_migration_builds_the_same_seat_map(self):
+        migration = import_module(
+            "planetarium.migrations.0002_showsession_seat_map"
+        )
+        for row, seat in ((1, 1), (2, 3), (4, 6)):
+            Ticket.objects.create(
+                row=row, seat=seat, show_session=self.session,
+                reservation=self.reservation,
+            )
+        expected = self.seat_map().to_bytes()
+        ShowSession.objects.update(seat_map=b"")
+
+        migration.build_seat_maps(apps, None)
+
+        self.assertEqual(self.seat_map().to_bytes(), expected)
+        self.assertEqual(SeatMap.build(self.session).to_bytes(), expected)
+
+    def test_seat_map_endpoint(self):
+        Ticket.objects.create(
+            row=1, seat=1, show_session=self.session,
+            reservation=self.reservation,
+        )
+        Ticket.objects.create(
+            row=4, seat=6, show_session=self.session,
+            reservation=self.reservation,
+        )
+
+        with self.assertNumQueries(1):
+            res = self.client.get(seat_map_url(self.session.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["rows"], 4)
+        self.assertEqual(res.data["seats_in_row"], 6)
+        self.assertEqual(res.data["taken"], 2)
+        bits = base64.b64decode(res.data["bits"])
+        self.assertEqual(bits, bytes([0b10000000, 0, 0b00000001]))
+
+    def test_seat_map_stays_out_of_write_responses(self):
+        admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="testpass"
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.client.post(
+            reverse("planetarium:showsession-list"),
+            {
+                "astronomy_show": self.session.astronomy_show_id,
+                "planetarium_dome": self.dome.id,
+                "show_time": self.session.show_time.isoformat(),
+            },
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            set(res.data),
+            {"id", "astronomy_show", "planetarium_dome", "show_time"},
+        )
+
+        res = self.client.post(
+            reverse("planetarium:showtheme-list"), {"name": "Stars"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(res.data), {"id", "name"})
+
+
+class TicketsSoldCounterTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Embark on a cosmic adventure."
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=4, seats_in_row=6
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        self.reservation = Reservation.objects.create(user=user)
+        for seat in range(1, 4):
+            Ticket.objects.create(
+                row=1, seat=seat, show_session=self.session,
+                reservation=self.reservation,
+            )
+
+    def test_counter_follows_ticket_changes(self):
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 3)
+        self.assertEqual(self.session.tickets_left, 21)
+
+        Ticket.objects.filter(seat__lte=2).delete()
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 1)
+
+    def test_list_reports_tickets_left(self):
+        res = self.client.get(reverse("planetarium:showsession-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["tickets_left"], 21)
+
+    def test_reconcile_command_fixes_drift(self):
+        ShowSession.objects.filter(id=self.session.id).update(
+            tickets_sold=10, seat_map=b""
+        )
+
+        call_command("reconcile_occupancy", stdout=StringIO())
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 3)
+        self.assertEqual(self.session.get_seat_map().taken_count(), 3)
+
+    def test_reconcile_ignores_tickets_outside_the_dome(self):
+        # a legacy ticket from before the dome was resized
+        Ticket.objects.bulk_create(
+            [
+                Ticket(
+                    row=9, seat=9, show_session=self.session,
+                    reservation=self.reservation,
+                )
+            ]
+        )
+        call_command("reconcile_occupancy", stdout=StringIO())
+
+        out = StringIO()
+        call_command("reconcile_occupancy", stdout=out)
+
+        self.assertIn("0 drifted session(s) found.", out.getvalue())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 4)
+        self.assertEqual(self.session.get_seat_map().taken_count(), 3)
+
+    def test_counter_does_not_go_negative(self):
+        ShowSession.objects.filter(id=self.session.id).update(tickets_sold=1)
+
+        Ticket.objects.filter(seat__lte=2).delete()
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 0)
@@ -0,0 +1,127 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    Ticket,
+)
+
+SHOW_SESSION_URL = reverse("planetarium:showsession-list")
+TICKET_URL = reverse("planetarium:ticket-list")
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Embark on a cosmic adventure."
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=4, seats_in_row=6
+        )
+        show_time = timezone.now() + timedelta(days=1)
+        for i in range(25):
+            ShowSession.objects.create(
+                astronomy_show=show,
+                planetarium_dome=dome,
+                # pairs of sessions share a show_time to exercise the
+                # id tiebreaker
+                show_time=show_time + timedelta(hours=i // 2),
+            )
+        self.expected = list(
+            ShowSession.objects.order_by("-show_time", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_page_number_mode_is_default(self):
+        res = self.client.get(SHOW_SESSION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 25)
+
+    def test_cursor_walks_all_pages_forward_and_back(self):
+        pages = []
+        url = SHOW_SESSION_URL + "?cursor="
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", res.data)
+            pages.append([item["id"] for item in res.data["results"]])
+            url = res.data["next"]
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(sum(pages, []), self.expected)
+
+        res = self.client.get(res.data["previous"])
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], pages[1]
+        )
+        res = self.client.get(res.data["previous"])
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], pages[0]
+        )
+        self.assertIsNone(res.data["previous"])
+
+    def test_invalid_cursor(self):
+        res = self.client.get(SHOW_SESSION_URL + "?cursor=garbage")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_position(self):
+        for position in (["garbage", 1], [["2030-01-01"], 1], [None, 1]):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps({"p": position}).encode()
+            ).decode()
+
+            res = self.client.get(SHOW_SESSION_URL, {"cursor": cursor})
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(res.data["detail"], "Invalid cursor")
+
+    def test_ticket_cursor_follows_reservations(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(user)
+        show_session = ShowSession.objects.first()
+        for row in range(1, 5):
+            # several tickets per reservation to exercise the tiebreaker
+            reservation = Reservation.objects.create(user=user)
+            for seat in range(1, 4):
+                Ticket.objects.create(
+                    row=row,
+                    seat=seat,
+                    show_session=show_session,
+                    reservation=reservation,
+                )
+        expected = list(
+            Ticket.objects.order_by("-reservation_id", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+        ids = []
+        url = TICKET_URL + "?cursor=&page_size=5"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [item["id"] for item in res.data["results"]]
+            url = res.data["next"]
+
+        self.assertEqual(ids, expected)
+        res = self.client.get(TICKET_URL, {"page_size": 20})
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], expected
+        )
@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+    ShowTheme,
+    Ticket,
+)
+from planetarium.tests.utils import QueryBudgetMixin
+
+
+class PlanetariumQueryBudgetTest(QueryBudgetMixin, TestCase):
+    query_budgets = {
+        # + 1 aggregate query for the ETag on conditional GET views
+        "showtheme-list": 3,
+        "astronomyshow-list": 4,
+        "astronomyshow-detail": 3,
+        "planetariumdome-list": 3,
+        "showsession-list": 3,
+        "showsession-detail": 4,
+        "showsession-seat-map": 1,
+        "ticket-list": 2,
+        "ticket-detail": 1,
+        "reservation-list": 3,
+        "reservation-detail": 2,
+        "schedule-list": 2,
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(self.user)
+        themes = [ShowTheme.objects.create(name=f"Theme {i}") for i in range(3)]
+        for i in range(3):
+            show = AstronomyShow.objects.create(
+                title=f"Show {i}", description="Description"
+            )
+            show.show_theme.set(themes)
+            dome = PlanetariumDome.objects.create(
+                name=f"Dome {i}", rows=10, seats_in_row=10
+            )
+            show_session = ShowSession.objects.create(
+                astronomy_show=show,
+                planetarium_dome=dome,
+                show_time=timezone.now() + timedelta(days=i + 1),
+            )
+            reservation = Reservation.objects.create(user=self.user)
+            for seat in range(1, 4):
+                Ticket.objects.create(
+                    row=1,
+                    seat=seat,
+                    show_session=show_session,
+                    reservation=reservation,
+                )
+        self.show = show
+        self.show_session = show_session
+        self.reservation = reservation
+        self.ticket = Ticket.objects.filter(reservation=reservation).first()
+
+    def test_catalog(self):
+        self.request_within_budget("get", reverse("planetarium:showtheme-list"))
+        self.request_within_budget(
+            "get", reverse("planetarium:astronomyshow-list")
+        )
+        self.request_within_budget(
+            "get",
+            reverse("planetarium:astronomyshow-detail", args=[self.show.id]),
+        )
+        self.request_within_budget(
+            "get", reverse("planetarium:planetariumdome-list")
+        )
+
+    def test_show_sessions(self):
+        self.request_within_budget(
+            "get", reverse("planetarium:showsession-list")
+        )
+        self.request_within_budget(
+            "get",
+            reverse(
+                "planetarium:showsession-detail", args=[self.show_session.id]
+            ),
+        )
+        self.request_within_budget(
+            "get",
+            reverse(
+                "planetarium:showsession-seat-map",
+                args=[self.show_session.id],
+            ),
+        )
+
+    def test_schedule(self):
+        self.request_within_budget("get", reverse("planetarium:schedule-list"))
+
+    def test_tickets(self):
+        self.request_within_budget("get", reverse("planetarium:ticket-list"))
+        self.request_within_budget(
+            "get", reverse("planetarium:ticket-detail", args=[self.ticket.id])
+        )
+
+    def test_reservations(self):
+        self.request_within_budget(
+            "get", reverse("planetarium:reservation-list")
+        )
+        self.request_within_budget(
+            "get",
+            reverse(
+                "planetarium:reservation-detail", args=[self.reservation.id]
+            ),
+        )
+
+
+class QueryBudgetMixinTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        for i in range(3):
+            ShowSession.objects.create(
+                astronomy_show=AstronomyShow.objects.create(
+                    title=f"Show {i}", description="Description"
+                ),
+                planetarium_dome=None,
+                show_time=timezone.now(),
+            )
+
+    def test_repeated_query_shapes_are_reported(self):
+        with self.record_queries("lazy loads") as record:
+            for show_session in ShowSession.objects.all():
+                str(show_session)
+
+        with self.assertRaisesRegex(AssertionError, "N\\+1"):
+            self.assertQueryBudget(record, budget=100)
+
+    def test_budget_is_enforced(self):
+        with self.record_queries("two queries") as record:
+            list(ShowSession.objects.all())
+            list(AstronomyShow.objects.all())
+
+        self.assertQueryBudget(record, budget=2)
+        with self.assertRaisesRegex(AssertionError, "budget is 1"):
+            self.assertQueryBudget(record, budget=1)
@@ -0,0 +1,145 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium import cache as catalog_cache
+from planetarium import replicas
+from planetarium.models import ShowTheme
+
+SHOW_THEME_URL = reverse("planetarium:showtheme-list")
+
+
+@override_settings(PLANETARIUM_READ_REPLICAS=["replica"])
+class ReplicaRoutingTest(TestCase):
+    """``default`` plus a ``replica`` alias on a separate SQLite file"""
+
+    def setUp(self):
+        cache.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.add_replica(os.path.join(self.tmp.name, "replica.sqlite3"))
+        with connections["replica"].schema_editor() as editor:
+            editor.create_model(ShowTheme)
+        ShowTheme.objects.using("replica").create(name="On replica")
+        ShowTheme.objects.create(name="On primary")
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@test.com", password="testpass", is_staff=True
+        )
+        self.requests = 0
+
+    def tearDown(self):
+        self.remove_replica()
+        self.tmp.cleanup()
+        replicas._unhealthy.clear()
+
+    def add_replica(self, name: str):
+        self.remove_replica()
+        connections.settings["replica"] = connections.configure_settings(
+            {
+                "default": {},
+                "replica": {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": name,
+                },
+            }
+        )["replica"]
+
+    def remove_replica(self):
+        if "replica" in connections.settings:
+            connections["replica"].close()
+            del connections["replica"]
+            del connections.settings["replica"]
+
+    def theme_names(self, client=None) -> list[str]:
+        # a fresh URL each time, so the catalog cache never answers
+        self.requests += 1
+        res = (client or self.client).get(
+            SHOW_THEME_URL, {"n": self.requests}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [theme["name"] for theme in res.data]
+
+    def test_safe_requests_read_the_replica(self):
+        self.assertEqual(self.theme_names(), ["On replica"])
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.post(SHOW_THEME_URL, {"name": "New"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.theme_names(), ["New", "On primary"])
+        # other users keep reading the replica
+        self.assertEqual(self.theme_names(APIClient()), ["On replica"])
+
+        cache.delete(replicas._pin_key(self.user.pk))
+        self.assertEqual(self.theme_names(), ["On replica"])
+
+    def test_failed_writes_do_not_pin(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.post(SHOW_THEME_URL, {"name": ""})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.theme_names(), ["On replica"])
+
+    def test_unreachable_replica_fails_over(self):
+        self.add_replica(os.path.join(self.tmp.name, "missing", "db"))
+
+        self.assertEqual(self.theme_names(), ["On primary"])
+        self.assertFalse(replicas.is_healthy("replica"))
+
+    def test_failing_query_is_retried_on_the_primary(self):
+        with connections["replica"].schema_editor() as editor:
+            editor.delete_model(ShowTheme)
+
+        self.assertEqual(self.theme_names(), ["On primary"])
+        # skipped until the retry delay has passed
+        self.assertIsNone(replicas.choose_replica())
+        replicas._unhealthy.clear()
+        self.assertEqual(replicas.choose_replica(), "replica")
+
+    def test_replicas_are_not_migrated(self):
+        router = replicas.ReplicaRouter()
+
+        self.assertIs(router.allow_migrate("replica", "planetarium"), False)
+        self.assertIsNone(router.allow_migrate("default", "planetarium"))
+
+    def test_replica_reads_are_not_cached(self):
+        for _ in range(2):
+            res = self.client.get(SHOW_THEME_URL)
+            self.assertEqual(res["X-Cache"], "MISS")
+            self.assertEqual(res.data[0]["name"], "On replica")
+        self.assertEqual(catalog_cache.get_stats()["hit"], 0)
+
+        # primary reads fill the cache as before
+        self.client.force_authenticate(self.user)
+        replicas.pin_to_primary(self.user.pk)
+        for expected in ("MISS", "HIT"):
+            res = self.client.get(SHOW_THEME_URL)
+            self.assertEqual(res["X-Cache"], expected)
+            self.assertEqual(res.data[0]["name"], "On primary")
+
+    def test_per_process_cache_is_an_error(self):
+        errors = [error.id for error in run_checks()]
+        self.assertIn("planetarium.E001", errors)
+
+        with override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                    "LOCATION": "redis://cache:6379/0",
+                }
+            }
+        ):
+            errors = [error.id for error in run_checks()]
+        self.assertNotIn("planetarium.E001", errors)
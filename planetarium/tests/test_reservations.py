@@ -0,0 +1,351 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from planetarium.holds import create_hold
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    SeatHold,
+    ShowSession,
+    Ticket,
+)
+
+RESERVATION_URL = reverse("planetarium:reservation-list")
+TICKET_URL = reverse("planetarium:ticket-list")
+
+
+class ReservationCreateTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Embark on a cosmic adventure."
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=10, seats_in_row=10
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+
+    def tickets(self, count, row=1):
+        return [
+            {
+                "row": row + i // 10,
+                "seat": i % 10 + 1,
+                "show_session": self.session.id,
+            }
+            for i in range(count)
+        ]
+
+    def reserve(self, tickets):
+        return self.client.post(
+            RESERVATION_URL, {"tickets": tickets}, format="json"
+        )
+
+    def test_create_reservation(self):
+        res = self.reserve(self.tickets(3))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        reservation = Reservation.objects.get(id=res.data["id"])
+        self.assertEqual(reservation.user, self.user)
+        self.assertEqual(reservation.tickets.count(), 3)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.get_seat_map().taken_count(), 3)
+
+    def test_query_count_does_not_depend_on_ticket_count(self):
+        with CaptureQueriesContext(connection) as single:
+            res = self.reserve(self.tickets(1, row=1))
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connection) as group:
+            res = self.reserve(self.tickets(40, row=2))
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(len(single), len(group))
+
+    def test_taken_seat_rejected(self):
+        self.reserve(self.tickets(1))
+
+        res = self.reserve(self.tickets(2))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"][0]["non_field_errors"][0],
+            "This seat is already taken.",
+        )
+        self.assertEqual(res.data["tickets"][1], {})
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_duplicate_seat_in_request_rejected(self):
+        res = self.reserve(self.tickets(1) * 2)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"][1]["non_field_errors"][0],
+            "This seat is already taken.",
+        )
+
+    def test_incorrect_seat_rejected(self):
+        tickets = self.tickets(1)
+        tickets[0]["seat"] = 11
+
+        res = self.reserve(tickets)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"][0]["non_field_errors"][0],
+            "Incorrect seat number.",
+        )
+
+    def test_unknown_session_rejected(self):
+        tickets = self.tickets(1)
+        tickets[0]["show_session"] = self.session.id + 100
+
+        res = self.reserve(tickets)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("show_session", res.data["tickets"][0])
+
+
+def holds_url(show_session_id):
+    return reverse("planetarium:showsession-holds", args=[show_session_id])
+
+
+class SeatHoldTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass", is_staff=True
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="other@test.com", password="testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Embark on a cosmic adventure."
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=10, seats_in_row=10
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+
+    def hold(self, seats, **extra):
+        return self.client.post(
+            holds_url(self.session.id),
+            {
+                "seats": [{"row": row, "seat": seat} for row, seat in seats],
+                **extra,
+            },
+            format="json",
+        )
+
+    def test_hold_and_convert(self):
+        res = self.hold([(1, 1), (1, 2)], minutes=5)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["seats"]), 2)
+
+        res = self.client.post(
+            RESERVATION_URL, {"hold": res.data["id"]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            {(ticket["row"], ticket["seat"]) for ticket in res.data["tickets"]},
+            {(1, 1), (1, 2)},
+        )
+        self.assertFalse(SeatHold.objects.exists())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 2)
+
+    def test_held_seat_is_taken_for_others(self):
+        self.hold([(1, 1)])
+        self.client.force_authenticate(self.other_user)
+
+        res = self.hold([(1, 1)])
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "show_session": self.session.id}
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"][0]["non_field_errors"][0],
+            "This seat is already taken.",
+        )
+
+    def test_expired_hold_is_swept(self):
+        hold_id = self.hold([(1, 1)]).data["id"]
+        SeatHold.objects.update(expires_at=timezone.now())
+
+        res = self.client.post(
+            RESERVATION_URL, {"hold": hold_id}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.other_user)
+        res = self.hold([(1, 1)])
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.count(), 1)
+
+    def test_cannot_convert_foreign_hold(self):
+        hold_id = self.hold([(1, 1)]).data["id"]
+        self.client.force_authenticate(self.other_user)
+
+        res = self.client.post(
+            RESERVATION_URL, {"hold": hold_id}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 0)
+
+    def test_hold_rejects_sold_seat(self):
+        self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 2, "seat": 3, "show_session": self.session.id}
+                ]
+            },
+            format="json",
+        )
+
+        res = self.hold([(2, 3)])
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ticket_create_respects_holds(self):
+        self.hold([(1, 1)])
+        self.client.force_authenticate(self.other_user)
+
+        res = self.client.post(
+            TICKET_URL,
+            {"row": 1, "seat": 1, "show_session": self.session.id},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], "This seat is already taken.")
+        self.assertFalse(Ticket.objects.exists())
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_ticket_create_books_seat(self):
+        res = self.client.post(
+            TICKET_URL,
+            {"row": 1, "seat": 1, "show_session": self.session.id},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 1)
+        self.assertTrue(self.session.get_seat_map().is_taken(1, 1))
+
+    def test_convert_hold_of_sold_seat_rejected(self):
+        hold_id = self.hold([(1, 1)]).data["id"]
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            show_session=self.session,
+            reservation=Reservation.objects.create(user=self.other_user),
+        )
+
+        res = self.client.post(
+            RESERVATION_URL, {"hold": hold_id}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], "This seat is already taken.")
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    @override_settings(PLANETARIUM_SEAT_HOLD_MAX_SEATS=3)
+    def test_held_seats_per_user_are_capped(self):
+        self.assertEqual(
+            self.hold([(1, 1), (1, 2)]).status_code, status.HTTP_201_CREATED
+        )
+
+        res = self.hold([(2, 1), (2, 2)])
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data[0], "At most 3 seats of a session can be held."
+        )
+
+        self.client.force_authenticate(self.other_user)
+        res = self.hold([(2, 1), (2, 2)])
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_deleted_session_is_rejected_under_the_lock(self):
+        session_id = self.session.id
+        self.session.delete()
+
+        with self.assertRaises(ValidationError) as context:
+            create_hold(self.user.id, session_id, [{"row": 1, "seat": 1}], 5)
+
+        self.assertIn("show_session", context.exception.detail)
+
+
+class LoadtestReservationsTest(TransactionTestCase):
+    def test_report(self):
+        out = StringIO()
+        rates = settings.PLANETARIUM_THROTTLE_RATES
+
+        with mock.patch.object(
+            connections, "close_all", wraps=connections.close_all
+        ) as close_all:
+            call_command(
+                "loadtest_reservations",
+                requests=12,
+                workers=2,
+                users=3,
+                sessions=1,
+                rows=2,
+                seats_in_row=4,
+                seed=1,
+                stdout=out,
+            )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["requests"], 12)
+        self.assertEqual(
+            report["successes"] + report["conflicts"] + report["errors"], 12
+        )
+        self.assertGreater(report["successes"], 0)
+        if connection.vendor == "postgresql":
+            # SQLite may refuse concurrent writers with "table is locked"
+            self.assertEqual(report["errors"], 0)
+        self.assertIn("p99", report["latency_ms"])
+        self.assertEqual(close_all.call_count, 2)
+        self.assertIs(settings.PLANETARIUM_THROTTLE_RATES, rates)
+        # the seeded data is removed afterwards
+        self.assertFalse(ShowSession.objects.exists())
+        self.assertFalse(get_user_model().objects.exists())
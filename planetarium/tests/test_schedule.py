@@ -0,0 +1,193 @@
+from datetime import date, datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium import schedule, signals
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    ScheduleDay,
+    ShowSession,
+)
+
+SCHEDULE_URL = reverse("planetarium:schedule-list")
+RESERVATION_URL = reverse("planetarium:reservation-list")
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class ScheduleTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Description"
+        )
+        self.dome = PlanetariumDome.objects.create(
+            name="Dome", rows=5, seats_in_row=5
+        )
+        self.other_dome = PlanetariumDome.objects.create(
+            name="Other Dome", rows=2, seats_in_row=5
+        )
+        # 01:30 on the 2nd in Europe/Kiev
+        self.late = ShowSession.objects.create(
+            astronomy_show=self.show,
+            planetarium_dome=self.dome,
+            show_time=utc(2030, 1, 1, 23, 30),
+        )
+        self.early = ShowSession.objects.create(
+            astronomy_show=self.show,
+            planetarium_dome=self.dome,
+            show_time=utc(2030, 1, 1, 10),
+        )
+
+    def get_schedule(self, **params):
+        params.setdefault("from", "2030-01-01")
+        params.setdefault("to", "2030-01-07")
+        res = self.client.get(SCHEDULE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_sessions_grouped_by_local_day_and_dome(self):
+        ShowSession.objects.create(
+            astronomy_show=self.show,
+            planetarium_dome=self.other_dome,
+            show_time=utc(2030, 1, 2, 12),
+        )
+
+        days = self.get_schedule()
+
+        self.assertEqual(
+            [day["day"] for day in days], [date(2030, 1, 1), date(2030, 1, 2)]
+        )
+        first, second = days
+        self.assertEqual(
+            [session["id"] for session in first["domes"][0]["sessions"]],
+            [self.early.id],
+        )
+        self.assertEqual(
+            [dome["planetarium_dome"]["name"] for dome in second["domes"]],
+            ["Dome", "Other Dome"],
+        )
+        self.assertEqual(second["domes"][0]["seats_left"], 25)
+        self.assertEqual(second["domes"][1]["seats_left"], 10)
+        session = second["domes"][0]["sessions"][0]
+        self.assertEqual(session["id"], self.late.id)
+        self.assertEqual(session["astronomy_show"], "Cosmic Voyage")
+        self.assertEqual(session["tickets_left"], 25)
+
+    def test_range_is_inclusive(self):
+        days = self.get_schedule(**{"from": "2030-01-02", "to": "2030-01-02"})
+
+        self.assertEqual([day["day"] for day in days], [date(2030, 1, 2)])
+
+    def test_reservation_updates_seats_left(self):
+        user = get_user_model().objects.create_user(
+            email="staff@test.com", password="testpass", is_staff=True
+        )
+        self.client.force_authenticate(user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                RESERVATION_URL,
+                {
+                    "tickets": [
+                        {"row": 1, "seat": seat, "show_session": self.late.id}
+                        for seat in (1, 2)
+                    ]
+                },
+                format="json",
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        cell = ScheduleDay.objects.get(day=date(2030, 1, 2))
+        self.assertEqual(cell.seats_left, 23)
+        self.assertEqual(cell.sessions[0]["tickets_left"], 23)
+
+    def reserve_late_seat(self):
+        user = get_user_model().objects.create_user(
+            email="staff@test.com", password="testpass", is_staff=True
+        )
+        self.client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                RESERVATION_URL,
+                {
+                    "tickets": [
+                        {"row": 1, "seat": 1, "show_session": self.late.id}
+                    ]
+                },
+                format="json",
+            )
+
+    def test_booking_does_not_rebuild_the_day(self):
+        with mock.patch.object(
+            schedule, "rebuild_day", wraps=schedule.rebuild_day
+        ) as rebuild_day:
+            res = self.reserve_late_seat()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        rebuild_day.assert_not_called()
+        cell = ScheduleDay.objects.get(day=date(2030, 1, 2))
+        self.assertEqual(cell.seats_left, 24)
+
+    def test_failed_refresh_does_not_fail_booking(self):
+        with mock.patch.object(
+            signals,
+            "refresh_session_seats",
+            side_effect=RuntimeError("rollup is down"),
+        ), self.assertLogs("django.test", "ERROR"):
+            res = self.reserve_late_seat()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            ScheduleDay.objects.get(day=date(2030, 1, 2)).seats_left, 25
+        )
+
+    def test_moved_session_leaves_its_old_day(self):
+        self.late.show_time = utc(2030, 1, 3, 12)
+        self.late.planetarium_dome = self.other_dome
+        self.late.save()
+
+        self.assertFalse(
+            ScheduleDay.objects.filter(day=date(2030, 1, 2)).exists()
+        )
+        cell = ScheduleDay.objects.get(day=date(2030, 1, 3))
+        self.assertEqual(cell.planetarium_dome, self.other_dome)
+        self.assertEqual(cell.seats_left, 10)
+
+    def test_deleted_session_and_resized_dome(self):
+        self.early.delete()
+        self.dome.rows = 10
+        self.dome.save()
+
+        self.assertEqual(
+            list(ScheduleDay.objects.values_list("day", "seats_left")),
+            [(date(2030, 1, 2), 50)],
+        )
+
+    def test_invalid_range(self):
+        for params in (
+            {"from": "tomorrow"},
+            {"from": "2030-01-07", "to": "2030-01-01"},
+            {"from": "2030-01-01", "to": "2030-06-01"},
+        ):
+            res = self.client.get(SCHEDULE_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_schedule_command(self):
+        ScheduleDay.objects.all().delete()
+        out = StringIO()
+
+        call_command("rebuild_schedule", stdout=out)
+
+        self.assertIn("2 schedule day(s) rebuilt", out.getvalue())
+        self.assertEqual(len(self.get_schedule()), 2)
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+import yaml
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from planetarium import schema
+
+SCHEMA_URL = reverse("schema")
+
+
+class CachedSchemaTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.schema_file = os.path.join(self.tmp.name, "schema.json")
+        settings_override = override_settings(
+            PLANETARIUM_SCHEMA_FILE=self.schema_file,
+            PLANETARIUM_CODE_VERSION="v1",
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(self.reset)
+        self.reset()
+
+    def reset(self):
+        schema._schemas.clear()
+        schema._rendered.clear()
+        schema.code_version.cache_clear()
+
+    def get_schema(self, **extra):
+        res = self.client.get(SCHEMA_URL, **extra)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res
+
+    def test_schema_is_generated_once(self):
+        with mock.patch.object(
+            schema, "generate_schema", wraps=schema.generate_schema
+        ) as generate_schema:
+            first = self.get_schema()
+            second = self.get_schema()
+            as_json = self.get_schema(HTTP_ACCEPT="application/json")
+
+        generate_schema.assert_called_once()
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(
+            json.loads(as_json.content), yaml.safe_load(first.content)
+        )
+        self.assertNotEqual(as_json["ETag"], first["ETag"])
+        paths = json.loads(as_json.content)["paths"]
+        self.assertIn("/api/planetarium/reservations/", paths)
+
+    def test_not_modified(self):
+        etag = self.get_schema()["ETag"]
+
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_code_version_invalidates(self):
+        etag = self.get_schema()["ETag"]
+
+        with override_settings(PLANETARIUM_CODE_VERSION="v2"):
+            self.reset()
+            res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_built_schema_is_served(self):
+        out = StringIO()
+        call_command("build_schema", stdout=out)
+        self.assertIn("code version v1", out.getvalue())
+        with open(self.schema_file) as built:
+            expected = json.load(built)["schema"]
+
+        with mock.patch.object(schema, "generate_schema") as generate_schema:
+            res = self.get_schema(HTTP_ACCEPT="application/json")
+
+        generate_schema.assert_not_called()
+        self.assertEqual(json.loads(res.content), expected)
+
+    def test_stale_built_schema_is_ignored(self):
+        call_command("build_schema", stdout=StringIO())
+
+        with override_settings(PLANETARIUM_CODE_VERSION="v2"):
+            self.reset()
+            self.assertIsNone(schema.read_schema(self.schema_file))
+            with mock.patch.object(
+                schema, "generate_schema", return_value={"openapi": "3.0.3"}
+            ) as generate_schema:
+                res = self.get_schema(HTTP_ACCEPT="application/json")
+
+        generate_schema.assert_called_once()
+        self.assertEqual(json.loads(res.content), {"openapi": "3.0.3"})
+
+    def test_source_hash_is_the_default_code_version(self):
+        with override_settings(PLANETARIUM_CODE_VERSION=""):
+            self.reset()
+            version = schema.code_version()
+
+        self.assertRegex(version, r"^[0-9a-f]{32}$")
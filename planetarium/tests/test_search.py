@@ -0,0 +1,137 @@
+import json
+from io import StringIO
+from unittest import skipIf
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium.models import AstronomyShow, ShowTheme
+
+ASTRONOMY_SHOW_URL = reverse("planetarium:astronomyshow-list")
+ASYNC_ASTRONOMY_SHOW_URL = reverse("planetarium:async-astronomyshow-list")
+
+
+class AstronomyShowSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.in_title = AstronomyShow.objects.create(
+            title="Black Holes", description="Where light cannot escape."
+        )
+        self.in_theme = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="A trip across the sky."
+        )
+        self.in_theme.show_theme.add(ShowTheme.objects.create(name="Holes"))
+        self.in_description = AstronomyShow.objects.create(
+            title="Stars", description="Stars collapse into black holes."
+        )
+        AstronomyShow.objects.create(
+            title="Planets", description="Rocky worlds."
+        )
+
+    def search(self, q, url=ASTRONOMY_SHOW_URL):
+        res = self.client.get(url, {"q": q})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [show["id"] for show in json.loads(res.content)["results"]]
+
+    def test_ranked_by_title_theme_description(self):
+        self.assertEqual(
+            self.search("holes"),
+            [self.in_title.id, self.in_theme.id, self.in_description.id],
+        )
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(
+            self.search("black holes"),
+            [self.in_title.id, self.in_description.id],
+        )
+
+    def test_no_match(self):
+        self.assertEqual(self.search("quasar"), [])
+
+    def test_blank_query_lists_everything(self):
+        self.assertEqual(len(self.search(" ")), 4)
+
+    def test_results_are_paginated(self):
+        res = self.client.get(
+            ASTRONOMY_SHOW_URL, {"q": "holes", "page_size": 2}
+        )
+
+        self.assertEqual(res.data["count"], 3)
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertIsNotNone(res.data["next"])
+
+    def test_async_list(self):
+        self.assertEqual(
+            self.search("holes", url=ASYNC_ASTRONOMY_SHOW_URL),
+            self.search("holes"),
+        )
+
+    @skipIf(
+        connection.vendor not in ("postgresql", "sqlite"),
+        "Searched without an index",
+    )
+    def test_search_vector_follows_theme_changes(self):
+        theme = self.in_theme.show_theme.get()
+        theme.name = "Wormholes"
+        theme.save()
+        cache.clear()
+
+        self.assertEqual(self.search("wormholes"), [self.in_theme.id])
+        theme.delete()
+        cache.clear()
+        self.assertEqual(self.search("wormholes"), [])
+
+    def test_deleted_show_is_not_found(self):
+        self.in_title.delete()
+        cache.clear()
+
+        self.assertEqual(
+            self.search("holes"), [self.in_theme.id, self.in_description.id]
+        )
+
+    def test_equal_ranks_keep_order_across_cursor_pages(self):
+        shows = [
+            AstronomyShow.objects.create(
+                title=f"Comet {i}", description="A tail of dust."
+            )
+            for i in range(5)
+        ]
+        expected = [show.id for show in reversed(shows)]
+
+        ids = []
+        params = {"q": "comet", "cursor": "", "page_size": 2}
+        url = ASTRONOMY_SHOW_URL
+        while url:
+            res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [show["id"] for show in res.data["results"]]
+            url, params = res.data["next"], None
+
+        self.assertEqual(ids, expected)
+        self.assertEqual(self.search("comet"), expected)
+
+
+class BenchmarkShowSearchTest(TestCase):
+    def test_report_and_cleanup(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_show_search",
+            shows=30,
+            themes=3,
+            queries=5,
+            seed=1,
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["shows"], 30)
+        self.assertIn("p95", report["latency_ms"])
+        self.assertFalse(AstronomyShow.objects.exists())
+        self.assertFalse(ShowTheme.objects.exists())
@@ -0,0 +1,190 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planetarium import throttling
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+)
+
+RESERVATION_URL = reverse("planetarium:reservation-list")
+TICKET_URL = reverse("planetarium:ticket-list")
+TOKEN_URL = reverse("user:token_obtain_pair")
+
+
+class TakeTokenTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def take(self, now: float):
+        with mock.patch.object(throttling, "time") as clock:
+            clock.time.return_value = now
+            return throttling.take_token("bucket", 2, 60)
+
+    def test_bucket_refills(self):
+        self.assertIsNone(self.take(600))
+        self.assertIsNone(self.take(600))
+        self.assertEqual(self.take(600), 30)
+        # refused requests don't take a token
+        self.assertEqual(self.take(615), 15)
+        self.assertIsNone(self.take(630))
+        self.assertEqual(self.take(630), 30)
+
+    def test_bucket_is_full_again_after_a_period(self):
+        for _ in range(2):
+            self.take(600)
+        self.assertIsNone(self.take(659))
+
+        self.assertEqual(self.take(659), 1)
+        cache.delete("bucket")  # expired
+        self.assertIsNone(self.take(660))
+        self.assertIsNone(self.take(660))
+
+    def test_idle_bucket_holds_at_most_capacity(self):
+        self.assertIsNone(self.take(600))
+
+        # after a long pause only the capacity goes through in a burst
+        burst = [self.take(659.5) for _ in range(10)]
+        self.assertEqual(burst.count(None), 2)
+        self.assertEqual(burst[2], 30)
+
+        burst = [self.take(1000) for _ in range(10)]
+        self.assertEqual(burst.count(None), 2)
+
+    def test_parse_rate(self):
+        self.assertEqual(throttling.parse_rate("10/min"), (10, 60))
+        self.assertEqual(throttling.parse_rate("100/hour"), (100, 3600))
+
+
+@override_settings(
+    PLANETARIUM_THROTTLE_RATES={
+        "token_ip": "2/min",
+        "reservations_user": "2/min",
+        "reservations_ip": "3/min",
+    }
+)
+class ThrottledEndpointsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@test.com", password="testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        show = AstronomyShow.objects.create(
+            title="Cosmic Voyage", description="Description"
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Dome", rows=10, seats_in_row=10
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=show,
+            planetarium_dome=dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        self.seat = 0
+
+    def reserve(self, client=None):
+        self.seat += 1
+        return (client or self.client).post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {
+                        "row": 1,
+                        "seat": self.seat,
+                        "show_session": self.session.id,
+                    }
+                ]
+            },
+            format="json",
+        )
+
+    def assertThrottled(self, res):
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(res["Retry-After"]), 0)
+
+    def test_reservations_per_user(self):
+        for _ in range(2):
+            self.assertEqual(
+                self.reserve().status_code, status.HTTP_201_CREATED
+            )
+
+        self.assertThrottled(self.reserve())
+        # ticket creation shares the scope
+        self.assertThrottled(
+            self.client.post(
+                TICKET_URL,
+                {"row": 2, "seat": 1, "show_session": self.session.id},
+            )
+        )
+        self.assertEqual(Reservation.objects.count(), 2)
+        # reads are not throttled
+        res = self.client.get(RESERVATION_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_reservations_per_ip(self):
+        other_client = APIClient()
+        other_client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="other@test.com", password="testpass", is_staff=True
+            )
+        )
+        self.reserve()
+        self.reserve()
+
+        self.assertEqual(
+            self.reserve(other_client).status_code, status.HTTP_201_CREATED
+        )
+        self.assertThrottled(self.reserve(other_client))
+
+    def test_token(self):
+        credentials = {"email": "admin@test.com", "password": "testpass"}
+        client = APIClient()
+
+        for _ in range(2):
+            res = client.post(TOKEN_URL, credentials)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertThrottled(client.post(TOKEN_URL, credentials))
+        self.assertThrottled(
+            client.post(reverse("planetarium:token_obtain_pair"), credentials)
+        )
+        self.assertEqual(
+            client.post(
+                TOKEN_URL, credentials, REMOTE_ADDR="10.0.0.1"
+            ).status_code,
+            status.HTTP_200_OK,
+        )
+
+
+class BenchmarkThrottleTest(TestCase):
+    def test_report(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_throttle",
+            iterations=30,
+            clients=2,
+            capacity=5,
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report["throttles"]), {"user", "ip"})
+        for result in report["throttles"].values():
+            self.assertEqual(result["allowed"] + result["refused"], 30)
+            self.assertGreater(result["refused"], 0)
@@ -0,0 +1,86 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+IN_LIST = re.compile(r"\bIN \((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+
+
+def query_shape(sql: str) -> str:
+    """Strip literals from ``sql`` so that N+1 queries compare equal"""
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    return IN_LIST.sub("IN (...)", sql)
+
+
+class QueryRecord:
+    def __init__(self, name: str, queries: list[str]):
+        self.name = name
+        self.queries = queries
+
+    def __len__(self):
+        return len(self.queries)
+
+    def repeated_shapes(self, threshold: int) -> dict[str, int]:
+        shapes = Counter(query_shape(sql) for sql in self.queries)
+        return {
+            shape: count
+            for shape, count in shapes.items()
+            if count >= threshold
+        }
+
+    def report(self) -> str:
+        return "\n".join(
+            f"{i}. {sql}" for i, sql in enumerate(self.queries, start=1)
+        )
+
+
+class QueryBudgetMixin:
+    """Fail tests whose viewset actions exceed a declared query budget.
+
+    ``query_budgets`` maps ``"<url name>"`` (e.g. ``"showsession-list"``)
+    to the maximum number of queries the action may run. Independently
+    of the budget, an identical query shape repeated
+    ``n_plus_one_threshold`` times is reported as an N+1.
+    """
+
+    query_budgets = {}
+    n_plus_one_threshold = 3
+
+    @contextmanager
+    def record_queries(self, name: str):
+        with CaptureQueriesContext(connection) as context:
+            record = QueryRecord(name, [])
+            yield record
+        record.queries = [query["sql"] for query in context.captured_queries]
+
+    def assertQueryBudget(self, record: QueryRecord, budget: int):
+        repeated = record.repeated_shapes(self.n_plus_one_threshold)
+        if repeated:
+            shapes = "\n".join(
+                f"{count}x {shape}" for shape, count in repeated.items()
+            )
+            self.fail(
+                f"N+1 queries in {record.name}:\n{shapes}\n\n"
+                f"{record.report()}"
+            )
+        if len(record) > budget:
+            self.fail(
+                f"{record.name} ran {len(record)} queries, "
+                f"budget is {budget}:\n{record.report()}"
+            )
+
+    def request_within_budget(self, method: str, url: str, **kwargs):
+        name = resolve(url.split("?")[0]).url_name
+        self.assertIn(
+            name, self.query_budgets, f"No query budget declared for {name}"
+        )
+        with self.record_queries(name) as record:
+            response = getattr(self.client, method)(url, **kwargs)
+        self.assertQueryBudget(record, self.query_budgets[name])
+        return response
@@ -0,0 +1,111 @@
+"""Token-bucket throttles backed by the cache.
+
+A view names its scope in ``throttle_scope``, or per action in
+``throttle_scopes``, and ``PLANETARIUM_THROTTLE_RATES`` maps
+``<scope>_user`` and ``<scope>_ip`` to ``"<capacity>/<period>"``: a
+bucket of ``capacity`` tokens, refilled at ``capacity`` per ``period``
+(``s``, ``m``, ``h`` or ``d``). A scope without a rate isn't throttled.
+
+The bucket is kept as a GCRA theoretical arrival time: each admitted
+request pushes the timestamp stored at the bucket's key one emission
+interval (``period / capacity``) further, and a request is refused when
+that would put it more than one ``period`` ahead of now. A full bucket
+is a timestamp in the past, so an idle client gets back at most
+``capacity`` tokens however long it waited. Refused requests get 429
+with ``Retry-After`` set to when the next token is due.
+
+A busy bucket moves with one atomic ``cache.incr`` per request, and
+refused requests give their interval back. Only a request that finds
+an idle bucket resets the timestamp to now with ``cache.set``, so
+requests racing that reset may each get a token: the overshoot is
+bounded by the client's concurrency, once per idle period.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+KEY_PREFIX = "planetarium:throttle"
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """``(capacity, period in seconds)`` of a ``"10/min"`` rate"""
+    capacity, period = rate.split("/")
+    return int(capacity), PERIODS[period[0]]
+
+
+def take_token(key: str, capacity: int, period: int) -> float | None:
+    """Take a token from the bucket at ``key``.
+
+    Returns ``None`` if one was available, otherwise the seconds until
+    the next one is. Times are integer milliseconds, so that the cache
+    can increment them.
+    """
+    now = int(time.time() * 1000)
+    interval = period * 1000 // capacity
+    try:
+        arrival = cache.incr(key, interval)
+    except ValueError:
+        arrival = None
+    if arrival is None or arrival - interval < now:
+        # Idle or new bucket: full, this request takes the first token.
+        cache.set(key, now + interval, period)
+        return None
+    if arrival - now <= period * 1000:
+        # Keep the key while the timestamp is ahead of now.
+        cache.touch(key, period)
+        return None
+    cache.decr(key, interval)
+    return (arrival - now - period * 1000) / 1000
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle the requests of one client (by default its address), see
+    the module docstring
+    """
+
+    kind = "ip"
+
+    def get_bucket_ident(self, request):
+        """Who the bucket belongs to, ``None`` to skip the request"""
+        return self.get_ident(request)
+
+    def get_scope(self, view) -> str | None:
+        scopes = getattr(view, "throttle_scopes", {})
+        return scopes.get(
+            getattr(view, "action", None),
+            getattr(view, "throttle_scope", None),
+        )
+
+    def allow_request(self, request, view) -> bool:
+        self.wait_seconds = None
+        scope = self.get_scope(view)
+        rate = settings.PLANETARIUM_THROTTLE_RATES.get(f"{scope}_{self.kind}")
+        ident = self.get_bucket_ident(request)
+        if rate is None or ident is None:
+            return True
+        capacity, period = parse_rate(rate)
+        self.wait_seconds = take_token(
+            f"{KEY_PREFIX}:{scope}:{self.kind}:{ident}", capacity, period
+        )
+        return self.wait_seconds is None
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Per authenticated user, anonymous requests aren't counted"""
+
+    kind = "user"
+
+    def get_bucket_ident(self, request):
+        return getattr(request.user, "pk", None)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Per client address, honouring ``NUM_PROXIES``"""
+
+    kind = "ip"
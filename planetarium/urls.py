@@ -1,8 +1,8 @@
 from django.urls import path, include
 from rest_framework import routers
-from rest_framework_simplejwt.views import TokenObtainPairView, \
-    TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
 
+from planetarium import async_views
 from planetarium.views import (
     ShowThemeViewSet,
     AstronomyShowViewSet,
@@ -10,7 +10,9 @@ from planetarium.views import (
     ShowSessionViewSet,
     TicketViewSet,
     ReservationViewSet,
+    ScheduleViewSet,
 )
+from user.views import ThrottledTokenObtainPairView
 
 router = routers.DefaultRouter()
 
@@ -20,11 +22,43 @@ router.register("planetarium_domes", PlanetariumDomeViewSet)
 router.register("show_sessions", ShowSessionViewSet)
 router.register("tickets", TicketViewSet)
 router.register("reservations", ReservationViewSet)
+router.register("schedule", ScheduleViewSet, basename="schedule")
+
+async_urlpatterns = [
+    path(
+        "show_sessions/",
+        async_views.show_session_list,
+        name="async-showsession-list",
+    ),
+    path(
+        "show_sessions/<int:pk>/",
+        async_views.show_session_detail,
+        name="async-showsession-detail",
+    ),
+    path(
+        "show_sessions/<int:pk>/seat_map/",
+        async_views.show_session_seat_map,
+        name="async-showsession-seat-map",
+    ),
+    path(
+        "show_sessions/<int:pk>/events/",
+        async_views.show_session_events,
+        name="async-showsession-events",
+    ),
+    path(
+        "astronomy_shows/",
+        async_views.astronomy_show_list,
+        name="async-astronomyshow-list",
+    ),
+]
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("async/", include(async_urlpatterns)),
     path(
-        "token/", TokenObtainPairView.as_view(), name="token_obtain_pair"
+        "token/",
+        ThrottledTokenObtainPairView.as_view(),
+        name="token_obtain_pair",
     ),
     path(
         "token/refresh/", TokenRefreshView.as_view(), name="token_refresh"
@@ -1,8 +1,35 @@
-from django.db.models import Count, F
-from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import viewsets
-
+from datetime import timedelta
+from itertools import groupby
+from operator import attrgetter
 
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Count
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import (
+    IsAuthenticated,
+    IsAuthenticatedOrReadOnly,
+)
+from rest_framework.response import Response
+
+
+from planetarium.cache import CatalogCacheMixin
+from planetarium.conditional import ConditionalGetMixin
+from planetarium.exports import ExportMixin
+from planetarium.fastlists import ValuesListMixin
+from planetarium.fieldsets import FieldsetViewMixin
+from planetarium.filters import ShowSessionFilter, parse_day
+from planetarium.holds import (
+    active_held_seats,
+    create_hold,
+    hold_best_seats,
+)
+from planetarium.idempotency import IdempotencyMixin
 from planetarium.models import (
     AstronomyShow,
     ShowTheme,
@@ -10,12 +37,16 @@ from planetarium.models import (
     PlanetariumDome,
     Ticket,
     Reservation,
+    ReservationHistory,
+    ScheduleDay,
+    TicketHistory,
 )
 from planetarium.pagination import OrderPagination
 from planetarium.permissions import (
     IsAdminOrIfAuthenticatedEditOnly,
     IsAdminOrIfAuthenticatedReadOnly,
 )
+from planetarium.replicas import ReplicaReadMixin
 
 from planetarium.serializers import (
     AstronomyShowSerializer,
@@ -30,32 +61,107 @@ from planetarium.serializers import (
     TicketListSerializer,
     ReservationSerializer,
     ReservationDetailSerializer,
+    SeatMapSerializer,
+    SeatHoldSerializer,
+    ScheduleDaySerializer,
+    BestSeatsSerializer,
+)
+from planetarium.search import search_shows
+from planetarium.seating import best_block
+from planetarium.throttling import (
+    IPTokenBucketThrottle,
+    UserTokenBucketThrottle,
 )
 
 
-class ShowThemeViewSet(viewsets.ModelViewSet):
+class ShowThemeViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    CatalogCacheMixin,
+    viewsets.ModelViewSet,
+):
     queryset = ShowTheme.objects.all()
     serializer_class = ShowThemeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedEditOnly,)
-
-
-class AstronomyShowViewSet(viewsets.ModelViewSet):
-    queryset = AstronomyShow.objects.prefetch_related("show_theme")
+    cache_models = (ShowTheme,)
+
+
+class AstronomyShowViewSet(
+    ReplicaReadMixin,
+    FieldsetViewMixin,
+    ConditionalGetMixin,
+    CatalogCacheMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = AstronomyShow.objects.all()
     serializer_class = AstronomyShowSerializer
     pagination_class = OrderPagination
     permission_classes = (IsAdminOrIfAuthenticatedEditOnly,)
+    cache_models = (AstronomyShow, ShowTheme)
+    etag_models = (ShowTheme,)
+
+    def get_queryset(self):
+        queryset = self.queryset
+        q = self.request.query_params.get("q", "").strip()
+        if self.action == "list" and q:
+            queryset = search_shows(queryset, q)
+        if self.action in ("list", "retrieve"):
+            queryset = self.select_fieldset_relations(queryset)
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return AstronomyShowDetailSerializer
         return self.serializer_class
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=OpenApiTypes.STR,
+                description="Full-text search in titles, theme names and "
+                "descriptions, most relevant first (q=black holes)",
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(
+    ReplicaReadMixin,
+    IdempotencyMixin,
+    FieldsetViewMixin,
+    ExportMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     pagination_class = OrderPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_classes = (UserTokenBucketThrottle, IPTokenBucketThrottle)
+    throttle_scopes = {"create": "reservations"}
+    export_columns = (
+        ("id", "id"),
+        ("created_at", "created_at"),
+        ("user", "user_id"),
+        ("email", "user__email"),
+        ("tickets", "ticket_count"),
+    )
+
+    def get_export_queryset(self):
+        # Exports include archived reservations, see archive.py.
+        return ReservationHistory.objects.annotate(
+            ticket_count=Count("tickets")
+        ).order_by("id")
+
+    def filter_export_sessions(self, queryset, show_sessions):
+        return queryset.filter(
+            id__in=TicketHistory.objects.filter(
+                show_session_id__in=show_sessions
+            ).values("reservation_id")
+        )
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -63,33 +169,58 @@ class ReservationViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
     def get_queryset(self):
-        queryset = Reservation.objects.filter(user=self.request.user)
-        if self.action in ["list", "retrieve"]:
-            queryset = queryset.prefetch_related(
-                "tickets__show_session__astronomy_show",
-                "tickets__show_session__planetarium_dome",
+        if self.action in ("list", "retrieve"):
+            # Archived reservations stay readable, see archive.py.
+            return self.select_fieldset_relations(
+                ReservationHistory.objects.filter(user_id=self.request.user.id)
             )
-        return queryset
+        return Reservation.objects.filter(user_id=self.request.user.id)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
 
 
-class TicketViewSet(viewsets.ModelViewSet):
+class TicketViewSet(
+    ReplicaReadMixin,
+    IdempotencyMixin,
+    FieldsetViewMixin,
+    ExportMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
     pagination_class = OrderPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_classes = (UserTokenBucketThrottle, IPTokenBucketThrottle)
+    throttle_scopes = {"create": "reservations"}
+    export_created_field = "reservation__created_at"
+    export_columns = (
+        ("id", "id"),
+        ("reservation", "reservation_id"),
+        ("created_at", "reservation__created_at"),
+        ("user", "reservation__user_id"),
+        ("show_session", "show_session_id"),
+        ("astronomy_show", "show_session__astronomy_show__title"),
+        ("planetarium_dome", "show_session__planetarium_dome__name"),
+        ("show_time", "show_session__show_time"),
+        ("row", "row"),
+        ("seat", "seat"),
+    )
 
-    def get_queryset(self):
-        queryset = Ticket.objects.filter(reservation__user=self.request.user)
+    def get_export_queryset(self):
+        return TicketHistory.objects.order_by("id")
 
-        if self.action in ["list", "retrieve"]:
-            queryset = queryset.select_related(
-                "show_session__astronomy_show",
+    def get_queryset(self):
+        if self.action in ("list", "retrieve"):
+            return self.select_fieldset_relations(
+                TicketHistory.objects.filter(
+                    reservation__user_id=self.request.user.id
+                )
             )
-
-        return queryset
+        return Ticket.objects.filter(
+            reservation__user_id=self.request.user.id
+        )
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -99,67 +230,155 @@ class TicketViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
     def perform_create(self, serializer):
-        reservation = Reservation.objects.create(user=self.request.user)
-        serializer.save(reservation=reservation)
+        with transaction.atomic():
+            reservation = Reservation.objects.create(
+                user_id=self.request.user.id
+            )
+            serializer.save(reservation=reservation)
 
 
-class PlanetariumDomeViewSet(viewsets.ModelViewSet):
+class PlanetariumDomeViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    CatalogCacheMixin,
+    viewsets.ModelViewSet,
+):
     queryset = PlanetariumDome.objects.all()
     serializer_class = PlanetariumDomeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedEditOnly,)
+    cache_models = (PlanetariumDome,)
 
 
-class ShowSessionViewSet(viewsets.ModelViewSet):
+class ShowSessionViewSet(
+    ReplicaReadMixin,
+    FieldsetViewMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = ShowSession.objects.all()
     serializer_class = ShowSessionSerializer
     pagination_class = OrderPagination
     permission_classes = (IsAdminOrIfAuthenticatedEditOnly,)
-
-    @staticmethod
-    def _params_to_ints(qs):
-        return [int(str_id) for str_id in qs.split(",")]
+    filter_backends = (ShowSessionFilter,)
+    etag_models = (AstronomyShow, PlanetariumDome, ShowTheme)
 
     def get_queryset(self):
         queryset = self.queryset
-        planetarium_dome = self.request.query_params.get(
-            "planetarium_dome", None
-        )
-        astronomy_show = self.request.query_params.get("astronomy_show", None)
 
-        if astronomy_show:
-            astronomy_show_ids = self._params_to_ints(astronomy_show)
-            queryset = ShowSession.objects.filter(
-                astronomy_show__id__in=astronomy_show_ids
-            )
-
-        if planetarium_dome:
-            planetarium_dome_ids = self._params_to_ints(planetarium_dome)
-            queryset = ShowSession.objects.filter(
-                planetarium_dome__id__in=planetarium_dome_ids
-            )
+        if self.action in ("list", "retrieve"):
+            queryset = self.select_fieldset_relations(queryset)
 
-        if self.action == "list":
-            capacity = F("planetarium_dome__rows") * F(
-                "planetarium_dome__seats_in_row"
+        if self.action in ("seat_map", "best_seats"):
+            return queryset.select_related("planetarium_dome").only(
+                "seat_map",
+                "planetarium_dome__rows",
+                "planetarium_dome__seats_in_row",
             )
-            queryset = queryset.select_related(
-                "astronomy_show", "planetarium_dome"
-            ).annotate(tickets_left=capacity - Count("tickets"))
 
-        if self.action == "retrieve":
-            queryset = queryset.select_related(
-                "astronomy_show", "planetarium_dome"
-            )
-
-        return queryset.distinct()
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
             return ShowSessionListSerializer
         if self.action == "retrieve":
             return ShowSessionDetailSerializer
+        if self.action == "seat_map":
+            return SeatMapSerializer
+        if self.action == "holds":
+            return SeatHoldSerializer
+        if self.action == "best_seats":
+            return BestSeatsSerializer
         return self.serializer_class
 
+    @action(methods=["GET"], detail=True, url_path="seat_map")
+    def seat_map(self, request, pk=None):
+        """Packed bitset of taken seats, see ``SeatMapSerializer``"""
+        show_session = self.get_object()
+        serializer = self.get_serializer(show_session.get_seat_map())
+        return Response(serializer.data)
+
+    @action(
+        methods=["POST"],
+        detail=True,
+        url_path="holds",
+        permission_classes=(IsAuthenticated,),
+    )
+    def holds(self, request, pk=None):
+        """Hold seats for the requesting user for a few minutes"""
+        show_session = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        hold = create_hold(
+            user_id=request.user.id,
+            show_session_id=show_session.id,
+            seats=serializer.validated_data["seats"],
+            minutes=serializer.validated_data.get(
+                "minutes", settings.PLANETARIUM_SEAT_HOLD_MINUTES
+            ),
+        )
+        return Response(
+            self.get_serializer(hold).data, status=status.HTTP_201_CREATED
+        )
+
+    @extend_schema(
+        methods=["GET"],
+        parameters=[
+            OpenApiParameter(
+                name="count",
+                type=OpenApiTypes.INT,
+                required=True,
+                description="Number of adjacent seats (count=4)",
+            ),
+        ],
+    )
+    @extend_schema(methods=["POST"], responses=SeatHoldSerializer)
+    @action(
+        methods=["GET", "POST"],
+        detail=True,
+        url_path="best_seats",
+        permission_classes=(IsAuthenticatedOrReadOnly,),
+    )
+    def best_seats(self, request, pk=None):
+        """Best block of adjacent free seats, closest to the centre.
+
+        GET returns the block (empty when there is none), POST holds it
+        for the requesting user like ``holds`` does.
+        """
+        serializer = self.get_serializer(
+            data=(
+                request.data
+                if request.method == "POST"
+                else request.query_params
+            )
+        )
+        serializer.is_valid(raise_exception=True)
+        count = serializer.validated_data["count"]
+        show_session = self.get_object()
+
+        if request.method == "POST":
+            hold = hold_best_seats(
+                user_id=request.user.id,
+                show_session_id=show_session.id,
+                count=count,
+                minutes=serializer.validated_data.get(
+                    "minutes", settings.PLANETARIUM_SEAT_HOLD_MINUTES
+                ),
+            )
+            return Response(
+                SeatHoldSerializer(hold).data, status=status.HTTP_201_CREATED
+            )
+
+        block = best_block(
+            show_session.get_seat_map(),
+            count,
+            blocked=active_held_seats(show_session.id),
+        )
+        seats = [{"row": row, "seat": seat} for row, seat in block or ()]
+        return Response(
+            self.get_serializer({"count": count, "seats": seats}).data
+        )
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -174,7 +393,101 @@ class ShowSessionViewSet(viewsets.ModelViewSet):
                 description="Filter by Planetarium Dome id ("
                 "planetarium_dome=1,2)",
             ),
+            OpenApiParameter(
+                name="show_theme",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Filter by Show Theme id of the astronomy show ("
+                "show_theme=1,2)",
+            ),
+            OpenApiParameter(
+                name="show_time_after",
+                type=OpenApiTypes.DATETIME,
+                description="Sessions starting at or after this date or "
+                "datetime (show_time_after=2024-01-01)",
+            ),
+            OpenApiParameter(
+                name="show_time_before",
+                type=OpenApiTypes.DATETIME,
+                description="Sessions starting before this date or "
+                "datetime (show_time_before=2024-01-08T18:00Z)",
+            ),
+            OpenApiParameter(
+                name="available",
+                type=OpenApiTypes.BOOL,
+                description="Only sessions with seats left (available=true)",
+            ),
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+
+class ScheduleViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, viewsets.GenericViewSet
+):
+    """Show sessions grouped by local day and dome, with seats left.
+
+    Reads the precomputed ``ScheduleDay`` rollup, one indexed range scan
+    per request.
+    """
+
+    queryset = ScheduleDay.objects.select_related("planetarium_dome")
+    serializer_class = ScheduleDaySerializer
+    permission_classes = (IsAdminOrIfAuthenticatedEditOnly,)
+    etag_models = (PlanetariumDome,)
+
+    def get_range(self):
+        params = self.request.query_params
+        start = (
+            parse_day("from", params["from"])
+            if params.get("from")
+            else timezone.localdate()
+        )
+        end = (
+            parse_day("to", params["to"])
+            if params.get("to")
+            else start + timedelta(days=6)
+        )
+        if end < start:
+            raise ValidationError({"to": "Must not be before from."})
+        if (end - start).days >= settings.PLANETARIUM_SCHEDULE_MAX_DAYS:
+            raise ValidationError(
+                {
+                    "to": "At most "
+                    f"{settings.PLANETARIUM_SCHEDULE_MAX_DAYS} days at once."
+                }
+            )
+        return start, end
+
+    def get_etag_queryset(self):
+        return self.get_queryset().filter(day__range=self.get_range())
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                type=OpenApiTypes.DATE,
+                description="First day, today by default (from=2024-01-01)",
+            ),
+            OpenApiParameter(
+                name="to",
+                type=OpenApiTypes.DATE,
+                description="Last day, six days after from by default "
+                "(to=2024-01-07)",
+            ),
+        ]
+    )
+    def list(self, request):
+        return self.get_conditional_response(self.get_schedule, request)
+
+    def get_schedule(self, request):
+        rows = self.get_etag_queryset()
+        return Response(
+            [
+                {
+                    "day": day,
+                    "domes": self.get_serializer(list(cells), many=True).data,
+                }
+                for day, cells in groupby(rows, key=attrgetter("day"))
+            ]
+        )
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """Small thread-safe LRU of user rows with a short time-to-live"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires <= time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user) -> None:
+        with self.lock:
+            self.entries[user_id] = (user, time.monotonic() + self.ttl)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL
+)
+
+
+def load_user(user_id):
+    user = user_cache.get(user_id)
+    if user is None:
+        try:
+            user = get_user_model().objects.get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        user_cache.set(user_id, user)
+    if not user.is_active:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    return user
+
+
+class ClaimsUser:
+    """Authenticated user built from signed token claims.
+
+    ``id``, ``email`` and ``is_staff`` come straight from the token; any
+    other attribute loads the full row (through the LRU) on first use.
+    """
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        self.token = token
+        self.id = self.pk = token[api_settings.USER_ID_CLAIM]
+        self.email = token["email"]
+        self.is_staff = token["is_staff"]
+
+    @cached_property
+    def user(self):
+        return load_user(self.id)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __str__(self):
+        return self.email
+
+    def __eq__(self, other):
+        return getattr(other, "pk", None) == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT authentication that does not read the user table.
+
+    Access tokens issued by ``ClaimsTokenObtainPairSerializer`` carry
+    the claims permissions need, so the request user is built from the
+    token alone. Tokens without these claims fall back to the cached
+    row lookup. ``ClaimsTokenRefreshSerializer`` re-reads the claims on
+    refresh, so deactivation and changes to ``is_staff`` take effect
+    within one access token lifetime.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                "Token contained no recognizable user identification"
+            )
+        if "is_staff" in validated_token and "email" in validated_token:
+            return ClaimsUser(validated_token)
+        return load_user(user_id)
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = StatelessJWTAuthentication
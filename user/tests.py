@@ -1,3 +1,186 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    ShowSession,
+)
+from planetarium.tests.utils import QueryBudgetMixin
+from user.authentication import ClaimsUser, user_cache
+
+
+class UserQueryBudgetTest(QueryBudgetMixin, TestCase):
+    query_budgets = {
+        "create": 2,
+        "manage": 0,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_register(self):
+        res = self.request_within_budget(
+            "post",
+            reverse("user:create"),
+            data={"email": "new@test.com", "password": "testpass"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_me(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(user)
+
+        res = self.request_within_budget("get", reverse("user:manage"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], user.email)
+
+
+class StatelessJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="staff@test.com", password="testpass", is_staff=True
+        )
+        user_cache.clear()
+        # token/ is throttled per address
+        cache.clear()
+
+    def obtain_access_token(self):
+        return self.obtain_token_pair()["access"]
+
+    def obtain_token_pair(self):
+        res = self.client.post(
+            reverse("user:token_obtain_pair"),
+            {"email": "staff@test.com", "password": "testpass"},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def refresh(self, refresh):
+        return self.client.post(
+            reverse("user:token_refresh"), {"refresh": refresh}
+        )
+
+    def test_token_carries_claims(self):
+        token = AccessToken(self.obtain_access_token())
+
+        self.assertEqual(token["email"], self.user.email)
+        self.assertTrue(token["is_staff"])
+
+    def test_request_skips_user_lookup(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.obtain_access_token()}"
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(reverse("planetarium:ticket-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any("user_user" in query["sql"] for query in queries)
+        )
+
+    def test_reservation_created_for_claims_user(self):
+        show_session = ShowSession.objects.create(
+            astronomy_show=AstronomyShow.objects.create(
+                title="Cosmic Voyage", description="Description"
+            ),
+            planetarium_dome=PlanetariumDome.objects.create(
+                name="Dome", rows=5, seats_in_row=5
+            ),
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.obtain_access_token()}"
+        )
+
+        res = self.client.post(
+            reverse("planetarium:reservation-list"),
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "show_session": show_session.id}
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Reservation.objects.get(id=res.data["id"]).user, self.user
+        )
+
+    def test_token_without_claims_loads_user_once(self):
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        with CaptureQueriesContext(connection) as first:
+            self.client.get(reverse("planetarium:ticket-list"))
+        with CaptureQueriesContext(connection) as second:
+            self.client.get(reverse("planetarium:ticket-list"))
+
+        self.assertEqual(len(first), len(second) + 1)
+
+    def test_claims_user_loads_full_row_on_demand(self):
+        token = AccessToken(self.obtain_access_token())
+        user = ClaimsUser(token)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertTrue(user.is_staff)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.date_joined, self.user.date_joined)
+
+    def test_refresh_reissues_claims_of_demoted_user(self):
+        refresh = self.obtain_token_pair()["refresh"]
+        self.user.is_staff = False
+        self.user.email = "demoted@test.com"
+        self.user.save()
+
+        res = self.refresh(refresh)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        token = AccessToken(res.data["access"])
+        self.assertFalse(token["is_staff"])
+        self.assertEqual(token["email"], "demoted@test.com")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {res.data['access']}"
+        )
+        res = self.client.post(
+            reverse("planetarium:astronomyshow-list"),
+            {"title": "Cosmic Voyage", "description": "Description"},
+        )
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refresh_rejects_deactivated_user(self):
+        refresh = self.obtain_token_pair()["refresh"]
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.refresh(refresh)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertNotIn("access", res.data)
+
+    def test_refresh_rejects_deleted_user(self):
+        refresh = RefreshToken.for_user(self.user)
+        self.user.delete()
+
+        res = self.refresh(str(refresh))
 
-# Create your tests here.
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,7 +1,9 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.views import TokenObtainPairView
 
+from planetarium.throttling import IPTokenBucketThrottle
 from user.serializers import UserSerializer
 
 
@@ -16,3 +18,10 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
 
     def get_object(self):
         return self.request.user
+
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """Every call hashes a password, so clients get a token bucket"""
+
+    throttle_classes = (IPTokenBucketThrottle,)
+    throttle_scope = "token"